@@ -0,0 +1,367 @@
+"""Cross-session score analytics.
+
+AnalyticsStore keeps every graded answer from completed interviews as NumPy
+columns (dictionary-encoded role, difficulty, mode, topic and question, plus
+score, word count and day) and maintains pre-computed rollups per
+(role, difficulty, mode) cell, so dashboard queries filtered on those sum a
+handful of small arrays, and any other filter is one masked bincount, even over
+millions of answers.
+
+Usage:
+    python analytics.py refresh                 # ingest newly completed sessions from the session store
+    python analytics.py report [--role ROLE] [--difficulty LEVEL] [--mode MODE]
+    python analytics.py bench [--records 2000000]
+"""
+import os
+import io
+import json
+import time
+import argparse
+import threading
+from datetime import date
+
+import numpy as np
+
+ANALYTICS_PATH = os.getenv("ANALYTICS_PATH", "interview_analytics.npz")
+
+# Dictionary-encoded columns and the integer type of their codes
+DIMENSIONS = {
+    "role": np.int16,
+    "difficulty": np.int16,
+    "interview_mode": np.int16,
+    "topic": np.int16,
+    "question": np.int32
+}
+VALUE_COLUMNS = {"score": np.int8, "word_count": np.int32, "day": np.int32}
+UNKNOWN_TOPIC = "Unspecified"
+# Dimensions whose combinations get their own pre-computed rollups
+CELL_DIMENSIONS = ("role", "difficulty", "interview_mode")
+
+
+def _grow(array, size):
+    if len(array) >= size:
+        return array
+    grown = np.zeros(size, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class AnalyticsStore:
+    """Columnar store of graded answers with rollups per (role, difficulty, mode) cell"""
+
+    def __init__(self, path=ANALYTICS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.labels = {dimension: [] for dimension in DIMENSIONS}
+        self._codes = {dimension: {} for dimension in DIMENSIONS}
+        self.columns = {name: np.empty(0, dtype=dtype) for name, dtype in {**DIMENSIONS, **VALUE_COLUMNS}.items()}
+        self.watermark = 0.0
+        self._reset_rollups()
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.columns["score"])
+
+    # -- ingest ---------------------------------------------------------------
+
+    def ingest(self, rows):
+        """Append graded answers: dicts with role, difficulty, interview_mode, question, score,
+        word_count, timestamp (ISO) and optionally topic. Ungraded rows are skipped."""
+        rows = [row for row in rows if row.get("score") is not None]
+        if not rows:
+            return 0
+        with self._lock:
+            batch = {dimension: np.fromiter(
+                (self._encode(dimension, row.get(dimension) or (UNKNOWN_TOPIC if dimension == "topic" else "")) for row in rows),
+                dtype=dtype, count=len(rows)
+            ) for dimension, dtype in DIMENSIONS.items()}
+            batch["score"] = np.fromiter((row["score"] for row in rows), dtype=np.int8, count=len(rows))
+            batch["word_count"] = np.fromiter((row.get("word_count") or 0 for row in rows), dtype=np.int32, count=len(rows))
+            batch["day"] = np.array(
+                [(row.get("timestamp") or date.today().isoformat())[:10] for row in rows], dtype="datetime64[D]"
+            ).astype(np.int32)
+
+            for name, values in batch.items():
+                self.columns[name] = np.concatenate([self.columns[name], values])
+            self._add_to_rollups(batch)
+        return len(rows)
+
+    def refresh(self, store):
+        """Ingest sessions completed in `store` since the last refresh, then save; returns answers added"""
+        added = 0
+        with self._refresh_lock:
+            for session_id, session in store.sessions(status="complete", updated_after=self.watermark):
+                context = {key: session.get(key) for key in ("role", "difficulty", "interview_mode")}
+                added += self.ingest([dict(record, **context) for record in store.records(session_id)])
+                self.watermark = max(self.watermark, session["updated"])
+            if added and self.path:
+                self.save()
+        return added
+
+    def _encode(self, dimension, label):
+        # Caller holds self._lock
+        codes = self._codes[dimension]
+        code = codes.get(label)
+        if code is None:
+            code = codes[label] = len(self.labels[dimension])
+            self.labels[dimension].append(label)
+        return code
+
+    # -- rollups --------------------------------------------------------------
+
+    def _reset_rollups(self):
+        # Per (role, difficulty, mode) cell: score histogram plus topic and day sums/counts
+        self._cells = {}
+        # Questions are too many to roll up per cell; they get one global rollup
+        self._question_sums = np.zeros(0, dtype=np.int64)
+        self._question_counts = np.zeros(0, dtype=np.int64)
+
+    def _add_to_rollups(self, batch):
+        # Caller holds self._lock
+        scores = batch["score"].astype(np.int64)
+        questions = len(self.labels["question"])
+        self._question_sums = _grow(self._question_sums, questions)
+        self._question_counts = _grow(self._question_counts, questions)
+        self._question_sums += np.bincount(batch["question"], weights=scores, minlength=questions).astype(np.int64)
+        self._question_counts += np.bincount(batch["question"], minlength=questions)
+
+        keys = np.stack([batch[dimension] for dimension in CELL_DIMENSIONS], axis=1)
+        cells, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        for index, cell in enumerate(cells):
+            selected = inverse == index
+            rollup = self._cells.setdefault(tuple(int(code) for code in cell), {
+                'scores': np.zeros(101, dtype=np.int64),
+                'topic_sums': np.zeros(0, dtype=np.int64), 'topic_counts': np.zeros(0, dtype=np.int64),
+                'day_sums': np.zeros(0, dtype=np.int64), 'day_counts': np.zeros(0, dtype=np.int64)
+            })
+            cell_scores = scores[selected]
+            rollup['scores'] += np.bincount(np.clip(cell_scores, 0, 100), minlength=101)
+            for name, codes in (('topic', batch["topic"][selected]), ('day', batch["day"][selected])):
+                size = max(len(rollup[f'{name}_sums']), int(codes.max()) + 1)
+                rollup[f'{name}_sums'] = _grow(rollup[f'{name}_sums'], size)
+                rollup[f'{name}_counts'] = _grow(rollup[f'{name}_counts'], size)
+                rollup[f'{name}_sums'] += np.bincount(codes, weights=cell_scores, minlength=size).astype(np.int64)
+                rollup[f'{name}_counts'] += np.bincount(codes, minlength=size)
+
+    def _matching_cells(self, filters):
+        """Cells matching {dimension: label} filters on cell dimensions, or None if a label is unknown"""
+        wanted = {}
+        for dimension, label in filters.items():
+            code = self._codes[dimension].get(label)
+            if code is None:
+                return None
+            wanted[CELL_DIMENSIONS.index(dimension)] = code
+        return [
+            (cell, rollup) for cell, rollup in self._cells.items()
+            if all(cell[position] == code for position, code in wanted.items())
+        ]
+
+    def _summed(self, cells, name):
+        """Element-wise sums and counts of one per-cell rollup across cells"""
+        size = max((len(rollup[f'{name}_counts']) for _, rollup in cells), default=0)
+        sums = np.zeros(size, dtype=np.int64)
+        counts = np.zeros(size, dtype=np.int64)
+        for _, rollup in cells:
+            sums[:len(rollup[f'{name}_sums'])] += rollup[f'{name}_sums']
+            counts[:len(rollup[f'{name}_counts'])] += rollup[f'{name}_counts']
+        return sums, counts
+
+    # -- queries --------------------------------------------------------------
+
+    def _aggregate(self, dimension, filters):
+        """(sums, counts) of scores per code of `dimension`, from rollups when the filters allow it"""
+        filters = {key: label for key, label in filters.items() if label is not None}
+        size = len(self.labels[dimension]) if dimension in DIMENSIONS else None
+        if all(key in CELL_DIMENSIONS for key in filters) and not (dimension == "question" and filters):
+            if dimension == "question":
+                return self._question_sums, self._question_counts
+            cells = self._matching_cells(filters)
+            if cells is None:
+                return np.zeros(size or 0, dtype=np.int64), np.zeros(size or 0, dtype=np.int64)
+            if dimension in ("topic", "day"):
+                sums, counts = self._summed(cells, dimension)
+                return (_grow(sums, size), _grow(counts, size)) if size else (sums, counts)
+            if dimension == "score":
+                counts = sum((rollup['scores'] for _, rollup in cells), np.zeros(101, dtype=np.int64))
+                return counts * np.arange(101), counts
+            position = CELL_DIMENSIONS.index(dimension)
+            sums = np.zeros(size, dtype=np.int64)
+            counts = np.zeros(size, dtype=np.int64)
+            for cell, rollup in cells:
+                counts[cell[position]] += rollup['scores'].sum()
+                sums[cell[position]] += rollup['scores'] @ np.arange(101)
+            return sums, counts
+
+        mask = np.ones(len(self), dtype=bool)
+        for key, label in filters.items():
+            code = self._codes[key].get(label)
+            if code is None:
+                return np.zeros(size or 0, dtype=np.int64), np.zeros(size or 0, dtype=np.int64)
+            mask &= self.columns[key] == code
+        scores = self.columns["score"][mask]
+        codes = scores.astype(np.int64) if dimension == "score" else self.columns[dimension][mask]
+        minlength = 101 if dimension == "score" else (size or 0)
+        return np.bincount(codes, weights=scores, minlength=minlength), np.bincount(codes, minlength=minlength)
+
+    def average_by(self, dimension, limit=None, ascending=False, min_count=1, **filters):
+        """[(label, mean score, answers)] per value of `dimension`, ordered by mean score"""
+        with self._lock:
+            sums, counts = self._aggregate(dimension, filters)
+            labels = self.labels[dimension]
+
+        present = np.flatnonzero(counts >= max(1, min_count))
+        means = sums[present] / counts[present]
+        order = np.argsort(means, kind="stable")
+        if not ascending:
+            order = order[::-1]
+        if limit is not None:
+            order = order[:limit]
+        return [(labels[present[i]], float(means[i]), int(counts[present[i]])) for i in order]
+
+    def distribution(self, bin_width=10, **filters):
+        """[(lowest score in bin, answers)] for score bins of bin_width"""
+        with self._lock:
+            _, score_counts = self._aggregate("score", filters)
+        bins = np.add.reduceat(score_counts, np.arange(0, 101, bin_width))
+        return [(int(start), int(count)) for start, count in zip(range(0, 101, bin_width), bins)]
+
+    def trend(self, period_days=1, **filters):
+        """[(period start date, mean score, answers)] for every period that has answers"""
+        with self._lock:
+            sums, counts = self._aggregate("day", filters)
+        if not len(counts):
+            return []
+        starts = np.arange(0, len(counts), period_days)
+        if period_days > 1:
+            sums, counts = np.add.reduceat(sums, starts), np.add.reduceat(counts, starts)
+        present = np.flatnonzero(counts)
+        days = np.asarray(starts[present], dtype="datetime64[D]")
+        return [
+            (str(day), float(total / count), int(count))
+            for day, total, count in zip(days, sums[present], counts[present])
+        ]
+
+    def totals(self, **filters):
+        with self._lock:
+            sums, counts = self._aggregate("score", filters)
+        answers = int(counts.sum())
+        return {'answers': answers, 'mean_score': float(sums.sum() / answers) if answers else 0.0}
+
+    # -- persistence ----------------------------------------------------------
+
+    def save(self, path=None):
+        """Write all columns and labels to one .npz file, replacing it atomically"""
+        path = path or self.path
+        with self._lock:
+            buffer = io.BytesIO()
+            meta = json.dumps({'labels': self.labels, 'watermark': self.watermark})
+            np.savez(buffer, meta=np.array(meta), **self.columns)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(buffer.getvalue())
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        with np.load(path or self.path) as data:
+            meta = json.loads(str(data["meta"]))
+            columns = {name: data[name] for name in self.columns}
+        with self._lock:
+            self.labels = meta['labels']
+            self._codes = {dimension: {label: code for code, label in enumerate(labels)}
+                           for dimension, labels in self.labels.items()}
+            self.watermark = meta['watermark']
+            self.columns = columns
+            self._reset_rollups()
+            if len(columns["score"]):
+                self._add_to_rollups(columns)
+
+
+def _print_rows(title, rows, label_width=48):
+    print(f"\n{title}")
+    for label, mean, count in rows:
+        label = label if len(label) <= label_width else label[:label_width - 3] + "..."
+        print(f"  {label:<{label_width}} {mean:6.1f}  ({count} answers)")
+
+
+def report(store, filters):
+    totals = store.totals(**filters)
+    print(f"{totals['answers']} answers, mean score {totals['mean_score']:.1f}")
+    for dimension in ("role", "difficulty", "interview_mode", "topic"):
+        _print_rows(f"Average score by {dimension.replace('_', ' ')}", store.average_by(dimension, **filters))
+    _print_rows("Hardest questions (at least 5 answers)",
+                store.average_by("question", limit=10, ascending=True, min_count=5, **filters))
+    print("\nScore distribution")
+    for start, count in store.distribution(**filters):
+        print(f"  {start:>3}+ {count}")
+    print("\nWeekly trend")
+    for day, mean, count in store.trend(period_days=7, **filters)[-12:]:
+        print(f"  {day}  {mean:6.1f}  ({count} answers)")
+
+
+def bench(records, seed=7):
+    """Fill an in-memory store with synthetic answers and time the dashboard queries"""
+    rng = np.random.default_rng(seed)
+    store = AnalyticsStore(path=None)
+    roles = ["Software Engineer", "Data Analyst", "Product Manager", "Backend Developer", "ML Engineer"]
+    started = time.perf_counter()
+    chunk = 100000
+    for offset in range(0, records, chunk):
+        n = min(chunk, records - offset)
+        days = rng.integers(0, 365, n)
+        store.ingest([
+            {"role": roles[r], "difficulty": ("Easy", "Medium", "Hard")[d], "interview_mode": ("Technical", "Behavioral")[m],
+             "topic": f"Topic {t}", "question": f"Question {q}", "score": int(s), "word_count": 80,
+             "timestamp": str(np.datetime64("2025-01-01") + int(day))}
+            for r, d, m, t, q, s, day in zip(
+                rng.integers(0, len(roles), n), rng.integers(0, 3, n), rng.integers(0, 2, n),
+                rng.integers(0, 40, n), rng.integers(0, 20000, n), rng.integers(20, 100, n), days
+            )
+        ])
+    print(f"ingested {len(store)} answers in {time.perf_counter() - started:.1f}s")
+
+    queries = {
+        "average by role": lambda: store.average_by("role"),
+        "average by topic": lambda: store.average_by("topic"),
+        "hardest questions": lambda: store.average_by("question", limit=10, ascending=True, min_count=5),
+        "distribution": lambda: store.distribution(),
+        "weekly trend": lambda: store.trend(period_days=7),
+        "topic for role+difficulty": lambda: store.average_by("topic", role="Data Analyst", difficulty="Hard"),
+        "trend for role": lambda: store.trend(role="ML Engineer")
+    }
+    for name, query in queries.items():
+        started = time.perf_counter()
+        for _ in range(10):
+            query()
+        print(f"  {name:<28} {(time.perf_counter() - started) / 10 * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-session interview analytics")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("refresh", help="ingest newly completed sessions from the session store")
+    report_parser = commands.add_parser("report", help="print aggregate views")
+    report_parser.add_argument("--role")
+    report_parser.add_argument("--difficulty")
+    report_parser.add_argument("--mode", dest="interview_mode")
+    bench_parser = commands.add_parser("bench", help="time queries over synthetic answers")
+    bench_parser.add_argument("--records", type=int, default=2000000)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        bench(args.records)
+        return
+
+    from session_store import session_store
+    store = AnalyticsStore()
+    added = store.refresh(session_store)
+    if args.command == "refresh":
+        print(f"added {added} answers ({len(store)} total)")
+    else:
+        report(store, {"role": args.role, "difficulty": args.difficulty, "interview_mode": args.interview_mode})
+
+
+if __name__ == "__main__":
+    main()
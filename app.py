@@ -1,7 +1,10 @@
 import streamlit as st
 import json
+import uuid
 from datetime import datetime
-from bot_engine import InterviewBot
+from bot_engine import InterviewBot, DIFFICULTIES
+from session_store import session_store, SESSION_WORKING_SET
+from question_bank import ROLE_SAMPLES
 import os
 from dotenv import load_dotenv
 
@@ -36,130 +39,11 @@ DOMAINS = [
     "System Design"
 ]
 
-# Role-specific sample questions based on the requirements
-ROLE_SAMPLES = {
-    "Software Engineer": {
-        "technical": [
-            "• Explain time complexity of common algorithms",
-            "• Design a scalable web application architecture", 
-            "• Implement a data structure like a binary tree",
-            "• Debug performance issues in production code"
-        ],
-        "behavioral": [
-            "• Tell me about a challenging technical problem you solved",
-            "• How do you handle code review feedback?",
-            "• Describe a time you had to learn a new technology"
-        ]
-    },
-    "Product Manager": {
-        "technical": [
-            "• How do you prioritize features on a product roadmap?",
-            "• Design a feature for an existing app like Spotify or Uber",
-            "• How do you measure the success of a new product launch?"
-        ],
-        "behavioral": [
-            "• Tell me about a time you managed a difficult stakeholder",
-            "• How do you handle disagreements within your team?",
-            "• Describe a time you had to pivot your product strategy"
-        ]
-    },
-    "Data Analyst": {
-        "technical": [
-            "• Write a SQL query to find the top 5 customers by sales",
-            "• Explain the difference between correlation and causation",
-            "• How would you handle missing data in a dataset?"
-        ],
-        "behavioral": [
-            "• Tell me about a time you had to explain complex data to a non-technical audience",
-            "• How do you ensure the quality of your data analysis?",
-            "• Describe a project where you used data to drive a key business decision"
-        ]
-    },
-    "Frontend Developer": {
-        "technical": [
-            "• Explain the JavaScript event loop",
-            "• How do you optimize a website for performance?",
-            "• Implement a responsive design layout using CSS Flexbox"
-        ],
-        "behavioral": [
-            "• Tell me about a time you had to implement a design that was difficult",
-            "• How do you keep up with new frameworks and libraries?",
-            "• Describe a time you collaborated with a UX/UI designer"
-        ]
-    },
-    "Backend Developer": {
-        "technical": [
-            "• Design a RESTful API for a blog application",
-            "• Explain the concept of a microservices architecture",
-            "• How do you handle database transactions and concurrency?"
-        ],
-        "behavioral": [
-            "• Tell me about a time you had to handle a critical production issue",
-            "• How do you ensure the security of a backend system?",
-            "• Describe a time you had to refactor legacy code"
-        ]
-    },
-    "ML Engineer": {
-        "technical": [
-            "• Explain the bias-variance trade-off",
-            "• How do you deploy a machine learning model to production?",
-            "• Describe the steps in a typical machine learning project pipeline"
-        ],
-        "behavioral": [
-            "• Tell me about a time you dealt with a biased dataset",
-            "• How do you handle model performance issues in production?",
-            "• Describe a project where you collaborated with data scientists and engineers"
-        ]
-    },
-    "Full Stack Developer": {
-        "technical": [
-            "• How do you manage state between the frontend and backend?",
-            "• Explain the purpose of a CDN in a web application",
-            "• Describe how to implement user authentication from end-to-end"
-        ],
-        "behavioral": [
-            "• Tell me about a time you led a feature from start to finish",
-            "• How do you stay proficient in both frontend and backend technologies?",
-            "• Describe a time you had to make a trade-off between speed and quality"
-        ]
-    },
-    "DevOps Engineer": {
-        "technical": [
-            "• Explain the CI/CD pipeline and its components",
-            "• How would you set up monitoring for a distributed system?",
-            "• Describe the benefits of using containers like Docker"
-        ],
-        "behavioral": [
-            "• Tell me about a time you had to troubleshoot a system outage",
-            "• How do you automate routine tasks in your workflow?",
-            "• Describe a time you improved the reliability of a system"
-        ]
-    },
-    "QA Engineer": {
-        "technical": [
-            "• What is the difference between functional and non-functional testing?",
-            "• Explain the concept of test automation frameworks",
-            "• How do you approach testing a new feature?"
-        ],
-        "behavioral": [
-            "• Tell me about a time you found a critical bug in production",
-            "• How do you work with developers to resolve issues?",
-            "• Describe your experience with agile methodologies"
-        ]
-    },
-    "System Architect": {
-        "technical": [
-            "• Design a high-level architecture for a social media platform",
-            "• Explain the CAP theorem and its implications",
-            "• How do you handle system scalability and performance bottlenecks?"
-        ],
-        "behavioral": [
-            "• Tell me about a time you had to make a major architectural decision",
-            "• How do you communicate complex designs to a non-technical audience?",
-            "• Describe a time you successfully migrated a system"
-        ]
-    }
-}
+# How many upcoming questions to generate in the background while the candidate answers
+PREFETCH_DEPTH = int(os.getenv("QUESTION_PREFETCH_DEPTH", "1"))
+
+# Render feedback and the summary token by token instead of waiting for the full completion
+STREAM_RESPONSES = os.getenv("STREAM_LLM_OUTPUT", "1") == "1"
 
 # Mapping between display names and internal keys
 DISPLAY_TO_KEY = {
@@ -191,8 +75,60 @@ def init_session():
         st.session_state.show_feedback = False
     if 'current_feedback' not in st.session_state:
         st.session_state.current_feedback = ""
+    if 'pending_answer' not in st.session_state:
+        st.session_state.pending_answer = None
     if 'total_questions' not in st.session_state:
         st.session_state.total_questions = 5
+    if 'defer_grading' not in st.session_state:
+        st.session_state.defer_grading = False
+    if 'answer_count' not in st.session_state:
+        st.session_state.answer_count = 0
+        # First run of this browser session: pick up an interview from the URL if there is one
+        session_id = st.query_params.get("session")
+        if session_id:
+            resume_session(session_id)
+
+def resume_session(session_id):
+    """Restore an interview from the session store; returns False when the ID is unknown"""
+    session = session_store.get(session_id)
+    if session is None:
+        return False
+    
+    bot = st.session_state.bot
+    bot.setup(session['role'], session['domain'], session['interview_mode'], session['difficulty'])
+    bot.session_id = session_id
+    records = session_store.records(session_id)
+    bot.resume_questions(records, session['current_question'])
+    
+    st.session_state.total_questions = session['total_questions']
+    st.session_state.defer_grading = session['defer_grading']
+    st.session_state.question_count = session['question_count']
+    st.session_state.current_question = session['current_question']
+    st.session_state.answer_count = len(records)
+    st.session_state.session_history = records[-SESSION_WORKING_SET:]
+    st.session_state.pop('older_history', None)
+    st.session_state.interview_started = session['status'] == "active"
+    st.session_state.interview_complete = session['status'] == "complete"
+    st.session_state.show_feedback = False
+    st.session_state.current_feedback = ""
+    st.session_state.pending_answer = None
+    return True
+
+def full_history():
+    """Every answer of the current interview, reading records outside the working set back from the store.
+
+    The older records are read once and kept until the next answer is recorded,
+    so reruns that show the history do not query the store again.
+    """
+    history = st.session_state.session_history
+    older = st.session_state.answer_count - len(history)
+    if older <= 0:
+        return history
+    key = (st.session_state.bot.session_id, older)
+    cached = st.session_state.get('older_history')
+    if cached is None or cached[0] != key:
+        cached = st.session_state.older_history = (key, session_store.records(key[0], limit=older))
+    return cached[1] + history
 
 def start_interview():
     """Setup and start the interview session"""
@@ -200,8 +136,11 @@ def start_interview():
     st.session_state.interview_complete = False
     st.session_state.question_count = 0
     st.session_state.session_history = []
+    st.session_state.answer_count = 0
+    st.session_state.pop('older_history', None)
     st.session_state.show_feedback = False
     st.session_state.current_feedback = ""
+    st.session_state.defer_grading = st.session_state.grade_at_end
     
     role = st.session_state.selected_role
     domain = st.session_state.selected_domain
@@ -212,7 +151,22 @@ def start_interview():
     mapped_role = DISPLAY_TO_KEY.get(role, "Software Engineer")
     mapped_domain = DISPLAY_TO_KEY.get(domain, "General")
     
-    st.session_state.bot.setup(mapped_role, mapped_domain, mode, difficulty)
+    bot = st.session_state.bot
+    bot.session_id = uuid.uuid4().hex
+    bot.setup(mapped_role, mapped_domain, mode, difficulty)
+    session_store.create(
+        bot.session_id,
+        role=mapped_role,
+        domain=mapped_domain,
+        interview_mode=mode,
+        difficulty=difficulty,
+        total_questions=st.session_state.total_questions,
+        defer_grading=st.session_state.defer_grading,
+        question_count=0,
+        current_question=None,
+        status="active"
+    )
+    st.query_params["session"] = bot.session_id
     get_next_question()
 
 def get_next_question():
@@ -220,7 +174,18 @@ def get_next_question():
     st.session_state.question_count += 1
     st.session_state.show_feedback = False
     st.session_state.current_feedback = ""
+    st.session_state.pending_answer = None
     st.session_state.current_question = st.session_state.bot.generate_question(st.session_state.question_count)
+    st.session_state.bot.prefetch_questions(
+        st.session_state.question_count,
+        depth=PREFETCH_DEPTH,
+        limit=st.session_state.total_questions
+    )
+    session_store.update(
+        st.session_state.bot.session_id,
+        question_count=st.session_state.question_count,
+        current_question=st.session_state.current_question
+    )
     st.session_state.user_answer = ""
     st.rerun()
 
@@ -230,39 +195,109 @@ def submit_answer():
         question = st.session_state.current_question
         answer = st.session_state.user_answer
         
-        evaluation = st.session_state.bot.evaluate_answer(question, answer)
+        if st.session_state.defer_grading:
+            # Graded together in one batched request by finish_interview()
+            record_answer(question, answer, None)
+            return
         
-        # Store the entire Q&A pair in history
-        st.session_state.session_history.append({
-            "question_number": st.session_state.question_count,
-            "question": question,
-            "answer": answer,
-            "score": evaluation['score'],
-            "feedback": evaluation['feedback'],
-            "word_count": len(answer.split()),
-            "timestamp": datetime.now().isoformat()
-        })
+        if STREAM_RESPONSES:
+            # Evaluated on the next run by stream_feedback() so the feedback can render as it arrives
+            st.session_state.pending_answer = (question, answer)
+            st.session_state.show_feedback = False
+            return
         
-        st.session_state.current_feedback = evaluation['feedback']
-        st.session_state.show_feedback = True
+        evaluation = st.session_state.bot.evaluate_answer(question, answer)
+        record_answer(question, answer, evaluation)
         st.rerun()
     else:
         st.warning("Please provide an answer before submitting.")
 
+def record_answer(question, answer, evaluation):
+    """Store the entire Q&A pair in history and show its feedback (evaluation is None when grading is deferred)"""
+    record = {
+        "question_number": st.session_state.question_count,
+        "question": question,
+        "topic": st.session_state.bot.question_topic(question),
+        "answer": answer,
+        "score": evaluation['score'] if evaluation else None,
+        "feedback": evaluation['feedback'] if evaluation else "",
+        "word_count": len(answer.split()),
+        "timestamp": datetime.now().isoformat()
+    }
+    session_store.append(st.session_state.bot.session_id, record)
+    st.session_state.answer_count += 1
+    st.session_state.pop('older_history', None)
+    
+    # Only the most recent answers stay in memory; the store has the rest
+    history = st.session_state.session_history
+    history.append(record)
+    del history[:-SESSION_WORKING_SET]
+    
+    if evaluation:
+        st.session_state.current_feedback = evaluation['feedback']
+    else:
+        st.session_state.current_feedback = "Answer saved. All answers will be graded when you finish the interview."
+    st.session_state.show_feedback = True
+
+def grade_deferred_answers():
+    """Grade every answer still waiting for a score, batching them into as few LLM requests as possible"""
+    pending = [(position, qa) for position, qa in enumerate(full_history()) if qa['score'] is None]
+    if not pending:
+        return
+    
+    evaluations = st.session_state.bot.evaluate_answers([(qa['question'], qa['answer']) for _, qa in pending])
+    for (position, qa), evaluation in zip(pending, evaluations):
+        qa['score'] = evaluation['score']
+        qa['feedback'] = evaluation['feedback']
+        session_store.set_evaluation(st.session_state.bot.session_id, position, evaluation['score'], evaluation['feedback'])
+
+def stream_feedback():
+    """Evaluate the pending answer, rendering the score and feedback as they stream in"""
+    question, answer = st.session_state.pending_answer
+    st.session_state.pending_answer = None
+    
+    score_placeholder = st.empty()
+    feedback_placeholder = st.empty()
+    feedback = ""
+    evaluation = None
+    
+    for kind, value in st.session_state.bot.stream_evaluation(question, answer):
+        if kind == "score":
+            score_placeholder.metric("Score", f"{value}/100")
+        elif kind == "feedback":
+            feedback += value
+            feedback_placeholder.info(feedback)
+        else:
+            evaluation = value
+    
+    record_answer(question, answer, evaluation)
+    feedback_placeholder.info(evaluation['feedback'])
+
 def finish_interview():
     """End the interview session and generate a summary"""
+    grade_deferred_answers()
+    session_store.update(st.session_state.bot.session_id, status="complete")
     st.session_state.interview_complete = True
     st.session_state.interview_started = False
     st.session_state.show_feedback = False
     st.session_state.current_feedback = ""
+    st.session_state.pending_answer = None
 
 def display_summary():
     """Show the final interview summary report"""
-    summary_report = st.session_state.bot.generate_summary(st.session_state.session_history)
-    st.markdown(summary_report, unsafe_allow_html=True)
+    history = full_history()
+    if STREAM_RESPONSES:
+        summary_placeholder = st.empty()
+        summary_report = ""
+        for chunk in st.session_state.bot.stream_summary(history):
+            summary_report += chunk
+            summary_placeholder.markdown(summary_report, unsafe_allow_html=True)
+    else:
+        summary_report = st.session_state.bot.generate_summary(history)
+        st.markdown(summary_report, unsafe_allow_html=True)
     
     # Analyze scores for performance metrics
-    scores = [qa['score'] for qa in st.session_state.session_history]
+    scores = [qa['score'] for qa in history]
     if scores:
         avg_score = sum(scores) / len(scores)
         
@@ -280,7 +315,7 @@ def display_summary():
     
     # Detailed results
     st.subheader("📝 Question Review")
-    for i, qa in enumerate(st.session_state.session_history, 1):
+    for i, qa in enumerate(history, 1):
         score_color = "🟢" if qa['score'] >= 70 else "🟡" if qa['score'] >= 50 else "🔴"
         
         with st.expander(f"Q{i} {score_color} {qa['score']}/100"):
@@ -295,6 +330,7 @@ def display_summary():
         if st.button("🔄 New Interview", type="primary"):
             st.session_state.interview_started = False
             st.session_state.interview_complete = False
+            st.query_params.pop("session", None)
             st.rerun()
     
     with col2:
@@ -304,7 +340,7 @@ def display_summary():
             'role': st.session_state.bot.role,
             'mode': st.session_state.bot.interview_mode,
             'avg_score': avg_score,
-            'questions': st.session_state.session_history
+            'questions': history
         }
         
         filename = f"interview_report_{st.session_state.bot.role.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
@@ -328,16 +364,34 @@ with st.sidebar:
     st.session_state.selected_role = st.selectbox("Select Role", options=ROLES)
     st.session_state.selected_domain = st.selectbox("Select Domain", options=DOMAINS, index=0)
     st.session_state.selected_mode = st.radio("Interview Mode", options=["Technical", "Behavioral"], index=0)
-    st.session_state.selected_difficulty = st.radio("Difficulty", options=["Easy", "Medium", "Hard"], index=1)
+    st.session_state.selected_difficulty = st.radio("Difficulty", options=list(DIFFICULTIES), index=1)
     
     st.session_state.total_questions = st.number_input(
         "Number of Questions",
         min_value=1,
         max_value=15,
-        value=5,
+        value=st.session_state.total_questions,
         step=1
     )
     
+    st.session_state.grade_at_end = st.checkbox(
+        "Grade all answers at the end",
+        value=st.session_state.defer_grading,
+        help="Skip per-answer feedback and grade the whole interview in one batch when you finish."
+    )
+
+    if st.session_state.interview_started or st.session_state.interview_complete:
+        st.caption(f"Session ID: `{st.session_state.bot.session_id}`")
+
+    with st.expander("Resume an interview"):
+        resume_id = st.text_input("Session ID", key="resume_id")
+        if st.button("Resume") and resume_id.strip():
+            if resume_session(resume_id.strip()):
+                st.query_params["session"] = resume_id.strip()
+                st.rerun()
+            else:
+                st.warning("No interview found with that session ID.")
+
     st.write("---")
     
     # Sample questions based on selection
@@ -371,7 +425,11 @@ elif st.session_state.interview_started and not st.session_state.interview_compl
     with col3: # <<<< NEW: Added skip button
         st.button("⏭️ Skip", on_click=get_next_question, help="Skip this question without providing an answer.")
 
-    if st.session_state.show_feedback and st.session_state.current_feedback:
+    if st.session_state.pending_answer:
+        st.write("---")
+        st.subheader("Feedback for your answer:")
+        stream_feedback()
+    elif st.session_state.show_feedback and st.session_state.current_feedback:
         st.write("---")
         st.subheader("Feedback for your answer:")
         st.info(st.session_state.current_feedback)
@@ -380,7 +438,13 @@ elif st.session_state.interview_started and not st.session_state.interview_compl
     if st.session_state.session_history:
         st.write("---")
         st.subheader("📝 Past Question Review")
-        for i, qa in enumerate(st.session_state.session_history, 1):
+        for i, qa in enumerate(full_history(), 1):
+            if qa['score'] is None:
+                with st.expander(f"Q{i} ⏳ Graded at the end"):
+                    st.write("**Question:**", qa['question'])
+                    st.write("**Your Answer:**", qa['answer'])
+                continue
+            
             score_color = "🟢" if qa['score'] >= 70 else "🟡" if qa['score'] >= 50 else "🔴"
             
             with st.expander(f"Q{i} {score_color} {qa['score']}/100"):
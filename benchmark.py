@@ -0,0 +1,186 @@
+"""Offline benchmarks for the interview engine.
+
+Usage:
+    python benchmark.py memory [--sessions 500]
+    python benchmark.py interviews [--interviews 50] [--questions 5] [--concurrency 8]
+                                   [--latency-ms 300] [--jitter-ms 100] [--failure-rate 0]
+                                   [--replay recordings.jsonl]
+
+The interviews benchmark drives full interviews (setup, N x generate_question /
+evaluate_answer, generate_summary) against fake_llm.FakeChatClient, so runs are
+repeatable and never touch the live API.
+"""
+import argparse
+import gc
+import random
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import llm_client
+from bot_engine import InterviewBot, DOMAIN_TOPICS
+from fake_llm import FakeChatClient
+from perf_stats import summarize_latencies, format_latencies
+
+STAGES = ("setup", "question", "evaluate", "summary", "interview")
+
+BENCH_CONFIGS = [
+    ("Software Engineer", "Technical", "Medium"),
+    ("Data Analyst", "Behavioral", "Easy"),
+    ("Backend Developer", "Technical", "Hard"),
+    ("Product Manager", "Behavioral", "Medium")
+]
+
+FILLER_WORDS = (
+    "first I would clarify the requirements then measure the baseline and compare "
+    "trade offs such as latency cost and complexity before choosing an approach with tests"
+).split()
+
+
+def bench_session_memory(sessions):
+    """Measure the memory each additional interview session costs"""
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    bots = []
+    for i in range(sessions):
+        bot = InterviewBot()
+        bot.setup("Software Engineer", "General", "Technical" if i % 2 else "Behavioral", "Medium")
+        bots.append(bot)
+
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_session = (current - baseline) / sessions
+    shared_clients = len({id(bot.client) for bot in bots if bot.client is not None})
+    shared_catalogs = len({id(bot.domain_topics) for bot in bots})
+
+    print(f"Sessions:               {sessions}")
+    print(f"Per-session footprint:  {per_session / 1024:.2f} KiB")
+    print(f"Total allocated:        {(current - baseline) / 1024:.1f} KiB (peak {(peak - baseline) / 1024:.1f} KiB)")
+    print(f"Distinct Groq clients:  {shared_clients}")
+    print(f"Distinct topic catalogs: {shared_catalogs} ({len(DOMAIN_TOPICS)} roles)")
+    return per_session
+
+
+def synthetic_answer(rng, interview_id, question_number):
+    words = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(10, 150))]
+    return f"Answer {interview_id}.{question_number}: " + " ".join(words)
+
+
+def run_interview(client, interview_id, questions, seed):
+    """Run one full interview and return {stage: [seconds, ...]}"""
+    rng = random.Random(seed + interview_id)
+    timings = {stage: [] for stage in STAGES}
+    role, mode, difficulty = BENCH_CONFIGS[interview_id % len(BENCH_CONFIGS)]
+    interview_started = time.perf_counter()
+
+    started = time.perf_counter()
+    bot = InterviewBot(client=client)
+    bot.setup(role, "General", mode, difficulty)
+    timings["setup"].append(time.perf_counter() - started)
+
+    history = []
+    for number in range(1, questions + 1):
+        started = time.perf_counter()
+        question = bot.generate_question(number)
+        timings["question"].append(time.perf_counter() - started)
+
+        answer = synthetic_answer(rng, interview_id, number)
+        started = time.perf_counter()
+        evaluation = bot.evaluate_answer(question, answer)
+        timings["evaluate"].append(time.perf_counter() - started)
+
+        history.append({
+            "question_number": number,
+            "question": question,
+            "answer": answer,
+            "score": evaluation["score"],
+            "feedback": evaluation["feedback"]
+        })
+
+    started = time.perf_counter()
+    bot.generate_summary(history)
+    timings["summary"].append(time.perf_counter() - started)
+
+    timings["interview"].append(time.perf_counter() - interview_started)
+    return timings
+
+
+def bench_interviews(args):
+    """End-to-end interview latency, throughput and memory against the fake LLM"""
+    client = FakeChatClient(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        replay_path=args.replay,
+        seed=args.seed
+    )
+    llm_client.set_shared_client(client)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    timings = {stage: [] for stage in STAGES}
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(run_interview, client, interview_id, args.questions, args.seed)
+            for interview_id in range(args.interviews)
+        ]
+        for future in futures:
+            for stage, values in future.result().items():
+                timings[stage].extend(values)
+
+    elapsed = time.perf_counter() - started
+    calls = len(timings["question"]) + len(timings["evaluate"]) + len(timings["summary"])
+
+    print(f"Interviews: {args.interviews} x {args.questions} questions, concurrency {args.concurrency}, "
+          f"fake latency {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, failure rate {args.failure_rate:.1%}")
+    for stage in STAGES:
+        print(format_latencies(stage, summarize_latencies(timings[stage])))
+    print(f"Throughput: {args.interviews / elapsed:.2f} interviews/s, {calls / elapsed:.1f} engine calls/s "
+          f"({client.calls} upstream requests, {client.replayed} replayed) in {elapsed:.1f}s")
+
+    metrics = llm_client.get_llm_metrics()
+    print(f"Call layer: {metrics['retries']} retries, {metrics['failures']} failures, "
+          f"{metrics['short_circuited']} short-circuited, breaker {metrics['breaker_state']}")
+
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"Memory: traced peak {peak / 1024 / 1024:.1f} MiB")
+    # ru_maxrss is KiB on Linux
+    print(f"Memory: max RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interview engine benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    memory_parser = subparsers.add_parser("memory", help="Per-session memory footprint")
+    memory_parser.add_argument("--sessions", type=int, default=500)
+
+    interviews_parser = subparsers.add_parser("interviews", help="End-to-end interviews against the fake LLM")
+    interviews_parser.add_argument("--interviews", type=int, default=50)
+    interviews_parser.add_argument("--questions", type=int, default=5)
+    interviews_parser.add_argument("--concurrency", type=int, default=8)
+    interviews_parser.add_argument("--latency-ms", type=float, default=300)
+    interviews_parser.add_argument("--jitter-ms", type=float, default=100)
+    interviews_parser.add_argument("--failure-rate", type=float, default=0.0)
+    interviews_parser.add_argument("--replay", help="JSONL recordings from fake_llm.RecordingClient")
+    interviews_parser.add_argument("--seed", type=int, default=1234)
+    interviews_parser.add_argument("--trace-memory", action="store_true", help="also report tracemalloc peak")
+
+    args = parser.parse_args()
+    if args.command == "memory":
+        bench_session_memory(args.sessions)
+    elif args.command == "interviews":
+        bench_interviews(args)
+
+
+if __name__ == "__main__":
+    main()
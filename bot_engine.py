@@ -1,356 +1,961 @@
 import os
-from groq import Groq
+import re
+import json
+import hashlib
+import asyncio
+import uuid
+import threading
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 from dotenv import load_dotenv
+from llm_client import (
+    get_api_key, get_shared_client, get_shared_async_client,
+    chat_completion, async_chat_completion, get_llm_metrics
+)
+from question_pool import QuestionPool, POOL_ENABLED, POOL_MAX_KEYS
+from eval_cache import evaluation_cache, evaluation_cache_key, EVAL_CACHE_ENABLED
+from metrics import registry as metrics_registry
+from scheduler import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from prompts import PromptConfig, REASK_PROMPT, SUBSCORE_KEYS, registry as prompt_registry
+from local_scorer import LocalScorer, content_tokens
+from question_index import QuestionIndex
+from topic_scheduler import TopicScheduler
+from model_router import model_router
+from question_bank import (
+    QuestionBank, QuestionSampler, seed_questions, QUESTION_TEMPLATES, QUESTION_BANK_ENABLED, QUESTION_BANK_RECORD
+)
 
 load_dotenv()
 
+# Process-wide worker for background question prefetch
+PREFETCH_WORKERS = int(os.getenv("QUESTION_PREFETCH_WORKERS", "4"))
+_prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="question-prefetch")
+
+# Domain-specific topics based on the requirements from the images.
+# Built once per process and shared read-only by every InterviewBot.
+DOMAIN_TOPICS = MappingProxyType({
+    "Software Engineer": MappingProxyType({
+        "technical": (
+            "Data Structures and Algorithms",
+            "Object-Oriented Programming",
+            "Database Design and SQL",
+            "System Design",
+            "Code Optimization",
+            "Testing and Debugging",
+            "Version Control (Git)",
+            "API Design"
+        ),
+        "behavioral": (
+            "Problem-solving approach",
+            "Team collaboration",
+            "Handling tight deadlines",
+            "Learning new technologies",
+            "Code review feedback"
+        )
+    }),
+    "Product Manager": MappingProxyType({
+        "technical": (
+            "Product Strategy",
+            "Market Analysis",
+            "Feature Prioritization",
+            "User Experience Design",
+            "Data Analytics",
+            "A/B Testing",
+            "Roadmap Planning",
+            "Stakeholder Management"
+        ),
+        "behavioral": (
+            "Managing competing priorities",
+            "Cross-functional leadership",
+            "Customer feedback handling",
+            "Difficult decisions",
+            "Team motivation"
+        )
+    }),
+    "Data Analyst": MappingProxyType({
+        "technical": (
+            "Statistical Analysis",
+            "Data Visualization",
+            "SQL and Database Queries",
+            "Python/R Programming",
+            "Excel and Spreadsheet Analysis",
+            "Business Intelligence Tools",
+            "Data Cleaning and Preprocessing",
+            "Hypothesis Testing"
+        ),
+        "behavioral": (
+            "Presenting complex data insights",
+            "Working with non-technical stakeholders",
+            "Handling data quality issues",
+            "Meeting analysis deadlines",
+            "Collaborative problem-solving"
+        )
+    }),
+    "Frontend Developer": MappingProxyType({
+        "technical": (
+            "HTML, CSS, JavaScript",
+            "React/Vue/Angular Frameworks",
+            "Responsive Web Design",
+            "Browser Compatibility",
+            "Performance Optimization",
+            "CSS Preprocessors",
+            "Build Tools and Bundlers",
+            "State Management"
+        ),
+        "behavioral": (
+            "UI/UX collaboration",
+            "Cross-browser testing challenges",
+            "Design implementation feedback",
+            "Performance optimization decisions",
+            "Learning new frameworks"
+        )
+    }),
+    "Backend Developer": MappingProxyType({
+        "technical": (
+            "Server-side Programming",
+            "Database Design and Optimization",
+            "API Development (REST/GraphQL)",
+            "Microservices Architecture",
+            "Caching Strategies",
+            "Security Implementation",
+            "Load Balancing",
+            "Message Queues"
+        ),
+        "behavioral": (
+            "System scalability decisions",
+            "Database optimization challenges",
+            "API design feedback",
+            "Security incident handling",
+            "Performance bottleneck resolution"
+        )
+    }),
+    "ML Engineer": MappingProxyType({
+        "technical": (
+            "Machine Learning Algorithms",
+            "Feature Engineering",
+            "Model Evaluation Metrics",
+            "Deep Learning Frameworks",
+            "Data Preprocessing",
+            "Model Deployment and MLOps",
+            "A/B Testing for ML",
+            "Model Monitoring"
+        ),
+        "behavioral": (
+            "Explaining ML concepts to non-technical audiences",
+            "Handling biased datasets",
+            "Model performance issues",
+            "Interdisciplinary collaboration",
+            "Continuous learning in ML"
+        )
+    }),
+    "System Design": MappingProxyType({
+        "technical": (
+            "Distributed Systems",
+            "Load Balancing",
+            "Database Sharding",
+            "Caching Strategies",
+            "Message Queues",
+            "Microservices vs Monolithic",
+            "Consistency Models",
+            "Fault Tolerance"
+        ),
+        "behavioral": (
+            "Architecture decision trade-offs",
+            "System failure incident response",
+            "Scalability planning",
+            "Cross-team technical communication",
+            "Design review feedback"
+        )
+    })
+})
+
+# Difficulty levels offered by the UI
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+
+# Answers graded per request by evaluate_answers()
+BATCH_EVALUATION_SIZE = int(os.getenv("BATCH_EVALUATION_SIZE", "5"))
+_BATCH_ITEM_RE = re.compile(r'^ITEM\s*#?\s*(\d+)\b', re.IGNORECASE)
+
+# Evaluations ask for a fixed JSON object instead of SCORE:/FEEDBACK: lines
+EVAL_JSON_MODE = os.getenv("EVAL_JSON_MODE", "1") == "1"
+# Also ask for one subscore per evaluation criterion
+EVAL_SUBSCORES = os.getenv("EVAL_SUBSCORES", "0") == "1"
+EVAL_JSON_MAX_TOKENS = int(os.getenv("EVAL_JSON_MAX_TOKENS", "160"))
+_SCORE_RE = re.compile(r'(\d+(?:\.\d+)?)(?:\s*/\s*(\d+))?')
+_JSON_SCORE_RE = re.compile(r'"score"\s*:\s*(\d+(?:\.\d+)?)\s*[,}\s]')
+_JSON_FEEDBACK_RE = re.compile(r'"feedback"\s*:\s*"')
+# "incremental" keeps a rolling digest for the final report; "full" sends the whole transcript
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "incremental")
+# Longer histories without a digest are summarized map-reduce style in chunks of SUMMARY_MAP_CHUNK
+SUMMARY_MAP_REDUCE_THRESHOLD = int(os.getenv("SUMMARY_MAP_REDUCE_THRESHOLD", "8"))
+SUMMARY_MAP_CHUNK = int(os.getenv("SUMMARY_MAP_CHUNK", "4"))
+# When on, near-empty answers (fewer than LOCAL_PRESCREEN_MIN_WORDS distinct content words)
+# are graded by the offline scorer without an LLM call
+LOCAL_PRESCREEN = os.getenv("LOCAL_PRESCREEN", "0") == "1"
+LOCAL_PRESCREEN_MIN_WORDS = int(os.getenv("LOCAL_PRESCREEN_MIN_WORDS", "2"))
+# Earlier questions listed in the question prompt, chosen to be as different from each other as possible
+PROMPT_PREVIOUS_QUESTIONS = int(os.getenv("PROMPT_PREVIOUS_QUESTIONS", "2"))
+# Extra requests when a generated question is a near-duplicate of one already asked
+QUESTION_DEDUP_RETRIES = int(os.getenv("QUESTION_DEDUP_RETRIES", "1"))
+
+_JSON_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+# Offline rubric scorer used for fallbacks and the pre-screen
+local_scorer = LocalScorer(DOMAIN_TOPICS)
+
+
+def _seed_question_bank():
+    return seed_questions(DOMAIN_TOPICS, local_scorer.best_topic)
+
+
+# Offline question bank shared by every session; opened (and seeded if empty) on first use
+question_bank = QuestionBank(seed=_seed_question_bank)
+
+
+
 class InterviewBot:
-    def __init__(self):
-        self.api_key = os.getenv("GROQ_API_KEY")
-        self.client = Groq(api_key=self.api_key) if self.api_key else None
-        self.model = "llama-3.1-8b-instant"
+    # Read-only catalog shared across sessions; instances only hold per-session state
+    domain_topics = DOMAIN_TOPICS
+    # Process-wide per-call-type metrics (latency, tokens, retries, cache, fallbacks)
+    metrics = metrics_registry
+
+    def __init__(self, client=None):
+        self.api_key = get_api_key()
+        self.client = client if client is not None else get_shared_client()
+        # Identifies this session to the request scheduler for fair queuing
+        self.session_id = uuid.uuid4().hex
+        # Default (small) model; each request's model and budget come from model_router
+        self.model = model_router.models["small"]
         
-        # Domain-specific topics based on the requirements from the images
-        self.domain_topics = {
-            "Software Engineer": {
-                "technical": [
-                    "Data Structures and Algorithms",
-                    "Object-Oriented Programming",
-                    "Database Design and SQL",
-                    "System Design",
-                    "Code Optimization",
-                    "Testing and Debugging",
-                    "Version Control (Git)",
-                    "API Design"
-                ],
-                "behavioral": [
-                    "Problem-solving approach",
-                    "Team collaboration",
-                    "Handling tight deadlines",
-                    "Learning new technologies",
-                    "Code review feedback"
-                ]
-            },
-            "Product Manager": {
-                "technical": [
-                    "Product Strategy",
-                    "Market Analysis",
-                    "Feature Prioritization",
-                    "User Experience Design",
-                    "Data Analytics",
-                    "A/B Testing",
-                    "Roadmap Planning",
-                    "Stakeholder Management"
-                ],
-                "behavioral": [
-                    "Managing competing priorities",
-                    "Cross-functional leadership",
-                    "Customer feedback handling",
-                    "Difficult decisions",
-                    "Team motivation"
-                ]
-            },
-            "Data Analyst": {
-                "technical": [
-                    "Statistical Analysis",
-                    "Data Visualization",
-                    "SQL and Database Queries",
-                    "Python/R Programming",
-                    "Excel and Spreadsheet Analysis",
-                    "Business Intelligence Tools",
-                    "Data Cleaning and Preprocessing",
-                    "Hypothesis Testing"
-                ],
-                "behavioral": [
-                    "Presenting complex data insights",
-                    "Working with non-technical stakeholders",
-                    "Handling data quality issues",
-                    "Meeting analysis deadlines",
-                    "Collaborative problem-solving"
-                ]
-            },
-            "Frontend Developer": {
-                "technical": [
-                    "HTML, CSS, JavaScript",
-                    "React/Vue/Angular Frameworks",
-                    "Responsive Web Design",
-                    "Browser Compatibility",
-                    "Performance Optimization",
-                    "CSS Preprocessors",
-                    "Build Tools and Bundlers",
-                    "State Management"
-                ],
-                "behavioral": [
-                    "UI/UX collaboration",
-                    "Cross-browser testing challenges",
-                    "Design implementation feedback",
-                    "Performance optimization decisions",
-                    "Learning new frameworks"
-                ]
-            },
-            "Backend Developer": {
-                "technical": [
-                    "Server-side Programming",
-                    "Database Design and Optimization",
-                    "API Development (REST/GraphQL)",
-                    "Microservices Architecture",
-                    "Caching Strategies",
-                    "Security Implementation",
-                    "Load Balancing",
-                    "Message Queues"
-                ],
-                "behavioral": [
-                    "System scalability decisions",
-                    "Database optimization challenges",
-                    "API design feedback",
-                    "Security incident handling",
-                    "Performance bottleneck resolution"
-                ]
-            },
-            "ML Engineer": {
-                "technical": [
-                    "Machine Learning Algorithms",
-                    "Feature Engineering",
-                    "Model Evaluation Metrics",
-                    "Deep Learning Frameworks",
-                    "Data Preprocessing",
-                    "Model Deployment and MLOps",
-                    "A/B Testing for ML",
-                    "Model Monitoring"
-                ],
-                "behavioral": [
-                    "Explaining ML concepts to non-technical audiences",
-                    "Handling biased datasets",
-                    "Model performance issues",
-                    "Interdisciplinary collaboration",
-                    "Continuous learning in ML"
-                ]
-            },
-            "System Design": {
-                "technical": [
-                    "Distributed Systems",
-                    "Load Balancing",
-                    "Database Sharding",
-                    "Caching Strategies",
-                    "Message Queues",
-                    "Microservices vs Monolithic",
-                    "Consistency Models",
-                    "Fault Tolerance"
-                ],
-                "behavioral": [
-                    "Architecture decision trade-offs",
-                    "System failure incident response",
-                    "Scalability planning",
-                    "Cross-team technical communication",
-                    "Design review feedback"
-                ]
-            }
-        }
+        # Background question prefetch (question N+1.. generated while N is answered)
+        self._prefetch_lock = threading.Lock()
+        self._prefetched = {}
+        self._generation = 0
+        self.questions_asked = []
+        # Near-duplicate index over questions_asked
+        self._question_index = QuestionIndex()
+        # Target topic per question number, and the topic each asked question was generated for
+        self._topic_scheduler = TopicScheduler(())
+        self._question_topics = {}
+        # Offline questions drawn without repeats for the current interview
+        self._question_sampler = QuestionSampler(question_bank)
+        
+        # Final summary memo: (history hash, report) for the current interview
+        self._summary_cache = None
+        self.summary_cache_hits = 0
+        self.summary_cache_misses = 0
+        
+        # Rolling digest of graded answers, updated in the background after each evaluation
+        self.incremental_summary = SUMMARY_MODE == "incremental"
+        self._digest = ""
+        self._digest_keys = []
+        self._digest_update = None
         
     def has_api_key(self):
-        return bool(self.api_key and self.client)
+        return self.client is not None
     
     def setup(self, role, domain, interview_mode, difficulty):
         self.role = role
         self.domain = domain if domain != "General" else None
         self.interview_mode = interview_mode
         self.difficulty = difficulty
-        self.questions_asked = []
+        self._summary_cache = None
+        with self._prefetch_lock:
+            # Invalidate anything still being prefetched for the previous interview
+            self._generation += 1
+            for future in self._prefetched.values():
+                future.cancel()
+            self._prefetched = {}
+            self.questions_asked = []
+            self._question_index = QuestionIndex()
+            self._topic_scheduler = TopicScheduler(self._get_relevant_topics())
+            self._question_topics = {}
+            self._question_sampler = QuestionSampler(question_bank)
+            self._digest = ""
+            self._digest_keys = []
+            self._digest_update = None
     
     def generate_question(self, question_number):
-        try:
-            prompt = self._build_question_prompt(question_number)
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert technical interviewer. Generate interview questions that are practical, relevant, and appropriate for the specified role and difficulty level."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.7
-            )
-            
-            question = response.choices[0].message.content.strip()
-            self.questions_asked.append(question)
-            return question
+        """Return question N, using a prefetched result when one exists"""
+        with self._prefetch_lock:
+            future = self._prefetched.pop(question_number, None)
+        
+        # A prefetch still queued behind other background work is cancelled and the question
+        # generated inline at interactive priority. Waiting on one already running is still
+        # cheaper than a second round trip and keeps questions_asked in generation order.
+        if future is not None and not future.cancel():
+            return future.result()
+        
+        with self._prefetch_lock:
+            generation = self._generation
+        return self._generate_question_now(question_number, generation)
+    
+    def prefetch_questions(self, current_number, depth=1, limit=None):
+        """Start generating the questions after current_number on the background worker"""
+        if not self.has_api_key() or depth <= 0:
+            return
+        
+        with self._prefetch_lock:
+            generation = self._generation
+            for question_number in range(current_number + 1, current_number + depth + 1):
+                if limit is not None and question_number > limit:
+                    break
+                if question_number in self._prefetched:
+                    continue
+                # Chain on the previous prefetch so questions append to questions_asked in order
+                previous = self._prefetched.get(question_number - 1)
+                self._prefetched[question_number] = _prefetch_executor.submit(
+                    self._prefetch_question, previous, question_number, generation
+                )
+    
+    def _prefetch_question(self, previous, question_number, generation):
+        if previous is not None and not previous.cancelled():
+            previous.result()
+        return self._generate_question_now(question_number, generation, PRIORITY_BACKGROUND)
+    
+    def _generate_question_now(self, question_number, generation, priority=PRIORITY_INTERACTIVE):
+        with self.metrics.call("question") as call:
+            topic = self._scheduled_topic(question_number)
+            question = self._take_pooled_question(call, topic)
+            if question is not None:
+                self._record_question(question, generation, topic)
+                return question
             
-        except Exception as e:
-            print(f"Error generating question: {e}")
-            return self._get_fallback_question(question_number)
+            try:
+                avoid = []
+                for _ in range(1 + QUESTION_DEDUP_RETRIES):
+                    response = chat_completion(
+                        self.client, **self._call_options(call, priority),
+                        **self._question_request(question_number, avoid, topic)
+                    )
+                    call.record_response(response)
+                    question = response.choices[0].message.content.strip()
+                    if not self._is_near_duplicate(call, question):
+                        break
+                    avoid = [question]
+                
+                self._record_question(question, generation, topic)
+                self._bank_question(question, topic)
+                return question
+                
+            except Exception as e:
+                print(f"Error generating question: {e}")
+                call.record_fallback(e)
+                question = self._get_fallback_question(question_number)
+                self._record_question(question, generation, self._fallback_topic(question_number))
+                return question
     
     def evaluate_answer(self, question, answer):
-        try:
-            prompt = self._build_evaluation_prompt(question, answer)
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert interview evaluator. Provide constructive, specific feedback with scores based on technical accuracy, communication clarity, and practical relevance."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200, # <<<< Reduced tokens for shorter feedback
-                temperature=0.3
-            )
-            
-            evaluation = response.choices[0].message.content.strip()
-            return self._parse_evaluation(evaluation)
+        """Grade one answer and fold it into the running summary digest"""
+        evaluation = self._evaluate_answer(question, answer)
+        self._record_evaluation(question, answer, evaluation)
+        return evaluation
+    
+    def _evaluate_answer(self, question, answer):
+        with self.metrics.call("evaluation") as call:
+            cached = self._get_cached_evaluation(question, answer, call)
+            if cached is not None:
+                return cached
+            prescreened = self._prescreen(call, question, answer)
+            if prescreened is not None:
+                return prescreened
             
-        except Exception as e:
-            print(f"Error evaluating answer: {e}")
-            return self._fallback_evaluation(answer)
+            try:
+                request = self._evaluation_request(question, answer)
+                response = chat_completion(self.client, **self._call_options(call, PRIORITY_INTERACTIVE), **request)
+                call.record_response(response)
+                
+                evaluation, model = self._checked_evaluation(call, request, response.choices[0].message.content.strip())
+                evaluation, model = self._calibrated_evaluation(call, request, evaluation, model)
+                return self._cache_evaluation(question, answer, evaluation, model)
+                
+            except Exception as e:
+                print(f"Error evaluating answer: {e}")
+                call.record_fallback(e)
+                return self._fallback_evaluation(question, answer)
+
+    def evaluate_answers(self, pairs, batch_size=BATCH_EVALUATION_SIZE):
+        """Evaluate many (question, answer) pairs, sending up to batch_size per LLM request.
+
+        Returns evaluations in input order. Cached and pre-screened pairs skip the
+        request, and any item whose block cannot be parsed from a batched reply is
+        re-graded on its own.
+        """
+        results, misses = self._unevaluated(pairs)
+        for chunk in _chunks(misses, batch_size):
+            parsed = self._evaluate_batch([pairs[index] for index in chunk])
+            for index, evaluation in zip(chunk, parsed):
+                results[index] = self._evaluate_answer(*pairs[index]) if evaluation is None else evaluation
+        return results
+
+    def _unevaluated(self, pairs):
+        """(results with cached and pre-screened pairs filled in, indexes of pairs still to grade)"""
+        results = [None] * len(pairs)
+        misses = []
+        for index, (question, answer) in enumerate(pairs):
+            cached = self._get_cached_evaluation(question, answer)
+            if cached is not None:
+                results[index] = cached
+            else:
+                misses.append(index)
+        
+        if LOCAL_PRESCREEN and misses:
+            remaining = []
+            for index in misses:
+                question, answer = pairs[index]
+                if not _near_empty(answer):
+                    remaining.append(index)
+                    continue
+                with self.metrics.call("evaluation") as call:
+                    results[index] = self._prescreen(call, question, answer)
+            misses = remaining
+        return results, misses
+
+    def _evaluate_batch(self, pairs):
+        """Parsed (and cached) evaluations for one batched request, None for items to re-grade on their own"""
+        if len(pairs) < 2 or not self.has_api_key():
+            return [None] * len(pairs)
+        with self.metrics.call("batch_evaluation") as call:
+            try:
+                request = self._batch_evaluation_request(pairs)
+                response = chat_completion(self.client, **self._call_options(call, PRIORITY_INTERACTIVE), **request)
+                call.record_response(response)
+                parsed = self._parse_batch_evaluation(response.choices[0].message.content.strip(), len(pairs))
+                call.parse_failures += parsed.count(None)
+                return self._cache_batch(pairs, parsed, request["model"])
+            except Exception as e:
+                print(f"Error evaluating answer batch: {e}")
+                call.record_fallback(e)
+                return [None] * len(pairs)
 
     def generate_summary(self, session_history):
-        if not self.has_api_key():
-            return self._generate_fallback_summary(session_history)
+        """Return the final report, reusing the previous one while the history is unchanged"""
+        with self.metrics.call("summary") as call:
+            cache_key = self._summary_cache_key(session_history)
+            cached = self._get_cached_summary(cache_key, call)
+            if cached is not None:
+                return cached
+
+            if not self.has_api_key():
+                call.fallback = True
+                summary = self._generate_fallback_summary(session_history)
+                self._summary_cache = (cache_key, summary)
+                return summary
+
+            try:
+                request = self._summary_request(session_history, self._summary_digest(session_history))
+                response = chat_completion(self.client, **self._call_options(call, PRIORITY_BACKGROUND), **request)
+                call.record_response(response)
+                
+                summary = response.choices[0].message.content.strip()
+                self._summary_cache = (cache_key, summary)
+                return summary
+                
+            except Exception as e:
+                # Not cached, so the next rerun gets another chance at the full report
+                print(f"Error generating summary: {e}")
+                call.record_fallback(e)
+                return self._generate_fallback_summary(session_history)
+
+    def stream_evaluation(self, question, answer):
+        """Evaluate an answer while streaming, yielding (kind, value) events.
+
+        Yields ("score", int) as soon as the SCORE line is complete, ("feedback", str)
+        for each piece of feedback text, and finally ("result", dict) with the same
+        value evaluate_answer() would return.
+        """
+        with self.metrics.call("evaluation") as call:
+            cached = self._get_cached_evaluation(question, answer, call)
+            if cached is None:
+                cached = self._prescreen(call, question, answer)
+            if cached is not None:
+                yield ("score", cached['score'])
+                yield ("feedback", cached['feedback'])
+                self._record_evaluation(question, answer, cached)
+                yield ("result", cached)
+                return
+
+            parser = _StreamingJsonEvaluationParser() if EVAL_JSON_MODE else _StreamingEvaluationParser(self)
+            try:
+                request = self._evaluation_request(question, answer, stream=True)
+                options = self._call_options(call, PRIORITY_INTERACTIVE)
+                for chunk in chat_completion(self.client, stream=True, **options, **request):
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        call.first_token()
+                        yield from parser.feed(delta)
+                    self._record_stream_usage(call, chunk)
+                yield from parser.close()
+                evaluation, model = self._checked_evaluation(call, request, parser.text.strip())
+                evaluation = self._cache_evaluation(question, answer, evaluation, model)
+                self._record_evaluation(question, answer, evaluation)
+                yield ("result", evaluation)
+
+            except Exception as e:
+                print(f"Error evaluating answer: {e}")
+                call.record_fallback(e)
+                evaluation = self._fallback_evaluation(question, answer)
+                if not parser.score_sent:
+                    yield ("score", evaluation['score'])
+                self._record_evaluation(question, answer, evaluation)
+                yield ("result", evaluation)
+
+    def stream_summary(self, session_history):
+        """Yield the final report in chunks as the model generates it"""
+        with self.metrics.call("summary") as call:
+            cache_key = self._summary_cache_key(session_history)
+            cached = self._get_cached_summary(cache_key, call)
+            if cached is not None:
+                yield cached
+                return
+
+            if not self.has_api_key():
+                call.fallback = True
+                summary = self._generate_fallback_summary(session_history)
+                self._summary_cache = (cache_key, summary)
+                yield summary
+                return
+
+            parts = []
+            try:
+                request = self._summary_request(session_history, self._summary_digest(session_history))
+                options = self._call_options(call, PRIORITY_BACKGROUND)
+                for chunk in chat_completion(self.client, stream=True, **options, **request):
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        call.first_token()
+                        parts.append(delta)
+                        yield delta
+                    self._record_stream_usage(call, chunk)
+                self._summary_cache = (cache_key, "".join(parts).strip())
+
+            except Exception as e:
+                print(f"Error generating summary: {e}")
+                call.record_fallback(e)
+                if not parts:
+                    yield self._generate_fallback_summary(session_history)
+
+    def _question_request(self, question_number, avoid=(), topic=None):
+        """Question request, aimed at `topic` when one is given.
+
+        `avoid` lists rejected questions to show the model alongside earlier ones.
+        """
+        if topic is None:
+            messages = self._render_prompt("question", question_number=question_number, avoid=avoid)
+        else:
+            messages = self._render_prompt("question_topic", question_number=question_number, avoid=avoid, topic=topic)
+        route = model_router.route("question")
+        return {
+            "model": route.model,
+            "route": route.name,
+            "messages": messages,
+            "max_tokens": route.max_tokens,
+            "temperature": 0.7
+        }
+
+    def _evaluation_request(self, question, answer, stream=False):
+        if not EVAL_JSON_MODE:
+            route = model_router.route("evaluation", 200, self.difficulty, answer)
+            return {
+                "model": route.model,
+                "route": route.name,
+                "messages": self._render_prompt("evaluation", question=question, answer=answer),
+                "max_tokens": route.max_tokens,
+                "temperature": 0.3
+            }
+        route = model_router.route(
+            "evaluation", EVAL_JSON_MAX_TOKENS + (60 if EVAL_SUBSCORES else 0), self.difficulty, answer
+        )
+        request = {
+            "model": route.model,
+            "route": route.name,
+            "messages": self._render_prompt(self._evaluation_template(), question=question, answer=answer),
+            "max_tokens": route.max_tokens,
+            "temperature": 0.3
+        }
+        # Groq's JSON mode does not stream; streamed replies rely on the prompt and the strict parse
+        if not stream:
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def _batch_evaluation_request(self, pairs):
+        if not EVAL_JSON_MODE:
+            route = model_router.route("batch_evaluation", 120 * len(pairs))
+            return {
+                "model": route.model,
+                "route": route.name,
+                "messages": self._render_prompt("batch_evaluation", pairs=pairs),
+                "max_tokens": route.max_tokens,
+                "temperature": 0.3
+            }
+        route = model_router.route("batch_evaluation", 100 * len(pairs))
+        return {
+            "model": route.model,
+            "route": route.name,
+            "messages": self._render_prompt("batch_evaluation_json", pairs=pairs),
+            "max_tokens": route.max_tokens,
+            "temperature": 0.3,
+            "response_format": {"type": "json_object"}
+        }
+
+    def _reask_request(self, request, reply, reason):
+        """The original request plus the unusable reply and a note on what was wrong with it"""
+        reask = {key: value for key, value in request.items() if key != "messages"}
+        reask["messages"] = request["messages"] + [
+            {"role": "assistant", "content": reply},
+            {"role": "user", "content": REASK_PROMPT.format(reason=reason)}
+        ]
+        reask["temperature"] = 0.0
+        return reask
 
+    def _evaluation_template(self):
+        if not EVAL_JSON_MODE:
+            return "evaluation"
+        return "evaluation_json_subscores" if EVAL_SUBSCORES else "evaluation_json"
+
+    def _checked_evaluation(self, call, request, reply):
+        """Parse an evaluation reply, re-asking once if it does not match the format.
+
+        Returns (evaluation, model that produced it). Raises ValueError when the
+        second reply is unusable too, so callers fall back.
+        """
+        evaluation, reason = self._read_evaluation(reply)
+        if evaluation is not None:
+            return evaluation, request["model"]
+        call.parse_failures += 1
+        call.reasks += 1
+        reask = self._reask_request(request, reply, reason)
+        self._escalate(call, reask)
+        response = chat_completion(self.client, **self._call_options(call, PRIORITY_INTERACTIVE), **reask)
+        call.record_response(response)
+        evaluation, reason = self._read_evaluation(response.choices[0].message.content.strip())
+        if evaluation is None:
+            call.parse_failures += 1
+            raise ValueError(f"unparseable evaluation: {reason}")
+        return evaluation, reask["model"]
+
+    def _escalate(self, call, request):
+        """Move a request to the larger model and its escalated route when routing allows it; returns whether it moved"""
+        model = model_router.escalation_model(request["model"])
+        if model is None:
+            return False
+        if call.escalated_from is None:
+            call.escalated_from = request["route"]
+        request["model"] = model
+        request["route"] = model_router.escalated_route(request["route"])
+        call.escalations += 1
+        return True
+
+    def _uncertain_request(self, call, request, evaluation, model):
+        """The request again on the larger model when `model` gave an uncertain score, else None"""
+        if not model_router.uncertain(evaluation['score']) or model_router.escalation_model(model) is None:
+            return None
+        escalated = dict(request)
+        return escalated if self._escalate(call, escalated) else None
+
+    def _calibrated_evaluation(self, call, request, evaluation, model):
+        """Re-grade an uncertain score on the larger model, keeping the first result if that fails.
+
+        Returns (evaluation, model that produced it).
+        """
+        escalated = self._uncertain_request(call, request, evaluation, model)
+        if escalated is None:
+            return evaluation, model
         try:
-            prompt = self._build_summary_prompt(session_history)
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "You are an expert career coach and technical interviewer. Provide comprehensive, actionable feedback that helps candidates improve their interview performance."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=600, # <<<< Reduced tokens for a more concise summary
-                temperature=0.4
+            response = chat_completion(self.client, **self._call_options(call, PRIORITY_INTERACTIVE), **escalated)
+            call.record_response(response)
+            regraded, _ = self._read_evaluation(response.choices[0].message.content.strip())
+        except Exception as e:
+            print(f"Error re-grading evaluation: {e}")
+            return evaluation, model
+        return (regraded, escalated["model"]) if regraded is not None else (evaluation, model)
+
+    def _summary_request(self, session_history, digest=None):
+        """Final report request: from (digest, records not in it) when given, else from the full transcript"""
+        if digest is None:
+            messages = self._render_prompt("summary", session_history=session_history)
+        else:
+            messages = self._render_prompt(
+                "summary_from_digest", session_history=session_history, digest=digest[0], recent=digest[1]
             )
-            
-            return response.choices[0].message.content.strip()
-            
+        route = model_router.route("summary")
+        return {
+            "model": route.model,
+            "route": route.name,
+            "messages": messages,
+            "max_tokens": route.max_tokens,
+            "temperature": 0.4
+        }
+
+    def _digest_request(self, digest, records, first_number):
+        route = model_router.route("summary_digest")
+        return {
+            "model": route.model,
+            "route": route.name,
+            "messages": self._render_prompt("summary_digest", digest=digest, records=records, first_number=first_number),
+            "max_tokens": route.max_tokens,
+            "temperature": 0.2
+        }
+
+    def _extend_digest(self, question, answer, evaluation):
+        """Queue a background update folding this graded answer into the rolling digest"""
+        if not self.incremental_summary or not self.has_api_key():
+            return
+        record = {'question': question, 'answer': answer, 'score': evaluation['score'], 'feedback': evaluation['feedback']}
+        with self._prefetch_lock:
+            # Chained on the previous update so answers are folded in the order they were graded
+            self._digest_update = _prefetch_executor.submit(
+                self._update_digest, self._digest_update, record, self._generation
+            )
+
+    def _update_digest(self, previous, record, generation):
+        if previous is not None:
+            # Wait for the previous update without inheriting its failure, so one bad update
+            # does not stop the digest from growing for the rest of the session
+            wait_futures([previous])
+        with self._prefetch_lock:
+            digest, number = self._digest, len(self._digest_keys) + 1
+        try:
+            digest = self._digest_records(digest, [record], number, PRIORITY_BACKGROUND)
         except Exception as e:
-            print(f"Error generating summary: {e}")
-            return self._generate_fallback_summary(session_history)
+            print(f"Error updating summary digest: {e}")
+            digest = _fallback_digest(digest, [record], number)
+        self._store_digest(digest, record, generation)
 
-    def _build_question_prompt(self, question_number):
-        # Get relevant topics for the role/domain
-        topics = self._get_relevant_topics()
-        
-        base_context = f"""
-        Generate a {self.difficulty.lower()}-level {self.interview_mode.lower()} interview question for a {self.role} position.
-        
-        Question #{question_number}
-        
-        Relevant Topics: {', '.join(topics[:5])}   # Limit to first 5 topics
-        Previous Questions: {', '.join(self.questions_asked[-2:]) if self.questions_asked else 'None'}
+    def _store_digest(self, digest, record, generation):
+        with self._prefetch_lock:
+            if generation == self._generation:
+                self._digest = digest
+                self._digest_keys.append(_digest_key(record))
+
+    def _digest_records(self, digest, records, first_number, priority):
+        """Fold graded records into digest with one LLM call, or append a local line per record if it fails"""
+        with self.metrics.call("summary_digest") as call:
+            try:
+                response = chat_completion(
+                    self.client, **self._call_options(call, priority), **self._digest_request(digest, records, first_number)
+                )
+                call.record_response(response)
+                return response.choices[0].message.content.strip()
+            except Exception as e:
+                print(f"Error updating summary digest: {e}")
+                call.record_fallback(e)
+                return _fallback_digest(digest, records, first_number)
+
+    def _summary_digest(self, session_history):
+        """(digest, records not in it) to build the final report from, or None for the full transcript.
+
+        Uses the rolling digest as far as it matches the history, without waiting for
+        updates still in flight. Long histories with no usable digest are digested
+        in parallel chunks first (map-reduce).
         """
-        
-        if self.interview_mode == "Technical":
-            return base_context + """
-            
-            Requirements:
-            - Focus on practical, hands-on scenarios from the role's key topics
-            - Include real-world applications and problem-solving
-            - Appropriate for the specified difficulty level
-            - Encourage detailed explanations and examples
-            - Avoid repeating similar concepts from previous questions
-            - Make it specific to the role and technical domain
-            
-            Generate only the question:
-            """
-        else:  # Behavioral
-            return base_context + """
-            
-            Requirements:
-            - Use STAR method framework (Situation, Task, Action, Result)
-            - Focus on professional scenarios relevant to the role and topics listed
-            - Encourage specific examples with measurable outcomes
-            - Appropriate for the specified experience level
-            - Different from previous behavioral questions asked
-            - Connect to the role's typical challenges and responsibilities
-            
-            Generate only the question:
-            """
-    
-    def _build_evaluation_prompt(self, question, answer):
-        return f"""
-        Evaluate this {self.interview_mode.lower()} interview answer for a {self.role} position:
+        digest, recent = self._current_digest(session_history)
+        if len(recent) > SUMMARY_MAP_REDUCE_THRESHOLD and self.has_api_key():
+            futures = [
+                _prefetch_executor.submit(self._digest_records, "", records, number, PRIORITY_INTERACTIVE)
+                for records, number in self._map_chunks(session_history, recent)
+            ]
+            digest, recent = "\n".join(filter(None, [digest] + [future.result() for future in futures])), []
+        return (digest, recent) if digest else None
 
-        QUESTION: {question}
-        ANSWER: {answer}
-        
-        CONTEXT:
-        - Role: {self.role}
-        - Domain: {self.domain or 'General'}
-        - Difficulty Level: {self.difficulty}
-        - Interview Type: {self.interview_mode}
-
-        EVALUATION CRITERIA (based on interview requirements):
-        - Technical accuracy and depth of knowledge
-        - Problem-solving approach and methodology
-        - Use of appropriate examples and explanations
-        - Communication clarity and structure
-        - Consideration of edge cases, alternatives, or trade-offs
-        - Relevance to real-world scenarios
-
-        Provide evaluation in this exact format:
-        SCORE: [number 0-100]
-        FEEDBACK: [1-2 sentences of constructive feedback, including what they did well and one specific suggestion for improvement]
-
-        Be encouraging but honest.
+    def _current_digest(self, session_history):
+        """(rolling digest, history records it does not cover yet)"""
+        with self._prefetch_lock:
+            digest, keys = self._digest, list(self._digest_keys)
+        if keys and [_digest_key(qa) for qa in session_history[:len(keys)]] == keys:
+            return digest, session_history[len(keys):]
+        return "", session_history
+
+    def _map_chunks(self, session_history, recent):
+        """(records, number of the first one) chunks of the records to digest in the map step"""
+        first_number = len(session_history) - len(recent) + 1
+        return [
+            (recent[start:start + SUMMARY_MAP_CHUNK], first_number + start)
+            for start in range(0, len(recent), SUMMARY_MAP_CHUNK)
+        ]
+
+    def _call_options(self, call, priority):
+        """Call-layer options tying an upstream request to this session's metrics and queue"""
+        return {"call_info": call.info, "session_id": self.session_id, "priority": priority}
+
+    def _pool_key(self, topic=None):
+        return (self.role, self.interview_mode, self.difficulty, topic)
+
+    def _take_pooled_question(self, call=None, topic=None):
+        if not POOL_ENABLED or not self.has_api_key():
+            return None
+        question = question_pool.take(self._pool_key(topic), exclude=self._asked_index())
+        if call is not None:
+            call.cache_hit = question is not None
+        return question
+
+    def _evaluation_cache_key(self, question, answer, model):
+        template = prompt_registry.get(self._evaluation_template())
+        return evaluation_cache_key(
+            question, answer, self.role, self.interview_mode, self.domain, self.difficulty, model,
+            f"{template.name}:{template.version}"
+        )
+
+    def _get_cached_evaluation(self, question, answer, call=None):
+        """Cached evaluation for this grading request, or None.
+
+        Looks under the model the answer is routed to, then under the model it
+        escalates to, so an answer re-graded on the larger model last time is not
+        graded on the smaller one first again.
         """
-    
-    def _build_summary_prompt(self, session_history):
-        if not session_history:
-            return "No interview data available for summary generation."
+        if not EVAL_CACHE_ENABLED:
+            return None
+        model = model_router.route("evaluation", difficulty=self.difficulty, answer=answer).model
+        cached = None
+        for candidate in (model, model_router.escalation_model(model)):
+            if candidate is not None:
+                cached = evaluation_cache.get(self._evaluation_cache_key(question, answer, candidate))
+                if cached is not None:
+                    break
+        if call is not None:
+            call.cache_hit = cached is not None
+        return cached
 
-        qa_pairs = "\\n".join([
-            f"Q{i+1}: {qa['question']}\\nAnswer: {qa['answer']}\\nScore: {qa['score']}/100\\nFeedback: {qa['feedback']}\\n"
-            for i, qa in enumerate(session_history)
-        ])
-        
-        scores = [qa['score'] for qa in session_history]
-        avg_score = sum(scores) / len(scores)
-        
-        return f"""
-        Based on this {self.role} interview session, provide a brief, actionable final summary report as specified:
+    def _record_stream_usage(self, call, chunk):
+        # Groq reports usage on the final streamed chunk under x_groq.usage
+        usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or getattr(chunk, "usage", None)
+        if usage is not None:
+            call.add_usage(getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0)
 
-        INTERVIEW CONTEXT:
-        - Role: {self.role}
-        - Domain: {self.domain or 'General'}
-        - Interview Type: {self.interview_mode}
-        - Difficulty Level: {self.difficulty}
-        - Questions Answered: {len(session_history)}
-        - Average Score: {avg_score:.1f}/100
+    def _cache_evaluation(self, question, answer, evaluation, model):
+        """Cache a parsed evaluation under the model that produced it; local fallbacks are cheap to recompute"""
+        if EVAL_CACHE_ENABLED:
+            evaluation_cache.put(self._evaluation_cache_key(question, answer, model), evaluation)
+        return evaluation
 
-        INTERVIEW TRANSCRIPT:
-        {qa_pairs}
+    def _cache_batch(self, pairs, evaluations, model):
+        for (question, answer), evaluation in zip(pairs, evaluations):
+            if evaluation is not None:
+                self._cache_evaluation(question, answer, evaluation, model)
+        return evaluations
 
-        Generate a concise report following this exact format:
+    def _record_question(self, question, generation, topic=None):
+        with self._prefetch_lock:
+            if generation == self._generation:
+                self.questions_asked.append(question)
+                self._question_index.add(question)
+                if topic is not None:
+                    self._question_topics[question] = topic
 
-        ## 🎯 FINAL PERFORMANCE SUMMARY
+    def _scheduled_topic(self, question_number):
+        """Target topic for question N, or None when the topic scheduler is off"""
+        if not self._topic_scheduler.enabled:
+            return None
+        return self._topic_scheduler.topic_for(question_number)
 
-        **Overall Rating:** [e.g., Good Candidate]
+    def _fallback_topic(self, question_number):
+        topics = self._get_relevant_topics()
+        return self._scheduled_topic(question_number) or topics[(question_number - 1) % len(topics)]
 
-        **Final Score:** {avg_score:.0f}/100
+    def question_topic(self, question):
+        """Topic a question was asked for; questions from elsewhere get the closest topic"""
+        topic = self._question_topics.get(question)
+        if topic is None:
+            topic = local_scorer.best_topic(question, self.role, self.interview_mode)
+        return topic
 
-        ## ✅ KEY STRENGTHS
+    def resume_questions(self, records, current_question=None):
+        """Restore the questions asked, with their topics and scores, from stored answer records"""
+        self.questions_asked = [qa['question'] for qa in records]
+        for qa in records:
+            topic = qa.get('topic')
+            if topic:
+                self._question_topics[qa['question']] = topic
+                if qa.get('question_number'):
+                    self._topic_scheduler.assign(qa['question_number'], topic)
+                self._topic_scheduler.record(topic, qa.get('score'))
+        if current_question:
+            self.questions_asked.append(current_question)
 
-        • **[Strength 1]:** [Briefly state a strength with an example]
+    def _record_evaluation(self, question, answer, evaluation):
+        """Per-answer bookkeeping after grading: the topic's score and the summary digest"""
+        self._topic_scheduler.record(self._question_topics.get(question), evaluation['score'])
+        self._extend_digest(question, answer, evaluation)
 
-        • **[Strength 2]:** [Briefly state a second strength]
+    def _asked_index(self):
+        """Near-duplicate index over questions_asked, rebuilt when the list was replaced (e.g. on resume)"""
+        with self._prefetch_lock:
+            if self._question_index.questions != self.questions_asked:
+                self._question_index = QuestionIndex(self.questions_asked)
+            return self._question_index
 
-        ## 🎯 KEY AREAS FOR IMPROVEMENT
+    def _is_near_duplicate(self, call, question):
+        if question not in self._asked_index():
+            return False
+        call.near_duplicates += 1
+        return True
 
-        • **[Area 1]:** [Briefly state an area to improve]
+    def _bank_question(self, question, topic=None):
+        """Keep a generated question in the offline bank, under its topic (or the closest one)"""
+        if QUESTION_BANK_ENABLED and QUESTION_BANK_RECORD:
+            _prefetch_executor.submit(
+                _store_bank_question, self.role, self.interview_mode, self.difficulty, question, topic
+            )
 
-        • **[Area 2]:** [Briefly state a second area to improve]
+    def _get_cached_summary(self, cache_key, call=None):
+        hit = self._summary_cache is not None and self._summary_cache[0] == cache_key
+        if call is not None:
+            call.cache_hit = hit
+        if hit:
+            self.summary_cache_hits += 1
+            return self._summary_cache[1]
+        self.summary_cache_misses += 1
+        return None
 
-        ## 📚 ACTION PLAN
+    def get_metrics(self):
+        """Per-call-type and per-route metrics plus call-layer counters, as plain dicts"""
+        return {'calls': self.metrics.snapshot(), 'routes': self.metrics.route_snapshot(), 'call_layer': get_llm_metrics()}
+
+    def render_metrics(self):
+        """Metrics in Prometheus text format (call-layer counters become gauges)"""
+        call_layer = get_llm_metrics()
+        gauges = {f"call_layer_{name}": value for name, value in call_layer.items() if isinstance(value, (int, float))}
+        gauges['call_layer_breaker_open'] = int(call_layer['breaker_state'] != "closed")
+        return self.metrics.render_prometheus(gauges=gauges)
+
+    def get_summary_cache_stats(self):
+        return {'hits': self.summary_cache_hits, 'misses': self.summary_cache_misses}
+
+    def _summary_cache_key(self, session_history):
+        payload = json.dumps(
+            [self.role, self.domain, self.interview_mode, self.difficulty, session_history],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _prompt_config(self):
+        return PromptConfig(self.role, self.domain, self.interview_mode, self.difficulty, self._get_relevant_topics())
+
+    def _render_prompt(self, name, **values):
+        return prompt_registry.get(name).render(self._prompt_config(), **self._prompt_values(name, values))
+
+    def _prompt_values(self, name, values):
+        """Per-call template values that come from session state rather than the caller"""
+        if name in ("question", "question_topic"):
+            values = dict(values)
+            previous = self._asked_index().diverse(PROMPT_PREVIOUS_QUESTIONS)
+            values['previous_questions'] = previous + list(values.pop('avoid', ()))
+        return values
+
+    def _build_question_prompt(self, question_number):
+        return self._render_prompt("question", question_number=question_number)[-1]["content"]
+
+    def _build_evaluation_prompt(self, question, answer):
+        return self._render_prompt("evaluation", question=question, answer=answer)[-1]["content"]
+
+    def _build_batch_evaluation_prompt(self, pairs):
+        return self._render_prompt("batch_evaluation", pairs=pairs)[-1]["content"]
+
+    def _build_summary_prompt(self, session_history):
+        return self._render_prompt("summary", session_history=session_history)[-1]["content"]
 
-        • **Next Steps:** [1-2 actionable steps for improvement]
-        """
-    
     def _get_relevant_topics(self):
         """Get relevant topics based on role and domain"""
         role_key = self.role
@@ -369,14 +974,9 @@ class InterviewBot:
         
         for line in lines:
             if line.startswith('SCORE:'):
-                try:
-                    score_text = line.replace('SCORE:', '').strip()
-                    numbers = ''.join(filter(str.isdigit, score_text))
-                    if numbers:
-                        score = int(numbers[:2]) if len(numbers) >= 2 else int(numbers[0]) * 10
-                        score = max(0, min(100, score))
-                except:
-                    pass
+                parsed = self._parse_score_line(line)
+                if parsed is not None:
+                    score = parsed
             elif line.startswith('FEEDBACK:'):
                 feedback = line.replace('FEEDBACK:', '').strip()
                 if not feedback:
@@ -384,30 +984,117 @@ class InterviewBot:
         
         return {'score': score, 'feedback': feedback}
     
-    def _fallback_evaluation(self, answer):
-        """Simple evaluation when API fails"""
-        word_count = len(answer.split())
+    def _read_evaluation(self, evaluation_text):
+        """Return (evaluation, None), or (None, reason) when the reply does not match the requested format"""
+        if EVAL_JSON_MODE:
+            try:
+                data = json.loads(_strip_code_fence(evaluation_text))
+            except ValueError as e:
+                return None, f"not valid JSON: {e}"
+            return self._validate_evaluation(data)
         
-        if word_count < 20:
-            return {
-                'score': 35, 
-                'feedback': "Answer is too brief. Provide more detailed explanations with specific examples and reasoning."
-            }
-        elif word_count < 50:
-            return {
-                'score': 65, 
-                'feedback': "Good start! Add more depth with specific examples and explain your thought process in more detail."
-            }
-        elif word_count < 100:
-            return {
-                'score': 80, 
-                'feedback': "Well-structured answer with good detail. Consider adding more specific examples or discussing trade-offs."
-            }
-        else:
-            return {
-                'score': 90, 
-                'feedback': "Comprehensive and detailed response. Excellent use of examples and thorough explanations!"
+        score_lines = [line for line in evaluation_text.split('\n') if line.startswith('SCORE:')]
+        if not score_lines or self._parse_score_line(score_lines[0]) is None:
+            return None, "no SCORE line with a number"
+        return self._parse_evaluation(evaluation_text), None
+    
+    def _validate_evaluation(self, data):
+        """Check one decoded JSON evaluation against the schema"""
+        if not isinstance(data, dict):
+            return None, "expected a JSON object"
+        score = data.get('score')
+        if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0 <= score <= 100:
+            return None, "score must be a number from 0 to 100"
+        feedback = data.get('feedback')
+        if not isinstance(feedback, str) or not feedback.strip():
+            return None, "feedback must be a non-empty string"
+        
+        evaluation = {'score': int(round(score)), 'feedback': feedback.strip()}
+        subscores = data.get('subscores')
+        if isinstance(subscores, dict):
+            evaluation['subscores'] = {
+                key: int(round(value)) for key, value in subscores.items()
+                if key in SUBSCORE_KEYS and isinstance(value, (int, float)) and not isinstance(value, bool)
+                and 0 <= value <= 100
             }
+        return evaluation, None
+    
+    def _parse_batch_evaluation(self, evaluation_text, count):
+        """Split a batched reply into per-item evaluations; None marks an unparseable item"""
+        if EVAL_JSON_MODE:
+            return self._parse_batch_json_evaluation(evaluation_text, count)
+        blocks = {}
+        current = None
+        for line in evaluation_text.split('\n'):
+            line = line.strip().strip('*').strip()
+            match = _BATCH_ITEM_RE.match(line)
+            if match:
+                current = int(match.group(1))
+                blocks[current] = []
+            elif current is not None:
+                blocks[current].append(line)
+        
+        results = []
+        for number in range(1, count + 1):
+            lines = blocks.get(number, [])
+            score_lines = [line for line in lines if line.startswith('SCORE:')]
+            has_feedback = any(line.startswith('FEEDBACK:') and line[len('FEEDBACK:'):].strip() for line in lines)
+            if not has_feedback or not score_lines or self._parse_score_line(score_lines[0]) is None:
+                results.append(None)
+            else:
+                results.append(self._parse_evaluation('\n'.join(lines)))
+        return results
+    
+    def _parse_batch_json_evaluation(self, evaluation_text, count):
+        results = [None] * count
+        try:
+            data = json.loads(_strip_code_fence(evaluation_text))
+        except ValueError:
+            return results
+        entries = data.get('evaluations') if isinstance(data, dict) else None
+        if not isinstance(entries, list):
+            return results
+        
+        for position, entry in enumerate(entries[:count]):
+            if not isinstance(entry, dict):
+                continue
+            item = entry.get('item', position + 1)
+            index = item - 1 if isinstance(item, int) and not isinstance(item, bool) and 1 <= item <= count else position
+            evaluation, _ = self._validate_evaluation(entry)
+            if results[index] is None:
+                results[index] = evaluation
+        return results
+    
+    def _parse_score_line(self, line):
+        """Score from a 'SCORE:' line, or None when it holds no number.
+
+        "85", "85/100" and "8.5/10" all read as 85.
+        """
+        match = _SCORE_RE.search(line.replace('SCORE:', ''))
+        if match is None:
+            return None
+        score = float(match.group(1))
+        scale = int(match.group(2)) if match.group(2) else 100
+        if scale <= 0:
+            return None
+        return max(0, min(100, int(round(score * 100 / scale))))
+    
+    def _fallback_evaluation(self, question, answer):
+        """Offline evaluation when the API fails, flagged with 'fallback' so callers can tell it apart"""
+        evaluation = local_scorer.score(question, answer, self.role, self.interview_mode)
+        evaluation['fallback'] = True
+        return evaluation
+    
+    def _prescreen(self, call, question, answer):
+        """Local evaluation for a near-empty answer not worth an LLM call, otherwise None.
+
+        Only the number of distinct content words decides: a short answer that is
+        correct but shares few words with the rubric still goes to the model.
+        """
+        if not LOCAL_PRESCREEN or not _near_empty(answer):
+            return None
+        call.prescreened = True
+        return local_scorer.score(question, answer, self.role, self.interview_mode)
     
     def _generate_fallback_summary(self, session_history):
         """Generate summary when API is unavailable"""
@@ -476,28 +1163,542 @@ class InterviewBot:
 *Keep practicing and focus on the improvement areas identified above. Your performance shows great potential for growth in the {self.role} role!*"""
     
     def _get_fallback_question(self, question_number):
-        """Fallback questions when API is unavailable"""
+        """Offline question from the question bank on the question's scheduled topic"""
         topics = self._get_relevant_topics()
+        topic = self._fallback_topic(question_number)
         
-        if self.interview_mode == "Technical":
-            fallback_questions = [
-                f"Explain your approach to {topics[0].lower()} and provide a practical example.",
-                f"How would you handle a challenging scenario involving {topics[1].lower()}?",
-                f"Describe the key considerations when working with {topics[2].lower()}.",
-                f"What are the best practices for {topics[3].lower()} in your experience?",
-                f"How would you optimize or improve {topics[4].lower()} in a real project?",
-                f"Walk me through your problem-solving process for {topics[0].lower()}.",
-                f"What tools and techniques do you use for {topics[1].lower()}?"
-            ]
-        else:
-            fallback_questions = [
-                f"Tell me about a time you had to deal with {topics[0].lower()}. How did you handle it?",
-                f"Describe a situation where you demonstrated {topics[1].lower()}. What was the outcome?",
-                f"Give me an example of how you approached {topics[2].lower()} in a previous role.",
-                f"Tell me about a challenge related to {topics[3].lower()} and how you overcame it.",
-                f"Describe your experience with {topics[4].lower()} and what you learned from it.",
-                f"Share a time when you had to show {topics[0].lower()} under pressure.",
-                f"Tell me about a project where {topics[1].lower()} was critical to success."
-            ]
+        if QUESTION_BANK_ENABLED:
+            try:
+                question = self._question_sampler.draw(
+                    self.role, self.interview_mode, self.difficulty, topic, exclude=self._asked_index()
+                )
+                if question is not None:
+                    return question
+            except Exception as e:
+                print(f"Error reading question bank: {e}")
         
-        return fallback_questions[(question_number - 1) % len(fallback_questions)]
\ No newline at end of file
+        templates = QUESTION_TEMPLATES["Technical" if self.interview_mode == "Technical" else "Behavioral"]
+        return templates[(question_number - 1) // len(topics) % len(templates)].format(topic=topic.lower())
+
+
+class _StreamingEvaluationParser:
+    """Incremental reader for the SCORE:/FEEDBACK: evaluation format"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.text = ""
+        self.score_sent = False
+        self._pending = ""
+        self._in_feedback = False
+        self._feedback_started = False
+
+    def feed(self, delta):
+        self.text += delta
+        self._pending += delta
+        events = []
+
+        while self._pending:
+            if self._in_feedback:
+                line, newline, rest = self._pending.partition('\n')
+                if not self._feedback_started:
+                    line = line.lstrip()
+                    self._feedback_started = bool(line)
+                if line:
+                    events.append(("feedback", line))
+                self._pending = rest
+                if newline:
+                    self._in_feedback = False
+                    continue
+                break
+
+            if self._pending.startswith('FEEDBACK:'):
+                self._pending = self._pending[len('FEEDBACK:'):]
+                self._in_feedback = True
+                self._feedback_started = False
+                continue
+
+            line, newline, rest = self._pending.partition('\n')
+            if not newline:
+                # Wait for the rest of the line unless it can still become FEEDBACK:
+                break
+            self._pending = rest
+            events.extend(self._line_event(line))
+
+        return events
+
+    def close(self):
+        events = []
+        if self._pending and not self._in_feedback:
+            events.extend(self._line_event(self._pending))
+        self._pending = ""
+        return events
+
+    def _line_event(self, line):
+        if line.startswith('SCORE:') and not self.score_sent:
+            score = self.bot._parse_score_line(line)
+            if score is not None:
+                self.score_sent = True
+                return [("score", score)]
+        return []
+
+
+class _StreamingJsonEvaluationParser:
+    """Incremental reader for the JSON evaluation format.
+
+    Emits the score once its number is complete and decodes the feedback string
+    as it arrives; the full reply is still validated by _read_evaluation().
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.score_sent = False
+        self._feedback_at = None
+        self._feedback_done = False
+
+    def feed(self, delta):
+        self.text += delta
+        events = []
+
+        if not self.score_sent:
+            match = _JSON_SCORE_RE.search(self.text)
+            if match and float(match.group(1)) <= 100:
+                self.score_sent = True
+                events.append(("score", int(round(float(match.group(1))))))
+
+        if self._feedback_at is None:
+            match = _JSON_FEEDBACK_RE.search(self.text)
+            if match:
+                self._feedback_at = match.end()
+        if self._feedback_at is not None and not self._feedback_done:
+            piece = self._decode_feedback()
+            if piece:
+                events.append(("feedback", piece))
+        return events
+
+    def close(self):
+        return []
+
+    def _decode_feedback(self):
+        """Decode string characters from _feedback_at, stopping before an incomplete escape"""
+        text, i, out = self.text, self._feedback_at, []
+        while i < len(text):
+            ch = text[i]
+            if ch == '"':
+                self._feedback_done = True
+                i += 1
+                break
+            if ch == '\\':
+                if i + 1 >= len(text):
+                    break
+                escape = text[i + 1]
+                if escape == 'u':
+                    if i + 6 > len(text):
+                        break
+                    try:
+                        out.append(chr(int(text[i + 2:i + 6], 16)))
+                    except ValueError:
+                        pass
+                    i += 6
+                    continue
+                out.append(_JSON_ESCAPES.get(escape, escape))
+                i += 2
+                continue
+            out.append(ch)
+            i += 1
+        self._feedback_at = i
+        return "".join(out)
+
+
+def _near_empty(answer):
+    return len(set(content_tokens(answer))) < LOCAL_PRESCREEN_MIN_WORDS
+
+
+def _chunks(items, size):
+    size = max(1, size)
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def _digest_key(record):
+    """Identity of a graded answer within the rolling digest"""
+    payload = "\x1f".join([record['question'], record['answer'], str(record['score'])])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _fallback_digest(digest, records, first_number):
+    """Digest extended with one local line per record, used when the LLM update fails"""
+    lines = [f"- Q{number} ({qa['score']}/100): {qa['feedback']}" for number, qa in enumerate(records, first_number)]
+    return "\n".join(filter(None, [digest] + lines))
+
+
+def _strip_code_fence(text):
+    """Drop a ```json ... ``` wrapper some models add around JSON"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[len("json"):]
+    return text
+
+
+def _generate_pool_question(key, recent):
+    """Generate one question for a shared pool key (role, mode, difficulty, topic), outside any candidate session"""
+    role, interview_mode, difficulty, topic = key
+    bot = InterviewBot()
+    bot.setup(role, "General", interview_mode, difficulty)
+    bot.questions_asked = list(recent)
+    response = chat_completion(
+        bot.client, session_id="question-pool", priority=PRIORITY_BACKGROUND,
+        **bot._question_request(len(recent) + 1, topic=topic)
+    )
+    question = response.choices[0].message.content.strip()
+    if QUESTION_BANK_ENABLED and QUESTION_BANK_RECORD:
+        _store_bank_question(role, interview_mode, difficulty, question, topic)
+    return question
+
+
+def _store_bank_question(role, interview_mode, difficulty, question, topic=None):
+    try:
+        topic = topic or local_scorer.best_topic(question, role, interview_mode)
+        question_bank.add(role, interview_mode, difficulty, topic, question)
+    except Exception as e:
+        print(f"Error storing question in bank: {e}")
+
+
+def _pool_catalog_keys():
+    """Pool keys the built-in catalog can produce: each role, mode and difficulty, per topic or untopiced"""
+    return sum(
+        len(DIFFICULTIES) * (len(topics) + 1)
+        for modes in DOMAIN_TOPICS.values() for topics in modes.values()
+    )
+
+
+# Process-wide warm pool shared by every session with the same configuration;
+# sized so the catalog's keys fit without evicting each other
+question_pool = QuestionPool(_generate_pool_question, max_keys=max(POOL_MAX_KEYS, _pool_catalog_keys()))
+
+
+class AsyncInterviewBot(InterviewBot):
+    """InterviewBot whose LLM calls are awaitable, for use behind an async front end.
+
+    Prompt builders, parsing and fallbacks are inherited unchanged, so results
+    match the sync engine for the same model output.
+    """
+
+    def __init__(self, client=None, async_client=None):
+        super().__init__(client)
+        self.async_client = async_client if async_client is not None else get_shared_async_client()
+
+    def has_api_key(self):
+        return self.async_client is not None
+
+    async def generate_question(self, question_number):
+        """Return question N, awaiting a prefetched result when one exists"""
+        with self._prefetch_lock:
+            task = self._prefetched.pop(question_number, None)
+            generation = self._generation
+
+        if task is not None and not task.cancelled():
+            return await task
+        return await self._generate_question_now(question_number, generation)
+
+    def prefetch_questions(self, current_number, depth=1, limit=None):
+        """Schedule the questions after current_number as tasks on the running event loop"""
+        if not self.has_api_key() or depth <= 0:
+            return
+
+        with self._prefetch_lock:
+            generation = self._generation
+            for question_number in range(current_number + 1, current_number + depth + 1):
+                if limit is not None and question_number > limit:
+                    break
+                if question_number in self._prefetched:
+                    continue
+                previous = self._prefetched.get(question_number - 1)
+                self._prefetched[question_number] = asyncio.ensure_future(
+                    self._prefetch_question(previous, question_number, generation)
+                )
+
+    async def _prefetch_question(self, previous, question_number, generation):
+        if previous is not None and not previous.cancelled():
+            await previous
+        return await self._generate_question_now(question_number, generation, PRIORITY_BACKGROUND)
+
+    async def _generate_question_now(self, question_number, generation, priority=PRIORITY_INTERACTIVE):
+        with self.metrics.call("question") as call:
+            topic = self._scheduled_topic(question_number)
+            question = self._take_pooled_question(call, topic)
+            if question is not None:
+                self._record_question(question, generation, topic)
+                return question
+
+            try:
+                avoid = []
+                for _ in range(1 + QUESTION_DEDUP_RETRIES):
+                    response = await async_chat_completion(
+                        self.async_client, **self._call_options(call, priority),
+                        **self._question_request(question_number, avoid, topic)
+                    )
+                    call.record_response(response)
+                    question = response.choices[0].message.content.strip()
+                    if not self._is_near_duplicate(call, question):
+                        break
+                    avoid = [question]
+
+                self._record_question(question, generation, topic)
+                self._bank_question(question, topic)
+                return question
+
+            except Exception as e:
+                print(f"Error generating question: {e}")
+                call.record_fallback(e)
+                question = self._get_fallback_question(question_number)
+                self._record_question(question, generation, self._fallback_topic(question_number))
+                return question
+
+    async def evaluate_answer(self, question, answer):
+        """Grade one answer and fold it into the running summary digest"""
+        evaluation = await self._evaluate_answer(question, answer)
+        self._record_evaluation(question, answer, evaluation)
+        return evaluation
+
+    async def _evaluate_answer(self, question, answer):
+        with self.metrics.call("evaluation") as call:
+            cached = self._get_cached_evaluation(question, answer, call)
+            if cached is not None:
+                return cached
+            prescreened = self._prescreen(call, question, answer)
+            if prescreened is not None:
+                return prescreened
+
+            try:
+                request = self._evaluation_request(question, answer)
+                response = await async_chat_completion(
+                    self.async_client, **self._call_options(call, PRIORITY_INTERACTIVE), **request
+                )
+                call.record_response(response)
+
+                evaluation, model = await self._checked_evaluation(call, request, response.choices[0].message.content.strip())
+                evaluation, model = await self._calibrated_evaluation(call, request, evaluation, model)
+                return self._cache_evaluation(question, answer, evaluation, model)
+
+            except Exception as e:
+                print(f"Error evaluating answer: {e}")
+                call.record_fallback(e)
+                return self._fallback_evaluation(question, answer)
+
+    async def evaluate_answers(self, pairs, batch_size=BATCH_EVALUATION_SIZE):
+        """Awaitable evaluate_answers(); batches and re-graded items run concurrently"""
+        results, misses = self._unevaluated(pairs)
+        chunks = _chunks(misses, batch_size)
+        batches = await asyncio.gather(*(self._evaluate_batch([pairs[index] for index in chunk]) for chunk in chunks))
+        regrade = []
+        for chunk, parsed in zip(chunks, batches):
+            for index, evaluation in zip(chunk, parsed):
+                if evaluation is None:
+                    regrade.append(index)
+                else:
+                    results[index] = evaluation
+        regraded = await asyncio.gather(*(self._evaluate_answer(*pairs[index]) for index in regrade))
+        for index, evaluation in zip(regrade, regraded):
+            results[index] = evaluation
+        return results
+
+    async def _evaluate_batch(self, pairs):
+        if len(pairs) < 2 or not self.has_api_key():
+            return [None] * len(pairs)
+        with self.metrics.call("batch_evaluation") as call:
+            try:
+                request = self._batch_evaluation_request(pairs)
+                response = await async_chat_completion(
+                    self.async_client, **self._call_options(call, PRIORITY_INTERACTIVE), **request
+                )
+                call.record_response(response)
+                parsed = self._parse_batch_evaluation(response.choices[0].message.content.strip(), len(pairs))
+                call.parse_failures += parsed.count(None)
+                return self._cache_batch(pairs, parsed, request["model"])
+            except Exception as e:
+                print(f"Error evaluating answer batch: {e}")
+                call.record_fallback(e)
+                return [None] * len(pairs)
+
+    async def _checked_evaluation(self, call, request, reply):
+        evaluation, reason = self._read_evaluation(reply)
+        if evaluation is not None:
+            return evaluation, request["model"]
+        call.parse_failures += 1
+        call.reasks += 1
+        reask = self._reask_request(request, reply, reason)
+        self._escalate(call, reask)
+        response = await async_chat_completion(self.async_client, **self._call_options(call, PRIORITY_INTERACTIVE), **reask)
+        call.record_response(response)
+        evaluation, reason = self._read_evaluation(response.choices[0].message.content.strip())
+        if evaluation is None:
+            call.parse_failures += 1
+            raise ValueError(f"unparseable evaluation: {reason}")
+        return evaluation, reask["model"]
+
+    async def _calibrated_evaluation(self, call, request, evaluation, model):
+        escalated = self._uncertain_request(call, request, evaluation, model)
+        if escalated is None:
+            return evaluation, model
+        try:
+            response = await async_chat_completion(
+                self.async_client, **self._call_options(call, PRIORITY_INTERACTIVE), **escalated
+            )
+            call.record_response(response)
+            regraded, _ = self._read_evaluation(response.choices[0].message.content.strip())
+        except Exception as e:
+            print(f"Error re-grading evaluation: {e}")
+            return evaluation, model
+        return (regraded, escalated["model"]) if regraded is not None else (evaluation, model)
+
+    async def stream_evaluation(self, question, answer):
+        """Async generator form of InterviewBot.stream_evaluation(); use with `async for`"""
+        with self.metrics.call("evaluation") as call:
+            cached = self._get_cached_evaluation(question, answer, call)
+            if cached is None:
+                cached = self._prescreen(call, question, answer)
+            if cached is not None:
+                yield ("score", cached['score'])
+                yield ("feedback", cached['feedback'])
+                self._record_evaluation(question, answer, cached)
+                yield ("result", cached)
+                return
+
+            parser = _StreamingJsonEvaluationParser() if EVAL_JSON_MODE else _StreamingEvaluationParser(self)
+            try:
+                request = self._evaluation_request(question, answer, stream=True)
+                options = self._call_options(call, PRIORITY_INTERACTIVE)
+                async for chunk in await async_chat_completion(self.async_client, stream=True, **options, **request):
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        call.first_token()
+                        for event in parser.feed(delta):
+                            yield event
+                    self._record_stream_usage(call, chunk)
+                for event in parser.close():
+                    yield event
+                evaluation, model = await self._checked_evaluation(call, request, parser.text.strip())
+                evaluation = self._cache_evaluation(question, answer, evaluation, model)
+                self._record_evaluation(question, answer, evaluation)
+                yield ("result", evaluation)
+
+            except Exception as e:
+                print(f"Error evaluating answer: {e}")
+                call.record_fallback(e)
+                evaluation = self._fallback_evaluation(question, answer)
+                if not parser.score_sent:
+                    yield ("score", evaluation['score'])
+                self._record_evaluation(question, answer, evaluation)
+                yield ("result", evaluation)
+
+    async def stream_summary(self, session_history):
+        """Async generator form of InterviewBot.stream_summary(); use with `async for`"""
+        with self.metrics.call("summary") as call:
+            cache_key = self._summary_cache_key(session_history)
+            cached = self._get_cached_summary(cache_key, call)
+            if cached is not None:
+                yield cached
+                return
+
+            if not self.has_api_key():
+                call.fallback = True
+                summary = self._generate_fallback_summary(session_history)
+                self._summary_cache = (cache_key, summary)
+                yield summary
+                return
+
+            parts = []
+            try:
+                request = self._summary_request(session_history, await self._summary_digest(session_history))
+                options = self._call_options(call, PRIORITY_BACKGROUND)
+                async for chunk in await async_chat_completion(self.async_client, stream=True, **options, **request):
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        call.first_token()
+                        parts.append(delta)
+                        yield delta
+                    self._record_stream_usage(call, chunk)
+                self._summary_cache = (cache_key, "".join(parts).strip())
+
+            except Exception as e:
+                print(f"Error generating summary: {e}")
+                call.record_fallback(e)
+                if not parts:
+                    yield self._generate_fallback_summary(session_history)
+
+    def _extend_digest(self, question, answer, evaluation):
+        """Schedule a task folding this graded answer into the rolling digest"""
+        if not self.incremental_summary or not self.has_api_key():
+            return
+        record = {'question': question, 'answer': answer, 'score': evaluation['score'], 'feedback': evaluation['feedback']}
+        with self._prefetch_lock:
+            self._digest_update = asyncio.ensure_future(
+                self._update_digest(self._digest_update, record, self._generation)
+            )
+
+    async def _update_digest(self, previous, record, generation):
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        with self._prefetch_lock:
+            digest, number = self._digest, len(self._digest_keys) + 1
+        try:
+            digest = await self._digest_records(digest, [record], number, PRIORITY_BACKGROUND)
+        except Exception as e:
+            print(f"Error updating summary digest: {e}")
+            digest = _fallback_digest(digest, [record], number)
+        self._store_digest(digest, record, generation)
+
+    async def _digest_records(self, digest, records, first_number, priority):
+        with self.metrics.call("summary_digest") as call:
+            try:
+                response = await async_chat_completion(
+                    self.async_client, **self._call_options(call, priority),
+                    **self._digest_request(digest, records, first_number)
+                )
+                call.record_response(response)
+                return response.choices[0].message.content.strip()
+            except Exception as e:
+                print(f"Error updating summary digest: {e}")
+                call.record_fallback(e)
+                return _fallback_digest(digest, records, first_number)
+
+    async def _summary_digest(self, session_history):
+        digest, recent = self._current_digest(session_history)
+        if len(recent) > SUMMARY_MAP_REDUCE_THRESHOLD and self.has_api_key():
+            digests = await asyncio.gather(*(
+                self._digest_records("", records, number, PRIORITY_INTERACTIVE)
+                for records, number in self._map_chunks(session_history, recent)
+            ))
+            digest, recent = "\n".join(filter(None, [digest, *digests])), []
+        return (digest, recent) if digest else None
+
+    async def generate_summary(self, session_history):
+        """Return the final report, reusing the previous one while the history is unchanged"""
+        with self.metrics.call("summary") as call:
+            cache_key = self._summary_cache_key(session_history)
+            cached = self._get_cached_summary(cache_key, call)
+            if cached is not None:
+                return cached
+
+            if not self.has_api_key():
+                call.fallback = True
+                summary = self._generate_fallback_summary(session_history)
+                self._summary_cache = (cache_key, summary)
+                return summary
+
+            try:
+                request = self._summary_request(session_history, await self._summary_digest(session_history))
+                response = await async_chat_completion(
+                    self.async_client, **self._call_options(call, PRIORITY_BACKGROUND), **request
+                )
+                call.record_response(response)
+
+                summary = response.choices[0].message.content.strip()
+                self._summary_cache = (cache_key, summary)
+                return summary
+
+            except Exception as e:
+                print(f"Error generating summary: {e}")
+                call.record_fallback(e)
+                return self._generate_fallback_summary(session_history)
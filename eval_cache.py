@@ -0,0 +1,119 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Parsed evaluation results keyed by normalized question/answer and grading context
+EVAL_CACHE_ENABLED = os.getenv("EVAL_CACHE_ENABLED", "1") == "1"
+EVAL_CACHE_MAX_ENTRIES = int(os.getenv("EVAL_CACHE_MAX_ENTRIES", "5000"))
+EVAL_CACHE_TTL = float(os.getenv("EVAL_CACHE_TTL", str(7 * 24 * 3600)))
+EVAL_CACHE_PATH = os.getenv("EVAL_CACHE_PATH")  # optional SQLite file
+EVAL_CACHE_MAX_DISK_ENTRIES = int(os.getenv("EVAL_CACHE_MAX_DISK_ENTRIES", "200000"))
+
+
+def _normalize(text):
+    return " ".join(text.split())
+
+
+def evaluation_cache_key(question, answer, role, interview_mode, domain, difficulty, model, prompt_version=None):
+    """Content address for one grading request"""
+    parts = [
+        _normalize(question).casefold(),
+        _normalize(answer),
+        role, interview_mode, domain or "General", difficulty, model
+    ]
+    if prompt_version is not None:
+        parts.append(f"prompt-v{prompt_version}")
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """In-memory LRU with TTL, optionally backed by a SQLite file shared across restarts"""
+
+    def __init__(self, max_entries=EVAL_CACHE_MAX_ENTRIES, ttl=EVAL_CACHE_TTL, path=EVAL_CACHE_PATH,
+                 max_disk_entries=EVAL_CACHE_MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes_since_trim = 0
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations (key TEXT PRIMARY KEY, result TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS evaluations_created ON evaluations (created)")
+            self._db.commit()
+
+    def get(self, key):
+        """Return the cached evaluation dict for key, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, result = entry
+                if now - created < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(result)
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT result, created FROM evaluations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    result = json.loads(row[0])
+                    self._remember(key, row[1], result)
+                    self.hits += 1
+                    return dict(result)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, dict(result))
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO evaluations (key, result, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(result), created)
+                )
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= 100:
+                    self._trim_disk(created)
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _remember(self, key, created, result):
+        # Caller holds self._lock
+        self._entries[key] = (created, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _trim_disk(self, now):
+        self._writes_since_trim = 0
+        self._db.execute("DELETE FROM evaluations WHERE created < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM evaluations WHERE key IN "
+            "(SELECT key FROM evaluations ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+
+
+# Process-wide cache shared by every session and the batch tools
+evaluation_cache = EvaluationCache()
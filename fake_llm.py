@@ -0,0 +1,235 @@
+"""Local stand-in for the Groq chat-completions client.
+
+FakeChatClient answers `client.chat.completions.create(...)` without a network,
+either by replaying responses captured with RecordingClient or by producing
+synthetic responses with configurable latency and failure rates. It is used by
+benchmark.py and can back the app with LLM_BACKEND=fake.
+"""
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from types import SimpleNamespace
+
+FAKE_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "300"))
+FAKE_JITTER_MS = float(os.getenv("FAKE_LLM_JITTER_MS", "100"))
+FAKE_FAILURE_RATE = float(os.getenv("FAKE_LLM_FAILURE_RATE", "0"))
+FAKE_TOKENS_PER_SECOND = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "0"))
+FAKE_REPLAY_PATH = os.getenv("FAKE_LLM_REPLAY_PATH")
+# Share of JSON-mode evaluation replies that come back in the wrong format
+FAKE_MALFORMED_RATE = float(os.getenv("FAKE_LLM_MALFORMED_RATE", "0"))
+# Phrases combined into synthetic questions, so consecutive questions are not near-duplicates
+SYNTHETIC_SUBJECTS = (
+    "cache invalidation", "schema migrations", "flaky integration tests", "API versioning", "memory leaks",
+    "rate limiting", "feature flags", "database replication lag", "on-call incidents", "code review backlogs",
+    "stakeholder disagreements", "tight release deadlines", "legacy refactoring", "onboarding new teammates",
+    "monitoring dashboards", "message queue backpressure", "search relevance", "mobile offline sync",
+    "data pipeline failures", "access control", "cost reduction", "accessibility audits"
+)
+
+
+class FakeAPIError(Exception):
+    """Synthetic upstream failure carrying an HTTP status like the SDK's APIStatusError"""
+
+    def __init__(self, status_code=503):
+        super().__init__(f"fake upstream error {status_code}")
+        self.status_code = status_code
+
+
+class APITimeoutError(Exception):
+    """Raised when the simulated latency exceeds the caller's timeout (named like the SDK's)"""
+
+
+def request_key(model, messages, **params):
+    """Stable key for a chat request, used to match recordings on replay"""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "max_tokens": params.get("max_tokens")},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _approx_tokens(text):
+    return max(1, len(text) // 4)
+
+
+def _message(content, prompt_text):
+    usage = SimpleNamespace(
+        prompt_tokens=_approx_tokens(prompt_text),
+        completion_tokens=_approx_tokens(content),
+        total_tokens=_approx_tokens(prompt_text) + _approx_tokens(content)
+    )
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+        usage=usage
+    )
+
+
+def _stream_chunks(content, chunk_chars=12):
+    for start in range(0, len(content), chunk_chars):
+        delta = SimpleNamespace(content=content[start:start + chunk_chars])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+class SyntheticResponder:
+    """Produces plausible output for each of the engine's prompt types"""
+
+    def __init__(self, seed=None, malformed_rate=FAKE_MALFORMED_RATE):
+        self.random = random.Random(seed)
+        self.malformed_rate = malformed_rate
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def respond(self, messages):
+        system = messages[0]["content"] if messages else ""
+        prompt = messages[-1]["content"] if messages else ""
+        with self._lock:
+            self._counter += 1
+            counter = self._counter
+            score = self.random.randint(35, 95)
+            malformed = self.random.random() < self.malformed_rate
+
+        if "evaluator" in system and "JSON object" in system and not malformed:
+            batch = re.search(r"ANSWERS \((\d+)\)", prompt)
+            if batch:
+                return json.dumps({"evaluations": [
+                    {"item": i, "score": self.random.randint(35, 95), "feedback": f"Synthetic feedback for item {i}."}
+                    for i in range(1, int(batch.group(1)) + 1)
+                ]})
+            return json.dumps({"score": score, "feedback": f"Synthetic feedback {counter}. Add a concrete example next time."})
+        if "evaluator" in system:
+            batch = re.search(r"Evaluate each of these (\d+)|ANSWERS \((\d+)\)", prompt)
+            if batch:
+                return "\n".join(
+                    f"ITEM {i}\nSCORE: {self.random.randint(35, 95)}\nFEEDBACK: Synthetic feedback for item {i}."
+                    for i in range(1, int(batch.group(1) or batch.group(2)) + 1)
+                )
+            return f"SCORE: {score}\nFEEDBACK: Synthetic feedback {counter}. Add a concrete example next time."
+        if "running digest" in system:
+            numbers = re.findall(r"^Q(\d+):", prompt, re.MULTILINE)
+            return "Strengths:\n- Clear structure (" + ", ".join(f"Q{n}" for n in numbers) + ")\nWeaknesses:\n- Few concrete metrics"
+        if "career coach" in system:
+            return (
+                "## 🎯 FINAL PERFORMANCE SUMMARY\n\n**Overall Rating:** Good Candidate\n\n"
+                f"**Final Score:** {score}/100\n\n## ✅ KEY STRENGTHS\n\n• **Clarity:** Synthetic strength.\n\n"
+                "## 🎯 KEY AREAS FOR IMPROVEMENT\n\n• **Depth:** Synthetic improvement area.\n\n"
+                "## 📚 ACTION PLAN\n\n• **Next Steps:** Keep practicing."
+            )
+        subject, constraint = self.random.sample(SYNTHETIC_SUBJECTS, 2)
+        return f"Synthetic interview question #{counter}: how would you approach {subject} given {constraint}?"
+
+
+async def _async_stream_chunks(content):
+    for chunk in _stream_chunks(content):
+        yield chunk
+
+
+class FakeChatClient:
+    """Drop-in for Groq(): exposes chat.completions.create with simulated latency and failures"""
+
+    def __init__(self, latency_ms=FAKE_LATENCY_MS, jitter_ms=FAKE_JITTER_MS, failure_rate=FAKE_FAILURE_RATE,
+                 tokens_per_second=FAKE_TOKENS_PER_SECOND, replay_path=FAKE_REPLAY_PATH, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.tokens_per_second = tokens_per_second
+        self.responder = SyntheticResponder(seed)
+        self.random = random.Random(seed)
+        self.recordings = load_recordings(replay_path) if replay_path else {}
+        self.calls = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model=None, messages=None, stream=False, timeout=None, **params):
+        content, delay, fail = self._plan(model, messages, params)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise APITimeoutError("fake request timed out")
+        time.sleep(delay)
+        if fail:
+            raise FakeAPIError(self.random.choice([429, 500, 503]))
+        if stream:
+            return _stream_chunks(content)
+        return _message(content, messages[-1]["content"] if messages else "")
+
+    def _plan(self, model, messages, params):
+        with self._lock:
+            self.calls += 1
+            fail = self.random.random() < self.failure_rate
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+
+        recorded = self.recordings.get(request_key(model, messages, **params)) if self.recordings else None
+        if recorded is not None:
+            with self._lock:
+                self.replayed += 1
+            content = recorded
+        else:
+            content = self.responder.respond(messages or [])
+
+        delay = max(0.0, self.latency_ms + jitter) / 1000.0
+        if self.tokens_per_second:
+            delay += _approx_tokens(content) / self.tokens_per_second
+        return content, delay, fail
+
+
+class FakeAsyncChatClient(FakeChatClient):
+    """Drop-in for AsyncGroq()"""
+
+    async def create(self, model=None, messages=None, stream=False, timeout=None, **params):
+        content, delay, fail = self._plan(model, messages, params)
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise APITimeoutError("fake request timed out")
+        await asyncio.sleep(delay)
+        if fail:
+            raise FakeAPIError(self.random.choice([429, 500, 503]))
+        if stream:
+            return _async_stream_chunks(content)
+        return _message(content, messages[-1]["content"] if messages else "")
+
+
+class RecordingClient:
+    """Wraps a real client and appends every non-streamed response to a JSONL file for later replay"""
+
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model=None, messages=None, stream=False, **params):
+        response = self.client.chat.completions.create(model=model, messages=messages, stream=stream, **params)
+        if not stream:
+            self._record(model, messages, params, response)
+        return response
+
+    def _record(self, model, messages, params, response):
+        params.pop("timeout", None)
+        record = {"key": request_key(model, messages, **params), "content": response.choices[0].message.content}
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+class AsyncRecordingClient(RecordingClient):
+    """RecordingClient for AsyncGroq"""
+
+    async def create(self, model=None, messages=None, stream=False, **params):
+        response = await self.client.chat.completions.create(model=model, messages=messages, stream=stream, **params)
+        if not stream:
+            self._record(model, messages, params, response)
+        return response
+
+
+def load_recordings(path):
+    recordings = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                recordings[record["key"]] = record["content"]
+    return recordings
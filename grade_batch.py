@@ -0,0 +1,197 @@
+"""Headless batch grading of stored interview answers.
+
+Reads question/answer records from a JSONL or CSV file and grades them with
+InterviewBot.evaluate_answer on a bounded worker pool. Results are appended to
+the output JSONL as they finish, so an interrupted run can be resumed by
+running the same command again. Answers the model could not grade (API errors,
+open circuit breaker) are not written, so the next run retries them.
+
+Usage:
+    python grade_batch.py answers.jsonl graded.jsonl --workers 8 --rate 5
+    python grade_batch.py answers.jsonl graded.jsonl --batch-size 5
+
+Each record needs "question" and "answer"; "id", "role", "mode", "difficulty"
+and "domain" are optional and default to the command-line values.
+"""
+import argparse
+import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from bot_engine import InterviewBot
+from perf_stats import summarize_latencies, format_latencies
+from scheduler import scheduler
+
+
+def read_records(path, defaults):
+    """Yield normalized records from a .jsonl or .csv file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for index, row in enumerate(rows):
+            record = dict(defaults)
+            record.update({k: v for k, v in row.items() if v not in (None, "")})
+            record["id"] = str(record.get("id", index))
+            yield record
+
+
+def completed_ids(output_path):
+    """IDs already present in the output file (a partial last line is ignored)"""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(str(json.loads(line)["id"]))
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+_local = threading.local()
+
+
+def _bot_for(record):
+    # One bot per worker thread and configuration; setup() is cheap but not thread-safe to share
+    bots = getattr(_local, "bots", None)
+    if bots is None:
+        bots = _local.bots = {}
+    key = (record["role"], record["domain"], record["mode"], record["difficulty"])
+    bot = bots.get(key)
+    if bot is None:
+        bot = bots[key] = InterviewBot()
+        # Records are graded independently, so there is no final report to keep a digest for
+        bot.incremental_summary = False
+        bot.setup(*key)
+    return bot
+
+
+def _graded(record, evaluation, latency):
+    """Output row for a graded record, or None when the bot fell back to its local scorer"""
+    if evaluation.get("fallback"):
+        # Left out of the output so a resumed run grades it again
+        return None
+    return {
+        "id": record["id"],
+        "question": record["question"],
+        "score": evaluation["score"],
+        "feedback": evaluation["feedback"],
+        "role": record["role"],
+        "mode": record["mode"],
+        "difficulty": record["difficulty"],
+        "latency_ms": round(latency * 1000, 1)
+    }
+
+
+def grade_record(record):
+    started = time.perf_counter()
+    evaluation = _bot_for(record).evaluate_answer(record["question"], record["answer"])
+    latency = time.perf_counter() - started
+    return _graded(record, evaluation, latency), latency
+
+
+def grade_chunk(records):
+    """Grade records sharing one configuration with a single batched request"""
+    started = time.perf_counter()
+    evaluations = _bot_for(records[0]).evaluate_answers(
+        [(record["question"], record["answer"]) for record in records],
+        batch_size=len(records)
+    )
+    latency = time.perf_counter() - started
+    return [(_graded(record, evaluation, latency), latency) for record, evaluation in zip(records, evaluations)]
+
+
+def chunk_records(records, size):
+    """Group records by configuration into lists of at most `size`"""
+    groups = {}
+    for record in records:
+        key = (record["role"], record["domain"], record["mode"], record["difficulty"])
+        group = groups.setdefault(key, [])
+        group.append(record)
+        if len(group) == size:
+            yield groups.pop(key)
+    yield from groups.values()
+
+
+def run(args):
+    defaults = {"role": args.role, "mode": args.mode, "difficulty": args.difficulty, "domain": args.domain}
+    done = completed_ids(args.output)
+    pending = [r for r in read_records(args.input, defaults) if r["id"] not in done]
+    print(f"{len(done)} already graded, {len(pending)} to grade with {args.workers} workers")
+
+    if args.rate:
+        # Every upstream request (re-asks, escalations and re-grades included) passes the
+        # process-wide scheduler, so the limit is applied there rather than once per record
+        scheduler.set_request_rate(args.rate * 60, burst=max(1.0, args.rate))
+    latencies = []
+    failures = 0
+    fallbacks = 0
+    started = time.perf_counter()
+
+    with open(args.output, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=args.workers) as pool:
+        if out.tell() and not _ends_with_newline(args.output):
+            out.write("\n")  # terminate a line cut off by a crash
+        if args.batch_size > 1:
+            futures = {pool.submit(grade_chunk, chunk): chunk for chunk in chunk_records(pending, args.batch_size)}
+        else:
+            futures = {pool.submit(grade_record, record): [record] for record in pending}
+
+        graded = 0
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                failures += len(futures[future])
+                print(f"Error grading record {futures[future][0]['id']}: {e}")
+                continue
+            if args.batch_size <= 1:
+                results = [results]
+            for result, latency in results:
+                if result is None:
+                    fallbacks += 1
+                    continue
+                out.write(json.dumps(result) + "\n")
+                latencies.append(latency)
+            out.flush()
+
+            previous, graded = graded, graded + len(results)
+            if args.progress and graded // args.progress > previous // args.progress:
+                print(f"  {graded}/{len(pending)} graded")
+
+    elapsed = time.perf_counter() - started
+    print(f"Graded {len(latencies)} records in {elapsed:.1f}s ({len(latencies) / elapsed if elapsed else 0:.1f} items/s), {failures} failed")
+    if fallbacks:
+        print(f"{fallbacks} records could not be graded by the model and were not written; run again to retry them")
+    print(format_latencies("evaluate", summarize_latencies(latencies)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grade stored interview answers in bulk")
+    parser.add_argument("input", help="JSONL or CSV file of question/answer records")
+    parser.add_argument("output", help="JSONL file to append results to (also used to resume)")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent evaluations")
+    parser.add_argument("--rate", type=float, default=0, help="max upstream LLM requests per second, retries and escalations included (0 = unlimited)")
+    parser.add_argument("--batch-size", type=int, default=1, help="answers graded per LLM request")
+    parser.add_argument("--role", default="Software Engineer")
+    parser.add_argument("--mode", default="Technical")
+    parser.add_argument("--difficulty", default="Medium")
+    parser.add_argument("--domain", default="General")
+    parser.add_argument("--progress", type=int, default=100, help="print progress every N records")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
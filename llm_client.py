@@ -0,0 +1,405 @@
+import os
+import time
+import random
+import asyncio
+import threading
+import httpx
+from groq import Groq, AsyncGroq
+from dotenv import load_dotenv
+from scheduler import scheduler, estimate_tokens, QueueTimeoutError, PRIORITY_INTERACTIVE
+from singleflight import SingleFlight, request_fingerprint
+
+load_dotenv()
+
+# "groq" for the real API, "fake" for the local stand-in in fake_llm.py
+LLM_BACKEND = os.getenv("LLM_BACKEND", "groq")
+# JSONL file that real Groq responses are appended to, for replay with FAKE_LLM_REPLAY_PATH
+LLM_RECORD_PATH = os.getenv("LLM_RECORD_PATH", "")
+
+# Connection pool shared by every interview session in this process
+MAX_CONNECTIONS = int(os.getenv("GROQ_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GROQ_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("GROQ_KEEPALIVE_EXPIRY", "60"))
+
+# Resilience settings for every LLM call
+CALL_DEADLINE = float(os.getenv("LLM_CALL_DEADLINE", "20"))
+ATTEMPT_TIMEOUT = float(os.getenv("LLM_ATTEMPT_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+BACKOFF_CAP = float(os.getenv("LLM_BACKOFF_CAP", "4"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+
+# Identical in-flight requests share one upstream call; sampling above this temperature opts out
+SINGLE_FLIGHT_ENABLED = os.getenv("LLM_SINGLE_FLIGHT", "1") == "1"
+SINGLE_FLIGHT_MAX_TEMPERATURE = float(os.getenv("LLM_SINGLE_FLIGHT_MAX_TEMPERATURE", "0.5"))
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+_client_lock = threading.Lock()
+_shared_client = None
+_shared_async_client = None
+
+
+def _pool_limits():
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+
+
+def get_api_key():
+    return os.getenv("GROQ_API_KEY")
+
+
+def set_shared_client(client, async_client=None):
+    """Replace the process-wide clients, e.g. with a fake_llm client for benchmarks"""
+    global _shared_client, _shared_async_client
+    with _client_lock:
+        _shared_client = client
+        _shared_async_client = async_client
+
+
+def get_shared_client():
+    """Return the process-wide Groq client, or None when no API key is configured"""
+    global _shared_client
+
+    if _shared_client is None and LLM_BACKEND == "fake":
+        from fake_llm import FakeChatClient
+        with _client_lock:
+            if _shared_client is None:
+                _shared_client = FakeChatClient()
+    if _shared_client is not None:
+        return _shared_client
+
+    api_key = get_api_key()
+    if not api_key:
+        return None
+
+    if _shared_client is None:
+        with _client_lock:
+            if _shared_client is None:
+                http_client = httpx.Client(limits=_pool_limits())
+                _shared_client = Groq(api_key=api_key, http_client=http_client, max_retries=0)
+                if LLM_RECORD_PATH:
+                    from fake_llm import RecordingClient
+                    _shared_client = RecordingClient(_shared_client, LLM_RECORD_PATH)
+    return _shared_client
+
+
+def get_shared_async_client():
+    """Return the process-wide AsyncGroq client, or None when no API key is configured"""
+    global _shared_async_client
+
+    if _shared_async_client is None and LLM_BACKEND == "fake":
+        from fake_llm import FakeAsyncChatClient
+        with _client_lock:
+            if _shared_async_client is None:
+                _shared_async_client = FakeAsyncChatClient()
+    if _shared_async_client is not None:
+        return _shared_async_client
+
+    api_key = get_api_key()
+    if not api_key:
+        return None
+
+    if _shared_async_client is None:
+        with _client_lock:
+            if _shared_async_client is None:
+                http_client = httpx.AsyncClient(limits=_pool_limits())
+                _shared_async_client = AsyncGroq(api_key=api_key, http_client=http_client, max_retries=0)
+                if LLM_RECORD_PATH:
+                    from fake_llm import AsyncRecordingClient
+                    _shared_async_client = AsyncRecordingClient(_shared_async_client, LLM_RECORD_PATH)
+    return _shared_async_client
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the LLM while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: open for a cool-down, then let one trial call through"""
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+                self._trial_in_flight = False
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """Give back a half-open trial that never reached the upstream"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.times_opened += 1
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+breaker = CircuitBreaker()
+single_flight = SingleFlight()
+
+_metrics_lock = threading.Lock()
+_metrics = {
+    "calls": 0,
+    "successes": 0,
+    "failures": 0,
+    "retries": 0,
+    "timeouts": 0,
+    "short_circuited": 0,
+    "queue_timeouts": 0
+}
+
+
+def _count(name, amount=1):
+    with _metrics_lock:
+        _metrics[name] += amount
+
+
+def get_llm_metrics():
+    """Snapshot of call-layer counters and the circuit breaker state"""
+    with _metrics_lock:
+        snapshot = dict(_metrics)
+    snapshot["breaker_state"] = breaker.state
+    snapshot["breaker_consecutive_failures"] = breaker.consecutive_failures
+    snapshot["breaker_times_opened"] = breaker.times_opened
+    for name, value in scheduler.stats().items():
+        snapshot[f"scheduler_{name}"] = value
+    for name, value in single_flight.stats().items():
+        snapshot[f"single_flight_{name}"] = value
+    return snapshot
+
+
+def _is_timeout(error):
+    return isinstance(error, (httpx.TimeoutException, asyncio.TimeoutError)) or type(error).__name__ == "APITimeoutError"
+
+
+def _is_retryable(error):
+    if _is_timeout(error) or type(error).__name__ == "APIConnectionError":
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def _is_upstream_failure(error):
+    """Whether an error says the upstream is unhealthy (5xx, 429, timeout, connection), not the request bad"""
+    if _is_timeout(error) or type(error).__name__ == "APIConnectionError":
+        return True
+    status = getattr(error, "status_code", None)
+    return status is not None and (status >= 500 or status in (408, 429))
+
+
+def _record_failure(error):
+    """Count a final failure toward the circuit breaker only when the upstream is at fault"""
+    if _is_upstream_failure(error):
+        breaker.record_failure()
+    else:
+        # A rejected request says nothing about the upstream's health; free any half-open trial
+        breaker.release_trial()
+
+
+def _backoff_delay(attempt):
+    # Full jitter: uniform over [0, min(cap, base * 2^attempt)]
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _next_attempt(error, attempt, deadline_at):
+    """Record a failed attempt and return the delay before retrying, or None to give up"""
+    if _is_timeout(error):
+        _count("timeouts")
+    delay = _backoff_delay(attempt)
+    if attempt >= MAX_RETRIES or not _is_retryable(error) or time.monotonic() + delay >= deadline_at:
+        return None
+    _count("retries")
+    return delay
+
+
+def _tokens_used(response):
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) if usage is not None else None
+
+
+def _queue_timed_out(call_info, attempt):
+    _count("queue_timeouts")
+    breaker.release_trial()
+    if call_info is not None:
+        call_info['retries'] = attempt
+
+
+def _should_merge(dedupe, request):
+    if request.get("stream"):
+        return False  # a stream can only be consumed once
+    if dedupe is not None:
+        return dedupe
+    return SINGLE_FLIGHT_ENABLED and request.get("temperature", 1.0) <= SINGLE_FLIGHT_MAX_TEMPERATURE
+
+
+def _note_route(call_info, route, request):
+    if call_info is not None:
+        call_info['model'] = request.get("model")
+        if route is not None:
+            call_info['route'] = route
+
+
+def chat_completion(client, deadline=CALL_DEADLINE, call_info=None, session_id=None,
+                    priority=PRIORITY_INTERACTIVE, dedupe=None, route=None, **request):
+    """chat.completions.create with a deadline, jittered retries and the shared circuit breaker.
+
+    Every attempt waits for a slot from the process-wide scheduler under
+    (session_id, priority). Identical concurrent requests are merged into one
+    upstream call unless dedupe=False; by default only requests at or below
+    SINGLE_FLIGHT_MAX_TEMPERATURE are merged. When call_info is a dict, its
+    'retries' entry is set, 'merged' is True if another caller's result was reused,
+    and 'model' and 'route' name the model and route (see model_router) of the request.
+    """
+    if client is None:
+        raise RuntimeError("GROQ_API_KEY is not configured")
+    _note_route(call_info, route, request)
+    if not _should_merge(dedupe, request):
+        return _chat_completion(client, deadline, call_info, session_id, priority, request)
+
+    key = request_fingerprint(request)
+    response, merged = single_flight.do(
+        key, lambda: _chat_completion(client, deadline, call_info, session_id, priority, request)
+    )
+    if merged and call_info is not None:
+        call_info['merged'] = True
+    return response
+
+
+def _chat_completion(client, deadline, call_info, session_id, priority, request):
+    if not breaker.allow():
+        _count("short_circuited")
+        raise CircuitOpenError("LLM circuit breaker is open")
+
+    _count("calls")
+    deadline_at = time.monotonic() + deadline
+    estimated_tokens = estimate_tokens(request)
+    attempt = 0
+    while True:
+        try:
+            ticket = scheduler.acquire(session_id, priority, estimated_tokens, deadline_at - time.monotonic())
+        except QueueTimeoutError:
+            _queue_timed_out(call_info, attempt)
+            raise
+        timeout = max(0.1, min(ATTEMPT_TIMEOUT, deadline_at - time.monotonic()))
+        try:
+            response = client.chat.completions.create(timeout=timeout, **request)
+            scheduler.release(ticket, _tokens_used(response))
+        except Exception as e:
+            scheduler.release(ticket)
+            delay = _next_attempt(e, attempt, deadline_at)
+            if delay is None:
+                _count("failures")
+                _record_failure(e)
+                if call_info is not None:
+                    call_info['retries'] = attempt
+                raise
+            attempt += 1
+            time.sleep(delay)
+            continue
+        _count("successes")
+        breaker.record_success()
+        if call_info is not None:
+            call_info['retries'] = attempt
+        return response
+
+
+async def async_chat_completion(client, deadline=CALL_DEADLINE, call_info=None, session_id=None,
+                                priority=PRIORITY_INTERACTIVE, dedupe=None, route=None, **request):
+    """Awaitable chat_completion() for the AsyncGroq client"""
+    if client is None:
+        raise RuntimeError("GROQ_API_KEY is not configured")
+    _note_route(call_info, route, request)
+    if not _should_merge(dedupe, request):
+        return await _async_chat_completion(client, deadline, call_info, session_id, priority, request)
+
+    key = request_fingerprint(request)
+    response, merged = await single_flight.do_async(
+        key, lambda: _async_chat_completion(client, deadline, call_info, session_id, priority, request)
+    )
+    if merged and call_info is not None:
+        call_info['merged'] = True
+    return response
+
+
+async def _async_chat_completion(client, deadline, call_info, session_id, priority, request):
+    if not breaker.allow():
+        _count("short_circuited")
+        raise CircuitOpenError("LLM circuit breaker is open")
+
+    _count("calls")
+    try:
+        return await _async_attempts(client, deadline, call_info, session_id, priority, request)
+    except asyncio.CancelledError:
+        # A cancelled half-open trial proved nothing; let the next caller try
+        breaker.release_trial()
+        raise
+
+
+async def _async_attempts(client, deadline, call_info, session_id, priority, request):
+    deadline_at = time.monotonic() + deadline
+    estimated_tokens = estimate_tokens(request)
+    attempt = 0
+    while True:
+        try:
+            ticket = await scheduler.acquire_async(session_id, priority, estimated_tokens, deadline_at - time.monotonic())
+        except QueueTimeoutError:
+            _queue_timed_out(call_info, attempt)
+            raise
+        timeout = max(0.1, min(ATTEMPT_TIMEOUT, deadline_at - time.monotonic()))
+        try:
+            response = await asyncio.wait_for(
+                client.chat.completions.create(timeout=timeout, **request),
+                timeout
+            )
+            scheduler.release(ticket, _tokens_used(response))
+        except Exception as e:
+            scheduler.release(ticket)
+            delay = _next_attempt(e, attempt, deadline_at)
+            if delay is None:
+                _count("failures")
+                _record_failure(e)
+                if call_info is not None:
+                    call_info['retries'] = attempt
+                raise
+            attempt += 1
+            await asyncio.sleep(delay)
+            continue
+        except asyncio.CancelledError:
+            scheduler.release(ticket)
+            raise
+        _count("successes")
+        breaker.record_success()
+        if call_info is not None:
+            call_info['retries'] = attempt
+        return response
@@ -0,0 +1,220 @@
+"""Load generator simulating many concurrent interview candidates.
+
+Runs simulated candidate sessions in-process against the engine (the app has no
+separate server front end; each Streamlit session calls InterviewBot directly),
+backed by fake_llm.FakeChatClient. Engine calls are served by a fixed pool of
+worker threads standing in for the server's request threads, so queueing delay
+shows up once candidates outpace the workers.
+
+Usage:
+    python loadgen.py --sessions 200,500,1000 --workers 32 --latency-ms 300
+    python loadgen.py --sessions 1000 --think-mean 5 --duration 60
+
+For every step it reports throughput, queueing delay and per-operation tail
+latency, split into upstream (fake LLM) time and engine time. Engine time that
+grows with load while upstream time stays flat, or process CPU near one core,
+means the app/engine code path rather than the backend is the bottleneck.
+"""
+import argparse
+import heapq
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import llm_client
+from bot_engine import InterviewBot, DOMAIN_TOPICS
+from benchmark import synthetic_answer
+from fake_llm import FakeChatClient
+from perf_stats import summarize_latencies, percentile
+
+OPERATIONS = ("question", "evaluate", "summary")
+
+
+class TimedClient:
+    """Wraps a client and accumulates upstream time per thread"""
+
+    def __init__(self, client):
+        self.client = client
+        self._local = threading.local()
+        self.chat = type("Chat", (), {})()
+        self.chat.completions = type("Completions", (), {})()
+        self.chat.completions.create = self.create
+
+    def create(self, **request):
+        started = time.perf_counter()
+        try:
+            return self.client.chat.completions.create(**request)
+        finally:
+            self._local.upstream = getattr(self._local, "upstream", 0.0) + time.perf_counter() - started
+
+    def take_upstream(self):
+        upstream = getattr(self._local, "upstream", 0.0)
+        self._local.upstream = 0.0
+        return upstream
+
+
+class Candidate:
+    """One simulated candidate working through an interview"""
+
+    def __init__(self, candidate_id, client, questions, rng):
+        role = rng.choice(list(DOMAIN_TOPICS))
+        mode = rng.choice(["Technical", "Behavioral"])
+        difficulty = rng.choice(["Easy", "Medium", "Hard"])
+        self.id = candidate_id
+        self.rng = rng
+        self.questions = questions
+        self.bot = InterviewBot(client=client)
+        self.bot.setup(role, "General", mode, difficulty)
+        self.number = 1
+        self.question = None
+        self.history = []
+        self.next_op = "question"
+
+    def run_op(self):
+        """Perform the next engine call; return (operation, finished)"""
+        op = self.next_op
+        if op == "question":
+            self.question = self.bot.generate_question(self.number)
+            self.next_op = "evaluate"
+        elif op == "evaluate":
+            answer = synthetic_answer(self.rng, self.id, self.number)
+            evaluation = self.bot.evaluate_answer(self.question, answer)
+            self.history.append({
+                "question": self.question, "answer": answer,
+                "score": evaluation["score"], "feedback": evaluation["feedback"]
+            })
+            self.number += 1
+            self.next_op = "question" if self.number <= self.questions else "summary"
+        else:
+            self.bot.generate_summary(self.history)
+            return op, True
+        return op, False
+
+
+class LoadStep:
+    """Drive `sessions` concurrent candidates for `duration` seconds"""
+
+    def __init__(self, args, sessions, client):
+        self.args = args
+        self.sessions = sessions
+        self.client = client
+        self.rng = random.Random(args.seed + sessions)
+        self.executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="load-worker")
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.due = []
+        self.next_id = 0
+        self.stop_at = 0.0
+        self.records = {op: {"latency": [], "queue": [], "upstream": [], "engine": []} for op in OPERATIONS}
+        self.completed_interviews = 0
+
+    def think_time(self):
+        # Lognormal reading/typing time, scaled so long interviews fit in a short run
+        mean = self.args.think_mean
+        return self.rng.lognormvariate(0, self.args.think_sigma) * mean / math.exp(self.args.think_sigma ** 2 / 2)
+
+    def new_candidate(self, now):
+        self.next_id += 1
+        candidate = Candidate(self.next_id, self.client, self.args.questions, random.Random(self.rng.random()))
+        heapq.heappush(self.due, (now + self.rng.uniform(0, self.args.think_mean), candidate.id, candidate))
+
+    def run(self):
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        self.stop_at = started + self.args.duration
+        with self.lock:
+            for _ in range(self.sessions):
+                self.new_candidate(started)
+
+        while True:
+            with self.lock:
+                now = time.perf_counter()
+                if now >= self.stop_at:
+                    break
+                if not self.due or self.due[0][0] > now:
+                    timeout = (self.due[0][0] - now) if self.due else 0.05
+                    self.wakeup.wait(min(timeout, self.stop_at - now))
+                    continue
+                _, _, candidate = heapq.heappop(self.due)
+            self.executor.submit(self.serve, candidate, time.perf_counter())
+
+        self.executor.shutdown(wait=True)
+        elapsed = time.perf_counter() - started
+        return elapsed, time.process_time() - cpu_started
+
+    def serve(self, candidate, submitted):
+        started = time.perf_counter()
+        self.client.take_upstream()
+        op, finished = candidate.run_op()
+        ended = time.perf_counter()
+        upstream = self.client.take_upstream()
+
+        with self.lock:
+            record = self.records[op]
+            record["queue"].append(started - submitted)
+            record["latency"].append(ended - submitted)
+            record["upstream"].append(upstream)
+            record["engine"].append(max(0.0, ended - started - upstream))
+            if finished:
+                self.completed_interviews += 1
+                self.new_candidate(ended)
+            else:
+                heapq.heappush(self.due, (ended + self.think_time(), candidate.id, candidate))
+            self.wakeup.notify()
+
+
+def report(sessions, step, elapsed, cpu):
+    total_ops = sum(len(r["latency"]) for r in step.records.values())
+    print(f"\n== {sessions} concurrent candidates ({step.args.workers} workers, {elapsed:.1f}s) ==")
+    print(f"Throughput: {total_ops / elapsed:.1f} ops/s, {step.completed_interviews / elapsed:.2f} interviews/s; "
+          f"process CPU {cpu / elapsed:.0%} of one core")
+    print("latencies in ms")
+    print(f"{'op':<10}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'queue p95':>11}{'upstream p50':>14}{'engine p50':>12}{'engine p99':>12}")
+    for op in OPERATIONS:
+        record = step.records[op]
+        latency = summarize_latencies(record["latency"])
+        print(
+            f"{op:<10}{latency['count']:>7}"
+            f"{latency['p50'] * 1000:>9.1f}{latency['p95'] * 1000:>9.1f}{latency['p99'] * 1000:>9.1f}"
+            f"{percentile(record['queue'], 95) * 1000:>11.1f}"
+            f"{percentile(record['upstream'], 50) * 1000:>14.1f}"
+            f"{percentile(record['engine'], 50) * 1000:>12.1f}{percentile(record['engine'], 99) * 1000:>12.1f}"
+        )
+    return total_ops / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many concurrent interview candidates")
+    parser.add_argument("--sessions", default="100,300,1000", help="comma-separated concurrent candidate counts to step through")
+    parser.add_argument("--workers", type=int, default=32, help="threads serving engine calls")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per step")
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--think-mean", type=float, default=2.0, help="mean seconds between a candidate's calls")
+    parser.add_argument("--think-sigma", type=float, default=0.75, help="lognormal shape of think time")
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    fake = FakeChatClient(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate, seed=args.seed
+    )
+    client = TimedClient(fake)
+    llm_client.set_shared_client(client)
+
+    previous = None
+    for sessions in [int(s) for s in args.sessions.split(",")]:
+        step = LoadStep(args, sessions, client)
+        elapsed, cpu = step.run()
+        throughput = report(sessions, step, elapsed, cpu)
+        if previous and throughput < previous * 1.1:
+            print(f"Saturated: throughput grew <10% over the previous step ({previous:.1f} -> {throughput:.1f} ops/s)")
+        previous = throughput
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Offline answer scoring with no network calls.
+
+Every answer is turned into a hashed unigram+bigram TF-IDF vector. Its cosine
+similarity is measured against the question and against per-topic rubrics. The
+rubrics are built from the role's topics and a table of key terms per topic.
+Cue groups capture what a strong answer contains (examples, trade-offs, testing,
+STAR structure). Length only counts as distinct content words, so filler does
+not raise the score. Scoring a batch is a few matrix products, so one core
+grades thousands of answers per second.
+
+Run `python local_scorer.py` for a throughput check.
+"""
+import re
+import time
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+# Hashed feature space; collisions are rare for rubric-sized vocabularies
+VECTOR_DIM = 1 << 12
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his how
+i if in into is it its itself just let me more most my myself no nor not now of off on once only or other our ours
+out over own really same she should so some such than that the their theirs them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with would you your
+yours yeah um uh like basically actually thing things stuff lot lots kind sort pretty much well okay ok
+""".split())
+
+# Key terms a good answer on each topic tends to use
+TOPIC_TERMS = {
+    # Software Engineer
+    "Data Structures and Algorithms": "array hash map tree graph heap stack queue complexity big o time space sort search recursion dynamic programming",
+    "Object-Oriented Programming": "class object inheritance polymorphism encapsulation abstraction interface composition solid design pattern",
+    "Database Design and SQL": "schema table normalization index primary foreign key join query transaction acid constraint",
+    "System Design": "scalability availability load balancer cache database sharding replication latency throughput api queue",
+    "Code Optimization": "profiling bottleneck complexity memory cache algorithm benchmark latency allocation hot path",
+    "Testing and Debugging": "unit integration test mock assertion coverage regression debugger logging reproduce root cause",
+    "Version Control (Git)": "git branch merge rebase commit pull request conflict history revert tag workflow",
+    "API Design": "rest endpoint http resource versioning status code authentication pagination idempotent contract schema",
+    # Product Manager
+    "Product Strategy": "vision goal market customer segment competitive differentiation metric north star positioning",
+    "Market Analysis": "market size segment competitor trend customer research tam positioning pricing",
+    "Feature Prioritization": "prioritize impact effort rice moscow value customer roadmap trade off metric backlog",
+    "User Experience Design": "user research persona journey usability prototype wireframe feedback accessibility test",
+    "Data Analytics": "metric funnel cohort retention conversion dashboard sql analysis insight kpi",
+    "A/B Testing": "experiment control variant hypothesis sample size significance metric randomization p value",
+    "Roadmap Planning": "roadmap milestone quarter priority dependency stakeholder timeline goal okr",
+    "Stakeholder Management": "stakeholder alignment communication expectation update conflict buy in influence",
+    # Data Analyst
+    "Statistical Analysis": "mean median variance distribution regression correlation confidence interval significance sample",
+    "Data Visualization": "chart dashboard visualization bar line scatter axis audience insight storytelling tableau",
+    "SQL and Database Queries": "select join group aggregate where index subquery window function query table",
+    "Python/R Programming": "python pandas numpy dataframe function script library r notebook vectorize",
+    "Excel and Spreadsheet Analysis": "excel spreadsheet pivot table vlookup formula chart filter macro",
+    "Business Intelligence Tools": "tableau power bi dashboard report kpi data model refresh stakeholder",
+    "Data Cleaning and Preprocessing": "missing value duplicate outlier normalize clean validate format impute transform",
+    "Hypothesis Testing": "null hypothesis alternative p value significance test t test sample power error",
+    # Frontend Developer
+    "HTML, CSS, JavaScript": "html css javascript dom element selector event function semantic layout",
+    "React/Vue/Angular Frameworks": "component state props hook render lifecycle virtual dom framework react vue angular",
+    "Responsive Web Design": "responsive media query breakpoint flexbox grid mobile viewport layout",
+    "Browser Compatibility": "browser compatibility polyfill vendor prefix feature detection test safari chrome firefox",
+    "Performance Optimization": "performance lazy loading bundle size cache render profiling latency memory",
+    "CSS Preprocessors": "sass less variable mixin nesting preprocessor compile stylesheet",
+    "Build Tools and Bundlers": "webpack vite bundler build minify tree shaking module transpile babel",
+    "State Management": "state store redux context action reducer immutable global local",
+    # Backend Developer
+    "Server-side Programming": "server request response thread concurrency async framework middleware error handling",
+    "Database Design and Optimization": "schema index query plan normalization partition replication transaction optimize",
+    "API Development (REST/GraphQL)": "rest graphql endpoint schema resolver http status versioning authentication",
+    "Microservices Architecture": "microservice service boundary api gateway deployment independent communication discovery",
+    "Caching Strategies": "cache redis ttl invalidation eviction lru hit rate write through cdn",
+    "Security Implementation": "authentication authorization encryption token oauth injection validation tls secret",
+    "Load Balancing": "load balancer round robin health check traffic horizontal scaling failover session",
+    "Message Queues": "queue message broker kafka rabbitmq producer consumer retry asynchronous ordering",
+    # ML Engineer
+    "Machine Learning Algorithms": "model regression classification tree random forest gradient boosting svm neural network training",
+    "Feature Engineering": "feature encoding scaling selection interaction missing value transform domain",
+    "Model Evaluation Metrics": "accuracy precision recall f1 auc roc confusion matrix validation cross",
+    "Deep Learning Frameworks": "pytorch tensorflow layer tensor gradient training gpu batch optimizer",
+    "Data Preprocessing": "clean normalize scale missing value encoding split train test pipeline",
+    "Model Deployment and MLOps": "deployment pipeline serving container monitoring versioning ci cd model registry",
+    "A/B Testing for ML": "experiment control treatment metric significance online offline model comparison",
+    "Model Monitoring": "monitoring drift data distribution alert performance retrain latency metric",
+    # System Design
+    "Distributed Systems": "node partition replication consensus network failure consistency availability latency",
+    "Database Sharding": "shard partition key distribution rebalance hotspot replication query routing",
+    "Microservices vs Monolithic": "microservice monolith deployment coupling scaling complexity team boundary trade off",
+    "Consistency Models": "strong eventual consistency quorum read write replication conflict linearizable",
+    "Fault Tolerance": "redundancy failover replication retry timeout circuit breaker recovery graceful degradation",
+}
+
+# Cue groups: each group counts once if any of its terms appear
+CUE_GROUPS = {
+    "technical": {
+        "example": "example instance case scenario project production",
+        "trade-offs": "trade off tradeoff alternative pros cons versus however instead downside",
+        "performance": "performance complexity latency scale scalability memory throughput efficient",
+        "verification": "test edge case validate monitor measure debug verify",
+        "approach": "first then next finally step approach start because",
+    },
+    "behavioral": {
+        "situation": "situation when project team time company context",
+        "task": "task goal responsible deadline needed challenge problem",
+        "action": "action decided implemented organized led worked created proposed",
+        "result": "result outcome improved reduced increased delivered percent achieved",
+        "reflection": "learned lesson next time would differently feedback",
+    },
+}
+
+STRUCTURE_ADVICE = {
+    "technical": "Discuss trade-offs, edge cases and how you would test or measure your solution.",
+    "behavioral": "Use the STAR structure: the situation, your task, the actions you took and a measurable result.",
+}
+
+
+@lru_cache(maxsize=65536)
+def _stem(word):
+    # Crude suffix stripping so test/tests/testing/tested share one feature
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def _bucket(feature):
+    return zlib.crc32(feature.encode("utf-8")) & (VECTOR_DIM - 1)
+
+
+def content_tokens(text):
+    """Lowercased, stemmed words with stopwords removed"""
+    return [_stem(word) for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in STOPWORDS]
+
+
+def _features(tokens):
+    """Hashed unigram and bigram bucket ids"""
+    buckets = [_bucket(token) for token in tokens]
+    buckets.extend(_bucket(f"{first} {second}") for first, second in zip(tokens, tokens[1:]))
+    return buckets
+
+
+class LocalScorer:
+    """Scores answers against topic rubrics with hashed TF-IDF vectors and cosine similarity"""
+
+    def __init__(self, domain_topics):
+        self.domain_topics = domain_topics
+        documents = [f"{topic} {terms}" for topic, terms in TOPIC_TERMS.items()]
+        for mode_topics in domain_topics.values():
+            for topics in mode_topics.values():
+                documents.extend(topics)
+        for groups in CUE_GROUPS.values():
+            documents.extend(groups.values())
+
+        # Smoothed IDF over the rubric corpus; words outside it get the highest weight
+        document_frequency = np.zeros(VECTOR_DIM)
+        for document in documents:
+            document_frequency[list(set(_features(content_tokens(document))))] += 1
+        self.idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+        self.cues = {
+            mode: (list(groups), self._presence_matrix(groups.values()))
+            for mode, groups in CUE_GROUPS.items()
+        }
+        self._rubrics = {}
+
+    def vectors(self, texts):
+        """L2-normalized TF-IDF rows, one per text"""
+        matrix = np.zeros((len(texts), VECTOR_DIM), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = _features(content_tokens(text))
+            if features:
+                matrix[row] = np.bincount(features, minlength=VECTOR_DIM)
+        np.log1p(matrix, out=matrix)
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-9)
+
+    def _presence_matrix(self, term_lists):
+        """0/1 rows marking the unigram buckets of each term list"""
+        matrix = np.zeros((len(term_lists), VECTOR_DIM), dtype=np.float32)
+        for row, terms in enumerate(term_lists):
+            matrix[row, [_bucket(token) for token in content_tokens(terms)]] = 1
+        return matrix
+
+    def rubric(self, role, interview_mode):
+        """(topics, topic vectors, key-term token sets) for a role and mode, built once"""
+        key = (role, interview_mode)
+        rubric = self._rubrics.get(key)
+        if rubric is None:
+            mode = "technical" if interview_mode == "Technical" else "behavioral"
+            mode_topics = self.domain_topics.get(role) or self.domain_topics["Software Engineer"]
+            topics = list(mode_topics[mode])
+            references = [f"{topic} {TOPIC_TERMS.get(topic, '')}" for topic in topics]
+            terms = [content_tokens(TOPIC_TERMS.get(topic, topic)) for topic in topics]
+            rubric = self._rubrics[key] = (topics, self.vectors(references), terms)
+        return rubric
+
+    def best_topic(self, text, role, interview_mode):
+        """The role's topic whose rubric is most similar to text"""
+        topics, topic_vectors, _ = self.rubric(role, interview_mode)
+        return topics[int((self.vectors([text]) @ topic_vectors.T).argmax())]
+
+    def score(self, question, answer, role, interview_mode):
+        return self.score_many([(question, answer)], role, interview_mode)[0]
+
+    def score_many(self, pairs, role, interview_mode):
+        """Evaluations ({'score', 'feedback'}) for (question, answer) pairs of one role and mode"""
+        if not pairs:
+            return []
+        mode = "technical" if interview_mode == "Technical" else "behavioral"
+        topics, topic_vectors, topic_terms = self.rubric(role, interview_mode)
+        cue_names, cue_matrix = self.cues[mode]
+
+        answer_tokens = [content_tokens(answer) for _, answer in pairs]
+        answers = self.vectors([answer for _, answer in pairs])
+        questions = self.vectors([question for question, _ in pairs])
+
+        question_similarity = np.einsum("ij,ij->i", answers, questions)
+        topic_similarity = answers @ topic_vectors.T
+        best_topic = topic_similarity.argmax(axis=1)
+        relevance = np.minimum(1.0, np.maximum(question_similarity, topic_similarity.max(axis=1)) / 0.35)
+        cue_hits = (answers > 0) @ cue_matrix.T > 0
+        structure = cue_hits.mean(axis=1)
+
+        distinct = np.array([len(set(tokens)) for tokens in answer_tokens], dtype=np.float32)
+        total = np.array([len(tokens) for tokens in answer_tokens], dtype=np.float32)
+        substance = np.minimum(1.0, distinct / 40)
+        diversity = np.minimum(1.0, distinct / np.maximum(total, 1) / 0.6)
+
+        raw = 0.35 * substance + 0.30 * relevance + 0.25 * structure + 0.10 * diversity
+        scores = np.clip(np.rint(15 + 80 * raw), 0, 100).astype(int)
+        scores[distinct < 5] = np.minimum(scores[distinct < 5], 20)
+
+        results = []
+        for row, tokens in enumerate(answer_tokens):
+            missing = [term for term in topic_terms[best_topic[row]] if term not in set(tokens)][:3]
+            missing_cues = [name for name, hit in zip(cue_names, cue_hits[row]) if not hit]
+            results.append({
+                'score': int(scores[row]),
+                'feedback': self._feedback(mode, substance[row], relevance[row], structure[row],
+                                           topics[best_topic[row]], missing, missing_cues)
+            })
+        return results
+
+    def _feedback(self, mode, substance, relevance, structure, topic, missing, missing_cues):
+        if substance < 0.3:
+            return "Answer is too brief. Explain your reasoning step by step and support it with a concrete example."
+        if relevance < 0.4:
+            hint = f" such as {', '.join(missing)}" if missing else ""
+            return f"Stay closer to the question and cover the key ideas of {topic.lower()}{hint}."
+        if structure < 0.6:
+            return f"Relevant answer with useful detail. {STRUCTURE_ADVICE[mode]}"
+        if missing_cues:
+            return f"Solid, well-structured answer. To strengthen it, add more on {missing_cues[0].replace('-', ' ')}."
+        return "Comprehensive, relevant and well-structured answer. Keep using concrete examples and measurable outcomes."
+
+
+def main():
+    from bot_engine import DOMAIN_TOPICS
+
+    scorer = LocalScorer(DOMAIN_TOPICS)
+    samples = [
+        ("How would you design a cache for a read-heavy API?",
+         "First I would measure the read/write ratio and latency. Then I would add a Redis cache with a TTL and LRU "
+         "eviction in front of the database, invalidating entries on writes. The trade-off is stale reads versus load; "
+         "for example in production we cut p95 latency by 60 percent. I would test the hit rate and monitor evictions."),
+        ("How would you design a cache for a read-heavy API?", "I would use a cache."),
+        ("How would you design a cache for a read-heavy API?", " ".join(["really basically a lot of things and stuff"] * 20)),
+    ]
+    for question, answer in samples:
+        print(scorer.score(question, answer, "Backend Developer", "Technical"), "<-", answer[:50])
+
+    pairs = [samples[i % len(samples)] for i in range(5000)]
+    started = time.perf_counter()
+    scorer.score_many(pairs, "Backend Developer", "Technical")
+    elapsed = time.perf_counter() - started
+    print(f"{len(pairs)} answers in {elapsed:.2f}s ({len(pairs) / elapsed:.0f} answers/s)")
+
+
+if __name__ == "__main__":
+    main()
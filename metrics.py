@@ -0,0 +1,303 @@
+import time
+import threading
+
+from model_router import model_cost
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class CallRecord:
+    """Measurements for one engine call; used as a context manager around the call"""
+
+    def __init__(self, registry, call_type):
+        self.registry = registry
+        self.call_type = call_type
+        self.started = 0.0
+        self.wall_time = 0.0
+        self.ttft = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_hit = None
+        self.fallback = False
+        self.error = None
+        # Replies that did not match the expected format, and follow-up requests sent to fix them
+        self.parse_failures = 0
+        self.reasks = 0
+        # Answered by the local scorer without an upstream request
+        self.prescreened = False
+        # Generated questions rejected as near-duplicates of earlier ones
+        self.near_duplicates = 0
+        # Requests moved to a larger model, the route the call was on before that, and tokens per model
+        self.escalations = 0
+        self.escalated_from = None
+        self.model_tokens = {}
+        # Filled in by llm_client.chat_completion(call_info=...), including the current model and route
+        self.info = {'retries': 0}
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall_time = time.perf_counter() - self.started
+        if exc is not None and self.error is None:
+            self.error = type(exc).__name__
+        self.registry.record(self)
+        return False
+
+    def first_token(self):
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.started
+
+    def record_response(self, response):
+        """Take time to first token and token usage from a non-streamed response"""
+        self.first_token()
+        usage = getattr(response, "usage", None)
+        # A merged single-flight response was paid for (and counted) by the leading call
+        if usage is not None and not self.info.get('merged'):
+            self.add_usage(getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0)
+
+    def add_usage(self, prompt_tokens, completion_tokens):
+        """Count tokens, attributed to the model of the latest request"""
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        tokens = self.model_tokens.setdefault(self.info.get('model'), [0, 0])
+        tokens[0] += prompt_tokens
+        tokens[1] += completion_tokens
+
+    @property
+    def route(self):
+        return self.info.get('route') or self.call_type
+
+    def cost(self):
+        """USD cost of the tokens used, at MODEL_PRICES"""
+        return sum(model_cost(model, prompt, completion) for model, (prompt, completion) in self.model_tokens.items())
+
+    def record_fallback(self, error):
+        self.fallback = True
+        self.error = type(error).__name__
+
+    def as_dict(self):
+        return {
+            'call': self.call_type,
+            'route': self.route,
+            'escalated_from': self.escalated_from,
+            'model': self.info.get('model'),
+            'wall_time': self.wall_time,
+            'ttft': self.ttft,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'retries': self.info.get('retries', 0),
+            'cache_hit': self.cache_hit,
+            'merged': bool(self.info.get('merged')),
+            'fallback': self.fallback,
+            'parse_failures': self.parse_failures,
+            'reasks': self.reasks,
+            'prescreened': self.prescreened,
+            'near_duplicates': self.near_duplicates,
+            'escalations': self.escalations,
+            'cost': self.cost(),
+            'error': self.error
+        }
+
+
+class MetricsRegistry:
+    """Per-call-type aggregates with Prometheus text export and pluggable hooks"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._routes = {}
+        self._hooks = []
+
+    def call(self, call_type):
+        return CallRecord(self, call_type)
+
+    def add_hook(self, hook):
+        """Register hook(event_dict), called after every recorded call"""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+
+    def record(self, record):
+        with self._lock:
+            stats = self._stats.get(record.call_type)
+            if stats is None:
+                stats = self._stats[record.call_type] = {
+                    'calls': 0, 'fallbacks': 0, 'errors': 0, 'retries': 0,
+                    'cache_hits': 0, 'cache_misses': 0, 'merged': 0,
+                    'parse_failures': 0, 'reasks': 0, 'prescreened': 0, 'near_duplicates': 0, 'escalations': 0,
+                    'prompt_tokens': 0, 'completion_tokens': 0,
+                    'wall_time': _Histogram(), 'ttft': _Histogram()
+                }
+            stats['calls'] += 1
+            stats['fallbacks'] += record.fallback
+            stats['errors'] += record.error is not None
+            stats['retries'] += record.info.get('retries', 0)
+            stats['merged'] += bool(record.info.get('merged'))
+            stats['parse_failures'] += record.parse_failures
+            stats['reasks'] += record.reasks
+            stats['prescreened'] += record.prescreened
+            stats['near_duplicates'] += record.near_duplicates
+            stats['escalations'] += record.escalations
+            if record.cache_hit is True:
+                stats['cache_hits'] += 1
+            elif record.cache_hit is False:
+                stats['cache_misses'] += 1
+            stats['prompt_tokens'] += record.prompt_tokens
+            stats['completion_tokens'] += record.completion_tokens
+            stats['wall_time'].observe(record.wall_time)
+            if record.ttft is not None:
+                stats['ttft'].observe(record.ttft)
+            # Only calls that reached a model have a route. An escalated call is counted
+            # (with the tokens of both models) on its escalated route, and as an escalation
+            # on the route it started on.
+            if record.model_tokens or record.info.get('model'):
+                route = self._route_stats(record.route)
+                route['calls'] += 1
+                route['fallbacks'] += record.fallback
+                if record.escalated_from is not None:
+                    self._route_stats(record.escalated_from)['escalations'] += 1
+                route['prompt_tokens'] += record.prompt_tokens
+                route['completion_tokens'] += record.completion_tokens
+                route['cost'] += record.cost()
+                route['wall_time'].observe(record.wall_time)
+
+        if self._hooks:
+            event = record.as_dict()
+            for hook in list(self._hooks):
+                try:
+                    hook(event)
+                except Exception as e:
+                    print(f"Error in metrics hook: {e}")
+
+    def _route_stats(self, name):
+        # Caller holds self._lock
+        route = self._routes.get(name)
+        if route is None:
+            route = self._routes[name] = {
+                'calls': 0, 'fallbacks': 0, 'escalations': 0, 'prompt_tokens': 0,
+                'completion_tokens': 0, 'cost': 0.0, 'wall_time': _Histogram()
+            }
+        return route
+
+    def snapshot(self):
+        """Plain-dict view: counters plus mean wall time, TTFT and parse failure rate per call type"""
+        with self._lock:
+            result = {}
+            for call_type, stats in self._stats.items():
+                entry = {k: v for k, v in stats.items() if not isinstance(v, _Histogram)}
+                wall, ttft = stats['wall_time'], stats['ttft']
+                entry['mean_wall_time'] = wall.sum / wall.count if wall.count else 0.0
+                entry['mean_ttft'] = ttft.sum / ttft.count if ttft.count else 0.0
+                entry['parse_failure_rate'] = stats['parse_failures'] / stats['calls']
+                result[call_type] = entry
+            return result
+
+    def route_snapshot(self):
+        """Per-route counters, cost and latency (mean and approximate p95 from the histogram).
+
+        escalation_rate is the share of calls routed to a route that moved to its escalated route.
+        """
+        with self._lock:
+            result = {}
+            for name, route in self._routes.items():
+                entry = {k: v for k, v in route.items() if not isinstance(v, _Histogram)}
+                wall = route['wall_time']
+                entry['mean_wall_time'] = wall.sum / wall.count if wall.count else 0.0
+                entry['p95_wall_time'] = next(
+                    (bound for bound, count in zip(wall.buckets, wall.counts) if count >= 0.95 * wall.count),
+                    float("inf")
+                )
+                entry['cost_per_call'] = route['cost'] / route['calls'] if route['calls'] else 0.0
+                routed = route['calls'] + route['escalations']
+                entry['escalation_rate'] = route['escalations'] / routed if routed else 0.0
+                result[name] = entry
+            return result
+
+    def render_prometheus(self, prefix="interview_llm", gauges=None):
+        """Render all metrics in the Prometheus text exposition format.
+
+        `gauges` is an optional {name: number} of extra process-level values.
+        """
+        counters = [
+            ('calls', "Engine calls"),
+            ('fallbacks', "Calls answered by a local fallback"),
+            ('errors', "Calls that raised or fell back after an error"),
+            ('retries', "Upstream retries"),
+            ('cache_hits', "Calls served from a cache or pool"),
+            ('cache_misses', "Calls that missed the cache or pool"),
+            ('merged', "Calls that reused an identical in-flight request"),
+            ('parse_failures', "Replies that did not match the expected format"),
+            ('reasks', "Follow-up requests sent after an unparseable reply"),
+            ('prescreened', "Answers graded locally without an upstream request"),
+            ('near_duplicates', "Generated questions rejected as near-duplicates"),
+            ('escalations', "Requests retried on a larger model"),
+            ('prompt_tokens', "Prompt tokens reported by the API"),
+            ('completion_tokens', "Completion tokens reported by the API")
+        ]
+        lines = []
+        with self._lock:
+            items = sorted(self._stats.items())
+            for name, help_text in counters:
+                lines.append(f"# HELP {prefix}_{name}_total {help_text}")
+                lines.append(f"# TYPE {prefix}_{name}_total counter")
+                for call_type, stats in items:
+                    lines.append(f'{prefix}_{name}_total{{call="{call_type}"}} {stats[name]}')
+
+            for name, help_text in (('wall_time', "Engine call wall time"), ('ttft', "Time to first token")):
+                metric = f"{prefix}_{name}_seconds"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for call_type, stats in items:
+                    histogram = stats[name]
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{metric}_bucket{{call="{call_type}",le="{bound}"}} {count}')
+                    lines.append(f'{metric}_bucket{{call="{call_type}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{call="{call_type}"}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{call="{call_type}"}} {histogram.count}')
+
+            routes = sorted(self._routes.items())
+            for name, help_text in (('calls', "Calls per model route"), ('escalations', "Calls moved from this route to a larger model"),
+                                    ('cost', "USD spent per model route")):
+                metric = f"{prefix}_route_{name}_total"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for route, stats in routes:
+                    lines.append(f'{metric}{{route="{route}"}} {stats[name]}')
+            metric = f"{prefix}_route_wall_time_seconds"
+            lines.append(f"# HELP {metric} Engine call wall time per model route")
+            lines.append(f"# TYPE {metric} histogram")
+            for route, stats in routes:
+                histogram = stats['wall_time']
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{metric}_bucket{{route="{route}",le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{route="{route}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{metric}_sum{{route="{route}"}} {histogram.sum}')
+                lines.append(f'{metric}_count{{route="{route}"}} {histogram.count}')
+
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by every InterviewBot
+registry = MetricsRegistry()
@@ -0,0 +1,102 @@
+"""Model and token-budget routing for LLM calls.
+
+Questions, digests and summaries go to the small model unless ROUTE_<CALL_TYPE>=large.
+Evaluations get a budget by answer length. Long answers at Hard difficulty go
+straight to the large model. A small-model evaluation escalates to the large
+model only when its reply cannot be parsed, or when its score falls in the
+uncertain band (ROUTE_UNCERTAIN_BAND); the call is then reported under the
+"<name>:escalated" route. Per-route latency, tokens, cost and escalations are
+reported by the metrics registry.
+"""
+import os
+import json
+from collections import namedtuple
+
+MODEL_SMALL = os.getenv("LLM_MODEL_SMALL", "llama-3.1-8b-instant")
+MODEL_LARGE = os.getenv("LLM_MODEL_LARGE", "llama-3.3-70b-versatile")
+# Re-ask unparseable replies and re-grade uncertain scores on the large model
+ROUTE_ESCALATION = os.getenv("ROUTE_ESCALATION", "1") == "1"
+# "low-high" score range re-graded by the large model; empty disables it
+ROUTE_UNCERTAIN_BAND = os.getenv("ROUTE_UNCERTAIN_BAND", "45-55")
+# Answers shorter than this get the short evaluation budget
+ROUTE_SHORT_ANSWER_WORDS = int(os.getenv("ROUTE_SHORT_ANSWER_WORDS", "60"))
+# Answers at least this long at Hard difficulty are evaluated by the large model directly (0 disables)
+ROUTE_LARGE_ANSWER_WORDS = int(os.getenv("ROUTE_LARGE_ANSWER_WORDS", "250"))
+
+# USD per million (prompt, completion) tokens; extend or override with MODEL_PRICES='{"model": [in, out]}'
+MODEL_PRICES = {
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama-3.3-70b-versatile": (0.59, 0.79)
+}
+MODEL_PRICES.update({model: tuple(prices) for model, prices in json.loads(os.getenv("MODEL_PRICES", "{}")).items()})
+
+# Default tier and token budget per call type
+CALL_ROUTES = {
+    "question": ("small", 200),
+    "evaluation": ("small", 200),
+    "batch_evaluation": ("small", 120),
+    "summary": ("small", 600),
+    "summary_digest": ("small", 220)
+}
+
+Route = namedtuple("Route", ["name", "model", "max_tokens"])
+
+
+def model_cost(model, prompt_tokens, completion_tokens):
+    """USD cost of a request, or 0.0 for models without a known price"""
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1e6
+
+
+def _parse_band(text):
+    if not text:
+        return None
+    low, high = text.split("-")
+    return int(low), int(high)
+
+
+class ModelRouter:
+    """Picks the model and max_tokens for each call"""
+
+    def __init__(self, small=MODEL_SMALL, large=MODEL_LARGE, escalation=ROUTE_ESCALATION,
+                 uncertain_band=ROUTE_UNCERTAIN_BAND):
+        self.models = {"small": small, "large": large}
+        self.escalation = escalation
+        self.uncertain_band = _parse_band(uncertain_band)
+
+    def route(self, call_type, max_tokens=None, difficulty=None, answer=None):
+        """Route for a call; max_tokens overrides the call type's default budget.
+
+        Evaluations pass the answer (and difficulty) to pick a budget and tier;
+        batch evaluations pass the per-item budget times the number of items.
+        """
+        tier, default_tokens = CALL_ROUTES[call_type]
+        tier = os.getenv(f"ROUTE_{call_type.upper()}", tier)
+        budget = max_tokens or default_tokens
+        name = call_type
+        if call_type == "evaluation" and answer is not None:
+            words = len(answer.split())
+            if ROUTE_LARGE_ANSWER_WORDS and difficulty == "Hard" and words >= ROUTE_LARGE_ANSWER_WORDS:
+                tier, name = "large", "evaluation.hard_long"
+            elif words < ROUTE_SHORT_ANSWER_WORDS:
+                budget, name = int(budget * 0.75), "evaluation.short"
+            else:
+                name = "evaluation.standard"
+        return Route(f"{name}:{tier}", self.models[tier], budget)
+
+    def escalated_route(self, name):
+        """Route name for a call moved to the larger model, e.g. evaluation.standard:escalated"""
+        return f"{name.rsplit(':', 1)[0]}:escalated"
+
+    def escalation_model(self, model):
+        """The model to retry with instead of `model`, or None when there is nothing larger"""
+        if not self.escalation or model == self.models["large"]:
+            return None
+        return self.models["large"]
+
+    def uncertain(self, score):
+        return self.uncertain_band is not None and self.uncertain_band[0] <= score <= self.uncertain_band[1]
+
+
+# Process-wide router shared by every InterviewBot
+model_router = ModelRouter()
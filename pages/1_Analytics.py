@@ -0,0 +1,73 @@
+import streamlit as st
+from analytics import AnalyticsStore
+from session_store import session_store
+
+st.set_page_config(
+    page_title="📊 Interview Analytics",
+    page_icon="📊",
+    layout="wide"
+)
+
+
+@st.cache_resource
+def get_analytics_store():
+    """One store per server process, shared by every browser session"""
+    return AnalyticsStore()
+
+
+store = get_analytics_store()
+store.refresh(session_store)
+
+st.title("📊 Interview Analytics")
+
+with st.sidebar:
+    st.header("🔎 Filters")
+    filters = {
+        "role": st.selectbox("Role", options=["All"] + sorted(store.labels["role"])),
+        "difficulty": st.selectbox("Difficulty", options=["All"] + sorted(store.labels["difficulty"])),
+        "interview_mode": st.selectbox("Interview Mode", options=["All"] + sorted(store.labels["interview_mode"]))
+    }
+    filters = {key: value for key, value in filters.items() if value != "All"}
+
+totals = store.totals(**filters)
+if not totals['answers']:
+    st.info("No completed interviews yet. Finish an interview to see analytics here.")
+    st.stop()
+
+col1, col2 = st.columns(2)
+col1.metric("Answers", totals['answers'])
+col2.metric("Average Score", f"{totals['mean_score']:.1f}/100")
+
+st.subheader("📈 Average Score Over Time")
+trend = store.trend(period_days=7, **filters)
+st.line_chart({"Week": [day for day, _, _ in trend], "Average Score": [mean for _, mean, _ in trend]}, x="Week")
+
+col1, col2 = st.columns(2)
+with col1:
+    st.subheader("👥 By Role")
+    rows = store.average_by("role", **filters)
+    st.bar_chart({"Role": [label for label, _, _ in rows], "Average Score": [mean for _, mean, _ in rows]}, x="Role")
+with col2:
+    st.subheader("🎚️ By Difficulty")
+    rows = store.average_by("difficulty", **filters)
+    st.bar_chart({"Difficulty": [label for label, _, _ in rows], "Average Score": [mean for _, mean, _ in rows]}, x="Difficulty")
+
+col1, col2 = st.columns(2)
+with col1:
+    st.subheader("📚 By Topic")
+    rows = store.average_by("topic", **filters)
+    st.dataframe(
+        [{"Topic": label, "Average Score": round(mean, 1), "Answers": count} for label, mean, count in rows],
+        use_container_width=True
+    )
+with col2:
+    st.subheader("📊 Score Distribution")
+    bins = store.distribution(**filters)
+    st.bar_chart({"Score": [f"{start}+" for start, _ in bins], "Answers": [count for _, count in bins]}, x="Score")
+
+st.subheader("🧗 Hardest Questions")
+rows = store.average_by("question", limit=15, ascending=True, min_count=3, **filters)
+st.dataframe(
+    [{"Question": label, "Average Score": round(mean, 1), "Answers": count} for label, mean, count in rows],
+    use_container_width=True
+)
@@ -0,0 +1,34 @@
+import math
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_latencies(values):
+    """count/mean/p50/p90/p95/p99/max of latencies given in seconds"""
+    if not values:
+        return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p90': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'p50': percentile(ordered, 50),
+        'p90': percentile(ordered, 90),
+        'p95': percentile(ordered, 95),
+        'p99': percentile(ordered, 99),
+        'max': ordered[-1]
+    }
+
+
+def format_latencies(name, summary):
+    return (
+        f"{name:<12} n={summary['count']:<6} mean={summary['mean'] * 1000:8.1f}ms "
+        f"p50={summary['p50'] * 1000:8.1f}ms p95={summary['p95'] * 1000:8.1f}ms "
+        f"p99={summary['p99'] * 1000:8.1f}ms max={summary['max'] * 1000:8.1f}ms"
+    )
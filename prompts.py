@@ -0,0 +1,560 @@
+"""Versioned prompt templates for the interview engine.
+
+Each template renders a system message and a user message. Version 2 templates
+put everything that does not change between calls first: a fully static system
+message (instructions, criteria, output format), then a per-configuration block
+(role, mode, difficulty, topics) that is rendered once and interned, and only
+then the per-call suffix (question number, previous questions, the answer).
+That keeps the longest possible shared prefix for provider-side prefix/KV
+caching. Version 1 reproduces the original layouts for comparison.
+
+Run `python prompts.py` for a per-template token report.
+"""
+import os
+import sys
+from collections import namedtuple
+from functools import lru_cache
+
+QUESTION_SYSTEM_PROMPT = "You are an expert technical interviewer. Generate interview questions that are practical, relevant, and appropriate for the specified role and difficulty level."
+EVALUATION_SYSTEM_PROMPT = "You are an expert interview evaluator. Provide constructive, specific feedback with scores based on technical accuracy, communication clarity, and practical relevance."
+SUMMARY_SYSTEM_PROMPT = "You are an expert career coach and technical interviewer. Provide comprehensive, actionable feedback that helps candidates improve their interview performance."
+
+# Active version for every template, overridable per template with PROMPT_VERSION_<NAME>
+DEFAULT_PROMPT_VERSION = int(os.getenv("PROMPT_VERSION", "2"))
+
+# Everything about an interview that stays fixed across its calls
+PromptConfig = namedtuple("PromptConfig", ["role", "domain", "interview_mode", "difficulty", "topics"])
+
+
+def estimate_tokens(text):
+    """Approximate token count (about four characters per token for English prompts)"""
+    return (len(text) + 3) // 4
+
+
+class PromptTemplate:
+    """One version of a prompt: static system text, cached per-config prefix, per-call suffix"""
+
+    def __init__(self, name, version, system, suffix, prefix=None, description=""):
+        self.name = name
+        self.version = version
+        self.system = sys.intern(system)
+        self.description = description
+        self._suffix = suffix
+        self._prefix = prefix
+        self.prefix = lru_cache(maxsize=256)(self._render_prefix)
+
+    def _render_prefix(self, config):
+        return sys.intern(self._prefix(config)) if self._prefix else ""
+
+    def user_content(self, config, **values):
+        return self.prefix(config) + self._suffix(config, **values)
+
+    def render(self, config, **values):
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user_content(config, **values)}
+        ]
+
+
+class PromptRegistry:
+    def __init__(self):
+        self._templates = {}
+
+    def register(self, template):
+        self._templates.setdefault(template.name, {})[template.version] = template
+        return template
+
+    def get(self, name, version=None):
+        """Template by name; version defaults to PROMPT_VERSION_<NAME>, then PROMPT_VERSION, then the latest"""
+        versions = self._templates[name]
+        if version is None:
+            version = int(os.getenv(f"PROMPT_VERSION_{name.upper()}", DEFAULT_PROMPT_VERSION))
+        return versions.get(version) or versions[max(versions)]
+
+    def names(self):
+        return sorted(self._templates)
+
+    def versions(self, name):
+        return sorted(self._templates[name])
+
+
+registry = PromptRegistry()
+
+
+# ---------------------------------------------------------------------------
+# Version 1: original layouts (variable parts interleaved with instructions)
+# ---------------------------------------------------------------------------
+
+def _question_v1(config, question_number, previous_questions):
+    base_context = f"""
+        Generate a {config.difficulty.lower()}-level {config.interview_mode.lower()} interview question for a {config.role} position.
+        
+        Question #{question_number}
+        
+        Relevant Topics: {', '.join(config.topics[:5])}   # Limit to first 5 topics
+        Previous Questions: {', '.join(previous_questions) if previous_questions else 'None'}
+        """
+    
+    if config.interview_mode == "Technical":
+        return base_context + """
+            
+            Requirements:
+            - Focus on practical, hands-on scenarios from the role's key topics
+            - Include real-world applications and problem-solving
+            - Appropriate for the specified difficulty level
+            - Encourage detailed explanations and examples
+            - Avoid repeating similar concepts from previous questions
+            - Make it specific to the role and technical domain
+            
+            Generate only the question:
+            """
+    else:  # Behavioral
+        return base_context + """
+            
+            Requirements:
+            - Use STAR method framework (Situation, Task, Action, Result)
+            - Focus on professional scenarios relevant to the role and topics listed
+            - Encourage specific examples with measurable outcomes
+            - Appropriate for the specified experience level
+            - Different from previous behavioral questions asked
+            - Connect to the role's typical challenges and responsibilities
+            
+            Generate only the question:
+            """
+
+
+def _evaluation_v1(config, question, answer):
+    return f"""
+        Evaluate this {config.interview_mode.lower()} interview answer for a {config.role} position:
+
+        QUESTION: {question}
+        ANSWER: {answer}
+        
+        CONTEXT:
+        - Role: {config.role}
+        - Domain: {config.domain or 'General'}
+        - Difficulty Level: {config.difficulty}
+        - Interview Type: {config.interview_mode}
+
+        EVALUATION CRITERIA (based on interview requirements):
+        - Technical accuracy and depth of knowledge
+        - Problem-solving approach and methodology
+        - Use of appropriate examples and explanations
+        - Communication clarity and structure
+        - Consideration of edge cases, alternatives, or trade-offs
+        - Relevance to real-world scenarios
+
+        Provide evaluation in this exact format:
+        SCORE: [number 0-100]
+        FEEDBACK: [1-2 sentences of constructive feedback, including what they did well and one specific suggestion for improvement]
+
+        Be encouraging but honest.
+        """
+
+
+def _batch_evaluation_v1(config, pairs):
+    items = "\n\n".join(
+        f"        ITEM {i}\n        QUESTION: {question}\n        ANSWER: {answer}"
+        for i, (question, answer) in enumerate(pairs, 1)
+    )
+    return f"""
+        Evaluate each of these {len(pairs)} {config.interview_mode.lower()} interview answers for a {config.role} position independently.
+
+        CONTEXT:
+        - Role: {config.role}
+        - Domain: {config.domain or 'General'}
+        - Difficulty Level: {config.difficulty}
+        - Interview Type: {config.interview_mode}
+
+        EVALUATION CRITERIA (based on interview requirements):
+        - Technical accuracy and depth of knowledge
+        - Problem-solving approach and methodology
+        - Use of appropriate examples and explanations
+        - Communication clarity and structure
+        - Consideration of edge cases, alternatives, or trade-offs
+        - Relevance to real-world scenarios
+
+        ANSWERS:
+{items}
+
+        For every item, in order, provide evaluation in this exact format:
+        ITEM [number]
+        SCORE: [number 0-100]
+        FEEDBACK: [1-2 sentences of constructive feedback, including what they did well and one specific suggestion for improvement]
+
+        Be encouraging but honest.
+        """
+
+
+def _summary_v1(config, session_history):
+    if not session_history:
+        return "No interview data available for summary generation."
+
+    qa_pairs = "\\n".join([
+        f"Q{i+1}: {qa['question']}\\nAnswer: {qa['answer']}\\nScore: {qa['score']}/100\\nFeedback: {qa['feedback']}\\n"
+        for i, qa in enumerate(session_history)
+    ])
+    
+    scores = [qa['score'] for qa in session_history]
+    avg_score = sum(scores) / len(scores)
+    
+    return f"""
+        Based on this {config.role} interview session, provide a brief, actionable final summary report as specified:
+
+        INTERVIEW CONTEXT:
+        - Role: {config.role}
+        - Domain: {config.domain or 'General'}
+        - Interview Type: {config.interview_mode}
+        - Difficulty Level: {config.difficulty}
+        - Questions Answered: {len(session_history)}
+        - Average Score: {avg_score:.1f}/100
+
+        INTERVIEW TRANSCRIPT:
+        {qa_pairs}
+
+        Generate a concise report following this exact format:
+
+        ## 🎯 FINAL PERFORMANCE SUMMARY
+
+        **Overall Rating:** [e.g., Good Candidate]
+
+        **Final Score:** {avg_score:.0f}/100
+
+        ## ✅ KEY STRENGTHS
+
+        • **[Strength 1]:** [Briefly state a strength with an example]
+
+        • **[Strength 2]:** [Briefly state a second strength]
+
+        ## 🎯 KEY AREAS FOR IMPROVEMENT
+
+        • **[Area 1]:** [Briefly state an area to improve]
+
+        • **[Area 2]:** [Briefly state a second area to improve]
+
+        ## 📚 ACTION PLAN
+
+        • **Next Steps:** [1-2 actionable steps for improvement]
+        """
+
+
+registry.register(PromptTemplate("question", 1, QUESTION_SYSTEM_PROMPT, _question_v1, description="original layout"))
+registry.register(PromptTemplate("evaluation", 1, EVALUATION_SYSTEM_PROMPT, _evaluation_v1, description="original layout"))
+registry.register(PromptTemplate("batch_evaluation", 1, EVALUATION_SYSTEM_PROMPT, _batch_evaluation_v1, description="original layout"))
+registry.register(PromptTemplate("summary", 1, SUMMARY_SYSTEM_PROMPT, _summary_v1, description="original layout"))
+
+
+# ---------------------------------------------------------------------------
+# Version 2: static system message, then per-config prefix, then the variable suffix
+# ---------------------------------------------------------------------------
+
+_TECHNICAL_REQUIREMENTS = """Requirements:
+- Focus on practical, hands-on scenarios from the role's key topics
+- Include real-world applications and problem-solving
+- Appropriate for the specified difficulty level
+- Encourage detailed explanations and examples
+- Avoid repeating similar concepts from previous questions
+- Make it specific to the role and technical domain"""
+
+_BEHAVIORAL_REQUIREMENTS = """Requirements:
+- Use STAR method framework (Situation, Task, Action, Result)
+- Focus on professional scenarios relevant to the role and topics listed
+- Encourage specific examples with measurable outcomes
+- Appropriate for the specified experience level
+- Different from previous behavioral questions asked
+- Connect to the role's typical challenges and responsibilities"""
+
+_EVALUATION_CRITERIA = """EVALUATION CRITERIA (based on interview requirements):
+- Technical accuracy and depth of knowledge
+- Problem-solving approach and methodology
+- Use of appropriate examples and explanations
+- Communication clarity and structure
+- Consideration of edge cases, alternatives, or trade-offs
+- Relevance to real-world scenarios"""
+
+_FEEDBACK_FORMAT = "FEEDBACK: [1-2 sentences of constructive feedback, including what they did well and one specific suggestion for improvement]"
+
+_SUMMARY_FORMAT = """Generate a concise report following this exact format:
+
+## 🎯 FINAL PERFORMANCE SUMMARY
+
+**Overall Rating:** [e.g., Good Candidate]
+
+**Final Score:** [Average Score from the context, rounded to a whole number]/100
+
+## ✅ KEY STRENGTHS
+
+• **[Strength 1]:** [Briefly state a strength with an example]
+
+• **[Strength 2]:** [Briefly state a second strength]
+
+## 🎯 KEY AREAS FOR IMPROVEMENT
+
+• **[Area 1]:** [Briefly state an area to improve]
+
+• **[Area 2]:** [Briefly state a second area to improve]
+
+## 📚 ACTION PLAN
+
+• **Next Steps:** [1-2 actionable steps for improvement]"""
+
+
+def _config_block(config):
+    return (
+        f"Role: {config.role}\n"
+        f"Domain: {config.domain or 'General'}\n"
+        f"Interview Type: {config.interview_mode}\n"
+        f"Difficulty Level: {config.difficulty}\n"
+    )
+
+
+def _question_prefix_v2(config):
+    requirements = _TECHNICAL_REQUIREMENTS if config.interview_mode == "Technical" else _BEHAVIORAL_REQUIREMENTS
+    return _config_block(config) + f"Relevant Topics: {', '.join(config.topics)}\n\n{requirements}\n"
+
+
+def _question_suffix_v2(config, question_number, previous_questions):
+    previous = "\n".join(f"- {q}" for q in previous_questions) if previous_questions else "None"
+    return f"\nQuestion #{question_number}\nPrevious Questions:\n{previous}\n\nGenerate only the question:"
+
+
+def _evaluation_suffix_v2(config, question, answer):
+    return f"\nQUESTION: {question}\nANSWER: {answer}"
+
+
+def _batch_evaluation_suffix_v2(config, pairs):
+    items = "\n\n".join(
+        f"ITEM {i}\nQUESTION: {question}\nANSWER: {answer}" for i, (question, answer) in enumerate(pairs, 1)
+    )
+    return f"\nANSWERS ({len(pairs)}):\n{items}"
+
+
+def _summary_suffix_v2(config, session_history):
+    if not session_history:
+        return "No interview data available for summary generation."
+
+    scores = [qa['score'] for qa in session_history]
+    transcript = "\n".join(
+        f"Q{i}: {qa['question']}\nAnswer: {qa['answer']}\nScore: {qa['score']}/100\nFeedback: {qa['feedback']}\n"
+        for i, qa in enumerate(session_history, 1)
+    )
+    return (
+        f"Questions Answered: {len(session_history)}\n"
+        f"Average Score: {sum(scores) / len(scores):.1f}/100\n\n"
+        f"INTERVIEW TRANSCRIPT:\n{transcript}"
+    )
+
+
+registry.register(PromptTemplate(
+    "question", 2,
+    QUESTION_SYSTEM_PROMPT
+    + "\n\nGenerate one interview question for the role, type, difficulty and topics given by the user,"
+    + " following the listed requirements. Reply with the question only.",
+    _question_suffix_v2, prefix=_question_prefix_v2, description="prefix-cache layout"
+))
+registry.register(PromptTemplate(
+    "evaluation", 2,
+    EVALUATION_SYSTEM_PROMPT
+    + "\n\nEvaluate the candidate's interview answer given by the user.\n\n" + _EVALUATION_CRITERIA
+    + "\n\nProvide evaluation in this exact format:\nSCORE: [number 0-100]\n" + _FEEDBACK_FORMAT
+    + "\n\nBe encouraging but honest.",
+    _evaluation_suffix_v2, prefix=_config_block, description="prefix-cache layout"
+))
+registry.register(PromptTemplate(
+    "batch_evaluation", 2,
+    EVALUATION_SYSTEM_PROMPT
+    + "\n\nEvaluate each of the numbered interview answers given by the user independently.\n\n" + _EVALUATION_CRITERIA
+    + "\n\nFor every item, in order, provide evaluation in this exact format:\nITEM [number]\nSCORE: [number 0-100]\n"
+    + _FEEDBACK_FORMAT + "\n\nBe encouraging but honest.",
+    _batch_evaluation_suffix_v2, prefix=_config_block, description="prefix-cache layout"
+))
+registry.register(PromptTemplate(
+    "summary", 2,
+    SUMMARY_SYSTEM_PROMPT
+    + "\n\nBased on the interview session given by the user, provide a brief, actionable final summary report.\n\n"
+    + _SUMMARY_FORMAT,
+    _summary_suffix_v2, prefix=_config_block, description="prefix-cache layout"
+))
+
+
+# ---------------------------------------------------------------------------
+# JSON evaluation: same layout as version 2, replies are a fixed-schema object
+# ---------------------------------------------------------------------------
+
+# Per-criterion subscore keys, in the order of _EVALUATION_CRITERIA
+SUBSCORE_KEYS = ("accuracy", "approach", "examples", "clarity", "tradeoffs", "relevance")
+
+_JSON_FEEDBACK = '"feedback": "<1-2 sentences of constructive feedback, including what they did well and one specific suggestion for improvement>"'
+_JSON_SUBSCORES = '"subscores": {' + ", ".join(f'"{key}": <integer 0-100>' for key in SUBSCORE_KEYS) + '}'
+
+REASK_PROMPT = "Your previous reply could not be used ({reason}). Reply again with only the evaluation, in exactly the required format."
+
+registry.register(PromptTemplate(
+    "evaluation_json", 1,
+    EVALUATION_SYSTEM_PROMPT
+    + "\n\nEvaluate the candidate's interview answer given by the user.\n\n" + _EVALUATION_CRITERIA
+    + '\n\nReply with only a JSON object of this exact shape:\n{"score": <integer 0-100>, ' + _JSON_FEEDBACK + "}"
+    + "\n\nBe encouraging but honest.",
+    _evaluation_suffix_v2, prefix=_config_block, description="JSON reply"
+))
+registry.register(PromptTemplate(
+    "evaluation_json_subscores", 1,
+    EVALUATION_SYSTEM_PROMPT
+    + "\n\nEvaluate the candidate's interview answer given by the user.\n\n" + _EVALUATION_CRITERIA
+    + '\n\nReply with only a JSON object of this exact shape, with one subscore per criterion in the order listed:\n'
+    + '{"score": <integer 0-100>, ' + _JSON_FEEDBACK + ", " + _JSON_SUBSCORES + "}"
+    + "\n\nBe encouraging but honest.",
+    _evaluation_suffix_v2, prefix=_config_block, description="JSON reply with per-criterion subscores"
+))
+registry.register(PromptTemplate(
+    "batch_evaluation_json", 1,
+    EVALUATION_SYSTEM_PROMPT
+    + "\n\nEvaluate each of the numbered interview answers given by the user independently.\n\n" + _EVALUATION_CRITERIA
+    + '\n\nReply with only a JSON object of this exact shape, with one entry per item in order:\n'
+    + '{"evaluations": [{"item": <number>, "score": <integer 0-100>, ' + _JSON_FEEDBACK + "}]}"
+    + "\n\nBe encouraging but honest.",
+    _batch_evaluation_suffix_v2, prefix=_config_block, description="JSON reply"
+))
+
+
+# ---------------------------------------------------------------------------
+# Incremental summary: a rolling digest per interview, finalized into the report
+# ---------------------------------------------------------------------------
+
+DIGEST_SYSTEM_PROMPT = (
+    "You keep a compact running digest of a mock interview for the final report. Merge the new graded answers "
+    "given by the user into the current digest. Keep at most 120 words as short bullet points under 'Strengths:', "
+    "'Weaknesses:' and 'Evidence:', citing question numbers (e.g. Q3). Reply with the updated digest only."
+)
+
+
+def _transcript(records, first_number):
+    return "\n".join(
+        f"Q{number}: {qa['question']}\nAnswer: {qa['answer']}\nScore: {qa['score']}/100\nFeedback: {qa['feedback']}\n"
+        for number, qa in enumerate(records, first_number)
+    )
+
+
+def _digest_suffix(config, digest, records, first_number):
+    return f"\nCURRENT DIGEST:\n{digest or 'None yet'}\n\nNEW ANSWERS:\n{_transcript(records, first_number)}"
+
+
+def _summary_from_digest_suffix(config, session_history, digest, recent):
+    scores = [qa['score'] for qa in session_history]
+    score_line = ", ".join(f"Q{number} {score}" for number, score in enumerate(scores, 1))
+    suffix = (
+        f"Questions Answered: {len(session_history)}\n"
+        f"Average Score: {sum(scores) / len(scores):.1f}/100\n"
+        f"Scores: {score_line}\n\n"
+        f"INTERVIEW DIGEST:\n{digest}\n"
+    )
+    if recent:
+        suffix += f"\nLATEST ANSWERS (not in the digest yet):\n{_transcript(recent, len(session_history) - len(recent) + 1)}"
+    return suffix
+
+
+registry.register(PromptTemplate(
+    "summary_digest", 1, DIGEST_SYSTEM_PROMPT, _digest_suffix, prefix=_config_block, description="rolling digest update"
+))
+registry.register(PromptTemplate(
+    "summary_from_digest", 1,
+    SUMMARY_SYSTEM_PROMPT
+    + "\n\nBased on the interview digest and scores given by the user, provide a brief, actionable final summary report.\n\n"
+    + _SUMMARY_FORMAT,
+    _summary_from_digest_suffix, prefix=_config_block, description="final report from the digest"
+))
+
+
+# ---------------------------------------------------------------------------
+# Scheduled topics: one target topic per question, given in the per-call suffix
+# ---------------------------------------------------------------------------
+
+def _question_topic_prefix(config):
+    requirements = _TECHNICAL_REQUIREMENTS if config.interview_mode == "Technical" else _BEHAVIORAL_REQUIREMENTS
+    return _config_block(config) + f"\n{requirements}\n"
+
+
+def _question_topic_suffix(config, question_number, previous_questions, topic):
+    previous = "\n".join(f"- {q}" for q in previous_questions) if previous_questions else "None"
+    return f"\nTopic: {topic}\nQuestion #{question_number}\nPrevious Questions:\n{previous}\n\nGenerate only the question:"
+
+
+registry.register(PromptTemplate(
+    "question_topic", 1,
+    QUESTION_SYSTEM_PROMPT
+    + "\n\nGenerate one interview question on the topic given by the user, for the role, type and difficulty"
+    + " given, following the listed requirements. Reply with the question only.",
+    _question_topic_suffix, prefix=_question_topic_prefix, description="one scheduled topic per question"
+))
+
+
+# ---------------------------------------------------------------------------
+# Token report
+# ---------------------------------------------------------------------------
+
+_SAMPLE_CONFIG = PromptConfig(
+    "Software Engineer", None, "Technical", "Medium",
+    ("Data Structures and Algorithms", "Object-Oriented Programming", "Database Design and SQL",
+     "System Design", "Code Optimization")
+)
+_SAMPLE_ANSWER = "I would start by profiling the hot path, then add an index and cache the result. " * 4
+_SAMPLE_VALUES = {
+    "question": {"question_number": 3, "previous_questions": [
+        "How would you design a rate limiter for a public API?",
+        "Explain how a hash map handles collisions."
+    ]},
+    "evaluation": {"question": "How would you speed up a slow SQL query?", "answer": _SAMPLE_ANSWER},
+    "batch_evaluation": {"pairs": [("How would you speed up a slow SQL query?", _SAMPLE_ANSWER)] * 3},
+    "summary": {"session_history": [
+        {"question": "How would you speed up a slow SQL query?", "answer": _SAMPLE_ANSWER, "score": 72,
+         "feedback": "Clear plan; mention measuring with EXPLAIN."}
+    ] * 5}
+}
+_SAMPLE_VALUES["question_topic"] = dict(_SAMPLE_VALUES["question"], topic="Database Design and SQL")
+_SAMPLE_VALUES["evaluation_json"] = _SAMPLE_VALUES["evaluation_json_subscores"] = _SAMPLE_VALUES["evaluation"]
+_SAMPLE_VALUES["batch_evaluation_json"] = _SAMPLE_VALUES["batch_evaluation"]
+_SAMPLE_VALUES["summary_digest"] = {
+    "digest": "Strengths:\n- Profiles before optimizing (Q1, Q2)\nWeaknesses:\n- Rarely quantifies impact (Q2)\nEvidence:\n- Q1 72, Q2 68",
+    "records": _SAMPLE_VALUES["summary"]["session_history"][:1],
+    "first_number": 3
+}
+_SAMPLE_VALUES["summary_from_digest"] = {
+    "session_history": _SAMPLE_VALUES["summary"]["session_history"],
+    "digest": _SAMPLE_VALUES["summary_digest"]["digest"],
+    "recent": []
+}
+
+
+def token_report(config=_SAMPLE_CONFIG):
+    """Per template/version: static, per-config and per-call token counts for sample inputs"""
+    rows = []
+    for name in registry.names():
+        for version in registry.versions(name):
+            template = registry.get(name, version)
+            system = estimate_tokens(template.system)
+            prefix = estimate_tokens(template.prefix(config))
+            suffix = estimate_tokens(template._suffix(config, **_SAMPLE_VALUES[name]))
+            total = system + prefix + suffix
+            rows.append({
+                'template': name,
+                'version': version,
+                'system_tokens': system,
+                'config_prefix_tokens': prefix,
+                'per_call_tokens': suffix,
+                'total_tokens': total,
+                'cacheable_share': (system + prefix) / total if total else 0.0
+            })
+    return rows
+
+
+def main():
+    print(f"{'template':<28}{'ver':>4}{'system':>8}{'config':>8}{'per-call':>10}{'total':>8}{'cacheable':>11}")
+    for row in token_report():
+        print(
+            f"{row['template']:<28}{row['version']:>4}{row['system_tokens']:>8}{row['config_prefix_tokens']:>8}"
+            f"{row['per_call_tokens']:>10}{row['total_tokens']:>8}{row['cacheable_share']:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
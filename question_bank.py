@@ -0,0 +1,431 @@
+"""On-disk bank of interview questions for offline interviews.
+
+Questions live in a SQLite file indexed by (role, mode, difficulty, topic). Within
+each of those buckets every question has a dense slot number, and a small table
+holds each bucket's size. Opening the bank reads nothing up front. Drawing a
+question is one size lookup plus one primary-key read, however large the bank
+grows. A QuestionSampler walks each bucket in a random affine order, so a
+session gets no repeats until the bucket is exhausted.
+
+The bank is seeded from ROLE_SAMPLES and templated questions for every topic,
+and grows with the questions the LLM generates.
+
+Usage:
+    python question_bank.py stats
+    python question_bank.py import questions.jsonl     # {"role", "interview_mode", "difficulty", "topic", "question"} per line
+    python question_bank.py export questions.jsonl
+    python question_bank.py bench [--questions 300000]
+"""
+import os
+import json
+import math
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+
+QUESTION_BANK_ENABLED = os.getenv("QUESTION_BANK_ENABLED", "1") == "1"
+QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", "question_bank.db")
+# Also keep every question the LLM generates, so offline interviews draw on real questions
+QUESTION_BANK_RECORD = os.getenv("QUESTION_BANK_RECORD", "1") == "1"
+
+# Difficulty of questions that suit every level; drawn alongside the requested difficulty
+ANY_DIFFICULTY = "Any"
+
+# Role-specific sample questions, shown in the sidebar and used to seed the bank
+ROLE_SAMPLES = {
+    "Software Engineer": {
+        "technical": [
+            "• Explain time complexity of common algorithms",
+            "• Design a scalable web application architecture",
+            "• Implement a data structure like a binary tree",
+            "• Debug performance issues in production code"
+        ],
+        "behavioral": [
+            "• Tell me about a challenging technical problem you solved",
+            "• How do you handle code review feedback?",
+            "• Describe a time you had to learn a new technology"
+        ]
+    },
+    "Product Manager": {
+        "technical": [
+            "• How do you prioritize features on a product roadmap?",
+            "• Design a feature for an existing app like Spotify or Uber",
+            "• How do you measure the success of a new product launch?"
+        ],
+        "behavioral": [
+            "• Tell me about a time you managed a difficult stakeholder",
+            "• How do you handle disagreements within your team?",
+            "• Describe a time you had to pivot your product strategy"
+        ]
+    },
+    "Data Analyst": {
+        "technical": [
+            "• Write a SQL query to find the top 5 customers by sales",
+            "• Explain the difference between correlation and causation",
+            "• How would you handle missing data in a dataset?"
+        ],
+        "behavioral": [
+            "• Tell me about a time you had to explain complex data to a non-technical audience",
+            "• How do you ensure the quality of your data analysis?",
+            "• Describe a project where you used data to drive a key business decision"
+        ]
+    },
+    "Frontend Developer": {
+        "technical": [
+            "• Explain the JavaScript event loop",
+            "• How do you optimize a website for performance?",
+            "• Implement a responsive design layout using CSS Flexbox"
+        ],
+        "behavioral": [
+            "• Tell me about a time you had to implement a design that was difficult",
+            "• How do you keep up with new frameworks and libraries?",
+            "• Describe a time you collaborated with a UX/UI designer"
+        ]
+    },
+    "Backend Developer": {
+        "technical": [
+            "• Design a RESTful API for a blog application",
+            "• Explain the concept of a microservices architecture",
+            "• How do you handle database transactions and concurrency?"
+        ],
+        "behavioral": [
+            "• Tell me about a time you had to handle a critical production issue",
+            "• How do you ensure the security of a backend system?",
+            "• Describe a time you had to refactor legacy code"
+        ]
+    },
+    "ML Engineer": {
+        "technical": [
+            "• Explain the bias-variance trade-off",
+            "• How do you deploy a machine learning model to production?",
+            "• Describe the steps in a typical machine learning project pipeline"
+        ],
+        "behavioral": [
+            "• Tell me about a time you dealt with a biased dataset",
+            "• How do you handle model performance issues in production?",
+            "• Describe a project where you collaborated with data scientists and engineers"
+        ]
+    },
+    "Full Stack Developer": {
+        "technical": [
+            "• How do you manage state between the frontend and backend?",
+            "• Explain the purpose of a CDN in a web application",
+            "• Describe how to implement user authentication from end-to-end"
+        ],
+        "behavioral": [
+            "• Tell me about a time you led a feature from start to finish",
+            "• How do you stay proficient in both frontend and backend technologies?",
+            "• Describe a time you had to make a trade-off between speed and quality"
+        ]
+    },
+    "DevOps Engineer": {
+        "technical": [
+            "• Explain the CI/CD pipeline and its components",
+            "• How would you set up monitoring for a distributed system?",
+            "• Describe the benefits of using containers like Docker"
+        ],
+        "behavioral": [
+            "• Tell me about a time you had to troubleshoot a system outage",
+            "• How do you automate routine tasks in your workflow?",
+            "• Describe a time you improved the reliability of a system"
+        ]
+    },
+    "QA Engineer": {
+        "technical": [
+            "• What is the difference between functional and non-functional testing?",
+            "• Explain the concept of test automation frameworks",
+            "• How do you approach testing a new feature?"
+        ],
+        "behavioral": [
+            "• Tell me about a time you found a critical bug in production",
+            "• How do you work with developers to resolve issues?",
+            "• Describe your experience with agile methodologies"
+        ]
+    },
+    "System Architect": {
+        "technical": [
+            "• Design a high-level architecture for a social media platform",
+            "• Explain the CAP theorem and its implications",
+            "• How do you handle system scalability and performance bottlenecks?"
+        ],
+        "behavioral": [
+            "• Tell me about a time you had to make a major architectural decision",
+            "• How do you communicate complex designs to a non-technical audience?",
+            "• Describe a time you successfully migrated a system"
+        ]
+    }
+}
+
+# Questions written for every topic; {topic} is the lowercased topic name
+QUESTION_TEMPLATES = {
+    "Technical": (
+        "Explain your approach to {topic} and provide a practical example.",
+        "How would you handle a challenging scenario involving {topic}?",
+        "Describe the key considerations when working with {topic}.",
+        "What are the best practices for {topic} in your experience?",
+        "How would you optimize or improve {topic} in a real project?",
+        "Walk me through your problem-solving process for {topic}.",
+        "What tools and techniques do you use for {topic}?"
+    ),
+    "Behavioral": (
+        "Tell me about a time you had to deal with {topic}. How did you handle it?",
+        "Describe a situation where you demonstrated {topic}. What was the outcome?",
+        "Give me an example of how you approached {topic} in a previous role.",
+        "Tell me about a challenge related to {topic} and how you overcame it.",
+        "Describe your experience with {topic} and what you learned from it.",
+        "Share a time when you had to show {topic} under pressure.",
+        "Tell me about a project where {topic} was critical to success."
+    )
+}
+
+
+def role_topics(domain_topics, role, interview_mode):
+    """The role's topics for a mode; roles without their own list use Software Engineer's"""
+    mode_topics = domain_topics.get(role) or domain_topics["Software Engineer"]
+    return mode_topics["technical" if interview_mode == "Technical" else "behavioral"]
+
+
+def seed_questions(domain_topics, best_topic):
+    """Starter rows: templated questions for every topic plus the role samples.
+
+    best_topic(question, role, interview_mode) assigns each sample to a topic.
+    """
+    rows = []
+    for role in dict.fromkeys([*ROLE_SAMPLES, *domain_topics]):
+        samples = ROLE_SAMPLES.get(role, {})
+        for interview_mode, templates in QUESTION_TEMPLATES.items():
+            for topic in role_topics(domain_topics, role, interview_mode):
+                rows.extend(
+                    (role, interview_mode, ANY_DIFFICULTY, topic, template.format(topic=topic.lower()), "template")
+                    for template in templates
+                )
+            for sample in samples.get(interview_mode.lower(), []):
+                question = sample.lstrip("• ").strip()
+                rows.append((role, interview_mode, ANY_DIFFICULTY, best_topic(question, role, interview_mode),
+                             question, "sample"))
+    return rows
+
+
+class QuestionBank:
+    """SQLite-backed questions bucketed by (role, mode, difficulty, topic) with dense slots.
+
+    `seed()` returns starter rows; it runs once, the first time an empty bank is used.
+    """
+
+    def __init__(self, path=QUESTION_BANK_PATH, seed=None):
+        self.path = path
+        self.seed = seed
+        self._db = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Caller holds self._lock
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS questions (role TEXT NOT NULL, mode TEXT NOT NULL, "
+                "difficulty TEXT NOT NULL, topic TEXT NOT NULL, slot INTEGER NOT NULL, question TEXT NOT NULL, "
+                "source TEXT, PRIMARY KEY (role, mode, difficulty, topic, slot)) WITHOUT ROWID"
+            )
+            db.execute("CREATE UNIQUE INDEX IF NOT EXISTS questions_text ON questions (role, mode, question)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (role TEXT NOT NULL, mode TEXT NOT NULL, "
+                "difficulty TEXT NOT NULL, topic TEXT NOT NULL, size INTEGER NOT NULL, "
+                "PRIMARY KEY (role, mode, difficulty, topic)) WITHOUT ROWID"
+            )
+            db.commit()
+            self._db = db
+            if self.seed is not None and db.execute("SELECT 1 FROM buckets LIMIT 1").fetchone() is None:
+                self._insert(self.seed())
+        return self._db
+
+    def _insert(self, rows):
+        # Caller holds self._lock; one transaction for the whole batch
+        added = 0
+        for role, mode, difficulty, topic, question, source in rows:
+            key = (role, mode, difficulty, topic)
+            self._db.execute("INSERT OR IGNORE INTO buckets VALUES (?, ?, ?, ?, 0)", key)
+            size = self._db.execute(
+                "SELECT size FROM buckets WHERE role = ? AND mode = ? AND difficulty = ? AND topic = ?", key
+            ).fetchone()[0]
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO questions VALUES (?, ?, ?, ?, ?, ?, ?)", key + (size, question, source)
+            )
+            if cursor.rowcount:
+                self._db.execute(
+                    "UPDATE buckets SET size = size + 1 WHERE role = ? AND mode = ? AND difficulty = ? AND topic = ?",
+                    key
+                )
+                added += 1
+        self._db.commit()
+        return added
+
+    def add(self, role, interview_mode, difficulty, topic, question, source="llm"):
+        """Store one question; returns False when the role and mode already have it"""
+        return self.add_many([(role, interview_mode, difficulty, topic, question, source)]) == 1
+
+    def add_many(self, rows):
+        """Store (role, mode, difficulty, topic, question, source) rows; returns how many were new"""
+        with self._lock:
+            self._connect()
+            return self._insert(rows)
+
+    def size(self, role, interview_mode, difficulty, topic):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT size FROM buckets WHERE role = ? AND mode = ? AND difficulty = ? AND topic = ?",
+                (role, interview_mode, difficulty, topic)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get(self, role, interview_mode, difficulty, topic, slot):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT question FROM questions WHERE role = ? AND mode = ? AND difficulty = ? AND topic = ? AND slot = ?",
+                (role, interview_mode, difficulty, topic, slot)
+            ).fetchone()
+        return row[0] if row else None
+
+    def stats(self):
+        """Question count per (role, mode, difficulty)"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT role, mode, difficulty, SUM(size), COUNT(*) FROM buckets GROUP BY role, mode, difficulty"
+            ).fetchall()
+        return [
+            {'role': role, 'interview_mode': mode, 'difficulty': difficulty, 'questions': total, 'topics': topics}
+            for role, mode, difficulty, total, topics in rows
+        ]
+
+    def rows(self):
+        """Every stored question as a dict, in bucket order"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT role, mode, difficulty, topic, question, source FROM questions"
+            ).fetchall()
+        for role, mode, difficulty, topic, question, source in rows:
+            yield {'role': role, 'interview_mode': mode, 'difficulty': difficulty, 'topic': topic,
+                   'question': question, 'source': source}
+
+
+class QuestionSampler:
+    """Draws bank questions for one session without repeats, in constant time per draw.
+
+    Each (role, mode, difficulty, topic) key walks slot = (a * i + b) mod n for a
+    random a coprime to n, which visits every slot once before any repeats. The
+    requested difficulty and ANY_DIFFICULTY share one walk.
+    """
+
+    def __init__(self, bank, seed=None):
+        self.bank = bank
+        self.random = random.Random(seed)
+        self._walks = {}
+        self._lock = threading.Lock()
+
+    def draw(self, role, interview_mode, difficulty, topic, exclude=()):
+        """A question this session has not drawn yet, or None when the bucket has none left"""
+        levels = [(level, self.bank.size(role, interview_mode, level, topic)) for level in (difficulty, ANY_DIFFICULTY)]
+        total = sum(size for _, size in levels)
+        if total == 0:
+            return None
+
+        key = (role, interview_mode, difficulty, topic)
+        with self._lock:
+            walk = self._walks.get(key)
+            # A new walk once the bucket is exhausted or has grown
+            if walk is None or walk['n'] != total or walk['i'] >= total:
+                walk = self._walks[key] = {'a': self._coprime(total), 'b': self.random.randrange(total), 'i': 0, 'n': total}
+            while walk['i'] < total:
+                position = (walk['a'] * walk['i'] + walk['b']) % total
+                walk['i'] += 1
+                for level, size in levels:
+                    if position < size:
+                        break
+                    position -= size
+                question = self.bank.get(role, interview_mode, level, topic, position)
+                if question is not None and question not in exclude:
+                    return question
+        return None
+
+    def _coprime(self, n):
+        while True:
+            a = self.random.randrange(1, n + 1)
+            if math.gcd(a, n) == 1:
+                return a
+
+
+def bench(questions):
+    """Time opening a bank of synthetic questions and drawing from it"""
+    path = os.path.join(tempfile.mkdtemp(), "bench_bank.db")
+    bank = QuestionBank(path)
+    started = time.perf_counter()
+    rows = (
+        (f"Role {i % 10}", "Technical" if i % 2 else "Behavioral", ("Easy", "Medium", "Hard")[i % 3],
+         f"Topic {i % 8}", f"Synthetic question {i}?", "bench")
+        for i in range(questions)
+    )
+    bank.add_many(rows)
+    print(f"inserted {questions} questions in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    reopened = QuestionBank(path)
+    sampler = QuestionSampler(reopened, seed=1)
+    first = sampler.draw("Role 1", "Technical", "Medium", "Topic 1")
+    print(f"open and first draw: {(time.perf_counter() - started) * 1000:.1f} ms ({first})")
+
+    draws = 2000
+    seen = set()
+    started = time.perf_counter()
+    for _ in range(draws):
+        seen.add(sampler.draw("Role 1", "Technical", "Medium", "Topic 1"))
+    elapsed = time.perf_counter() - started
+    print(f"{draws} draws: {elapsed / draws * 1e6:.0f} us per draw, {len(seen)} distinct")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline interview question bank")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="question counts per role, mode and difficulty")
+    import_parser = commands.add_parser("import", help="add questions from a JSONL file")
+    import_parser.add_argument("path")
+    export_parser = commands.add_parser("export", help="write every question to a JSONL file")
+    export_parser.add_argument("path")
+    bench_parser = commands.add_parser("bench", help="time draws from a bank of synthetic questions")
+    bench_parser.add_argument("--questions", type=int, default=300000)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        bench(args.questions)
+        return
+
+    from bot_engine import question_bank
+
+    if args.command == "stats":
+        for entry in question_bank.stats():
+            print(f"{entry['role']:<22} {entry['interview_mode']:<11} {entry['difficulty']:<7} "
+                  f"{entry['questions']:>7} questions in {entry['topics']} topics")
+    elif args.command == "import":
+        with open(args.path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        added = question_bank.add_many(
+            (r['role'], r['interview_mode'], r.get('difficulty') or ANY_DIFFICULTY, r['topic'], r['question'],
+             r.get('source', "import"))
+            for r in records
+        )
+        print(f"added {added} of {len(records)} questions")
+    else:
+        count = 0
+        with open(args.path, "w", encoding="utf-8") as f:
+            for row in question_bank.rows():
+                f.write(json.dumps(row) + "\n")
+                count += 1
+        print(f"wrote {count} questions to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Near-duplicate detection for interview questions.
+
+Each question becomes a MinHash signature over its content-word unigrams and
+bigrams (stemmed, stopwords removed, as in local_scorer). A QuestionIndex files
+the signatures in LSH bands, so a lookup only compares against questions that
+share a band. A lookup takes tens of microseconds and needs no model call.
+`question in index` is true for a near-duplicate, which lets an index stand in
+for a plain set in `exclude=` arguments.
+"""
+import os
+import zlib
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from local_scorer import content_tokens
+
+# Estimated Jaccard similarity at or above which two questions count as the same question
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.5"))
+# Signature length = LSH bands x rows per band; 16 x 4 catches pairs from about 0.5 similarity
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+
+_PRIME = np.uint64(4294967311)
+_random = np.random.default_rng(20240601)
+_A = _random.integers(1, 1 << 32, MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64)
+_B = _random.integers(0, 1 << 32, MINHASH_BANDS * MINHASH_ROWS, dtype=np.uint64)
+
+
+@lru_cache(maxsize=4096)
+def signature(question):
+    """MinHash signature of a question (read-only array), or None when it has no content words"""
+    tokens = content_tokens(question)
+    shingles = set(tokens)
+    shingles.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    if not shingles:
+        return None
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    values = ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+    values.flags.writeable = False
+    return values
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two questions"""
+    a, b = signature(first), signature(second)
+    if a is None or b is None:
+        return 0.0
+    return float(np.mean(a == b))
+
+
+class QuestionIndex:
+    """LSH index of question signatures, optionally bounded to the newest max_size questions"""
+
+    def __init__(self, questions=(), threshold=NEAR_DUPLICATE_THRESHOLD, max_size=None):
+        self.threshold = threshold
+        self.max_size = max_size
+        # id -> (question, signature), in insertion order; band key -> ids
+        self._entries = {}
+        self._bands = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        for question in questions:
+            self.add(question)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, question):
+        return self.find(question) is not None
+
+    @property
+    def questions(self):
+        return [question for question, _ in self._entries.values()]
+
+    def add(self, question):
+        values = signature(question)
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (question, values)
+            if values is not None:
+                for band in self._band_keys(values):
+                    self._bands.setdefault(band, []).append(entry_id)
+            if self.max_size is not None and len(self._entries) > self.max_size:
+                self._evict()
+
+    def find(self, question):
+        """(closest indexed question, similarity) at or above the threshold, or None"""
+        values = signature(question)
+        if values is None:
+            return None
+        with self._lock:
+            ids = {entry_id for band in self._band_keys(values) for entry_id in self._bands.get(band, ())}
+            candidates = [self._entries[entry_id] for entry_id in ids]
+        if not candidates:
+            return None
+        scores = (np.stack([v for _, v in candidates]) == values).mean(axis=1)
+        best = int(scores.argmax())
+        if scores[best] < self.threshold:
+            return None
+        return candidates[best][0], float(scores[best])
+
+    def diverse(self, count):
+        """Up to count indexed questions that are as different from each other as possible.
+
+        Starts from the newest question and repeatedly adds the question least
+        similar to any already chosen, so the result spans the concepts covered
+        rather than just the latest ones. Returned in the order they were added.
+        """
+        with self._lock:
+            entries = [(q, v) for q, v in self._entries.values() if v is not None]
+        if len(entries) <= count:
+            return [question for question, _ in entries]
+
+        matrix = np.stack([values for _, values in entries])
+        start = len(entries) - 1
+        chosen = [start]
+        closest = (matrix == matrix[start]).mean(axis=1)
+        while len(chosen) < count:
+            closest[chosen] = np.inf
+            pick = int(closest.argmin())
+            chosen.append(pick)
+            closest = np.maximum(closest, (matrix == matrix[pick]).mean(axis=1))
+        return [entries[i][0] for i in sorted(chosen)]
+
+    def _band_keys(self, values):
+        return [(band, values[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS].tobytes()) for band in range(MINHASH_BANDS)]
+
+    def _evict(self):
+        # Caller holds self._lock
+        entry_id = next(iter(self._entries))
+        _, values = self._entries.pop(entry_id)
+        if values is None:
+            return
+        for band in self._band_keys(values):
+            bucket = self._bands.get(band)
+            if bucket is not None:
+                bucket.remove(entry_id)
+                if not bucket:
+                    del self._bands[band]
@@ -0,0 +1,132 @@
+import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from question_index import QuestionIndex
+
+# Warm pool of pre-generated questions per (role, mode, difficulty, topic)
+POOL_ENABLED = os.getenv("QUESTION_POOL_ENABLED", "1") == "1"
+POOL_TARGET_DEPTH = int(os.getenv("QUESTION_POOL_DEPTH", "3"))
+POOL_MAX_KEYS = int(os.getenv("QUESTION_POOL_MAX_KEYS", "256"))
+POOL_REFILL_WORKERS = int(os.getenv("QUESTION_POOL_WORKERS", "2"))
+# Questions per key checked for near-duplicates, and rejections in a row before a refill gives up
+POOL_DEDUP_WINDOW = int(os.getenv("QUESTION_POOL_DEDUP_WINDOW", "64"))
+POOL_MAX_REJECTIONS = 3
+
+
+class QuestionPool:
+    """Bounded, LRU-evicted pools of ready questions refilled by background workers.
+
+    `generate(key, recent)` produces one new question for a configuration key,
+    given the most recently generated questions for that key.
+    """
+
+    def __init__(self, generate, target_depth=POOL_TARGET_DEPTH, max_keys=POOL_MAX_KEYS,
+                 workers=POOL_REFILL_WORKERS):
+        self.generate = generate
+        self.target_depth = target_depth
+        self.max_keys = max_keys
+        self._pools = OrderedDict()
+        self._recent = {}
+        self._seen = {}
+        self._refilling = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="question-pool")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generated = 0
+        self.rejected = 0
+
+    def take(self, key, exclude=()):
+        """Remove and return the oldest ready question for key that is not in exclude, or None.
+
+        exclude may be a QuestionIndex, which also skips near-duplicates. Skipped
+        questions stay in the pool for other sessions.
+        """
+        question = None
+        with self._lock:
+            pool = self._touch(key)
+            for position, candidate in enumerate(pool):
+                if candidate not in exclude:
+                    question = candidate
+                    del pool[position]
+                    break
+            if question is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self.request_refill(key)
+        return question
+
+    def request_refill(self, key):
+        """Top the pool for key back up to the target depth in the background"""
+        with self._lock:
+            self._touch(key)
+            if key in self._refilling or len(self._pools[key]) >= self.target_depth:
+                return
+            self._refilling.add(key)
+        self._executor.submit(self._refill, key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'keys': len(self._pools),
+                'ready': sum(len(pool) for pool in self._pools.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'generated': self.generated,
+                'rejected': self.rejected
+            }
+
+    def _touch(self, key):
+        # Caller holds self._lock
+        if key in self._pools:
+            self._pools.move_to_end(key)
+            return self._pools[key]
+
+        self._pools[key] = deque()
+        self._recent[key] = deque(maxlen=2)
+        self._seen[key] = QuestionIndex(max_size=POOL_DEDUP_WINDOW)
+        while len(self._pools) > self.max_keys:
+            evicted, _ = self._pools.popitem(last=False)
+            self._recent.pop(evicted, None)
+            self._seen.pop(evicted, None)
+            self.evictions += 1
+        return self._pools[key]
+
+    def _refill(self, key):
+        rejections = 0
+        try:
+            while rejections < POOL_MAX_REJECTIONS:
+                with self._lock:
+                    pool = self._pools.get(key)
+                    if pool is None or len(pool) >= self.target_depth:
+                        return
+                    recent = list(self._recent[key])
+                    seen = self._seen[key]
+
+                question = self.generate(key, recent)
+                # A near-duplicate of a recent question for this key would only be skipped by sessions
+                if question in seen:
+                    with self._lock:
+                        self.rejected += 1
+                    rejections += 1
+                    continue
+                rejections = 0
+                seen.add(question)
+
+                with self._lock:
+                    pool = self._pools.get(key)
+                    if pool is None:
+                        return
+                    pool.append(question)
+                    self._recent[key].append(question)
+                    self.generated += 1
+        except Exception as e:
+            print(f"Error refilling question pool: {e}")
+        finally:
+            with self._lock:
+                self._refilling.discard(key)
@@ -0,0 +1,237 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque, OrderedDict
+
+# Process-wide admission control for upstream LLM requests
+SCHEDULER_RPM = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))  # 0 = unlimited
+SCHEDULER_TPM = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))  # 0 = unlimited
+SCHEDULER_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+
+PRIORITY_INTERACTIVE = 0  # evaluate_answer, the question on screen
+PRIORITY_BACKGROUND = 1  # prefetch, pool refill, summaries
+
+_WAIT_WINDOW = 1000  # recent waits kept per priority for percentiles
+
+
+class QueueTimeoutError(Exception):
+    """The request could not be scheduled before its deadline"""
+
+
+class _Ticket:
+    __slots__ = ("session_id", "priority", "tokens", "enqueued", "granted", "wake")
+
+    def __init__(self, session_id, priority, tokens, wake=None):
+        self.session_id = session_id
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.granted = False
+        # Called (under the scheduler lock) when the ticket is granted, for async waiters
+        self.wake = wake
+
+
+class _TokenBucket:
+    def __init__(self, per_minute, burst=None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst or per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        if self.rate:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount):
+        """Seconds until `amount` is available (0 when it already is)"""
+        if not self.rate or self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+class RequestScheduler:
+    """Token-bucket rate limiting with strict priority and round-robin fairness across sessions.
+
+    Callers block in acquire() (or await acquire_async()) until their request
+    may go upstream and call release() when it finishes. Within a priority level each session gets one
+    grant in turn, so one busy session cannot starve the others.
+    """
+
+    def __init__(self, requests_per_minute=SCHEDULER_RPM, tokens_per_minute=SCHEDULER_TPM,
+                 max_concurrency=SCHEDULER_MAX_CONCURRENCY):
+        self.requests = _TokenBucket(requests_per_minute)
+        self.tokens = _TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        # priority -> OrderedDict(session_id -> deque of tickets), rotated for round-robin
+        self._queues = {PRIORITY_INTERACTIVE: OrderedDict(), PRIORITY_BACKGROUND: OrderedDict()}
+        self._waits = {priority: deque(maxlen=_WAIT_WINDOW) for priority in self._queues}
+        self.granted = 0
+        self.timed_out = 0
+
+    def set_request_rate(self, requests_per_minute, burst=None):
+        """Replace the request limit, e.g. from a command-line flag; burst defaults to a minute's worth"""
+        with self._cond:
+            self.requests = _TokenBucket(requests_per_minute, burst)
+            self._cond.notify_all()
+
+    def acquire(self, session_id, priority=PRIORITY_INTERACTIVE, tokens=0, timeout=None):
+        """Block until the request may be sent; returns a ticket for release()"""
+        ticket = self._ticket(session_id, priority, tokens)
+        deadline = None if timeout is None else ticket.enqueued + timeout
+
+        with self._cond:
+            self._queues[priority].setdefault(session_id, deque()).append(ticket)
+            while True:
+                wait = self._poll(ticket, deadline)
+                if ticket.granted:
+                    return ticket
+                self._cond.wait(wait or None)
+
+    async def acquire_async(self, session_id, priority=PRIORITY_INTERACTIVE, tokens=0, timeout=None):
+        """Awaitable acquire() that waits on the event loop instead of a worker thread.
+
+        If the awaiting task is cancelled, the ticket is withdrawn from its queue,
+        or released when it was granted in the meantime.
+        """
+        loop = asyncio.get_running_loop()
+        granted = asyncio.Event()
+        ticket = self._ticket(session_id, priority, tokens, lambda: loop.call_soon_threadsafe(granted.set))
+        deadline = None if timeout is None else ticket.enqueued + timeout
+
+        with self._cond:
+            self._queues[priority].setdefault(session_id, deque()).append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._poll(ticket, deadline)
+                    if ticket.granted:
+                        return ticket
+                    granted.clear()
+                try:
+                    await asyncio.wait_for(granted.wait(), wait or None)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+    def release(self, ticket, tokens_used=None):
+        """Finish a request; tokens_used corrects the estimate charged at acquire()"""
+        with self._cond:
+            self.in_flight -= 1
+            if tokens_used is not None and self.tokens.rate:
+                self.tokens.level = min(self.tokens.capacity, self.tokens.level + ticket.tokens - tokens_used)
+            # Grant waiting tickets now; async waiters only wake when theirs is granted
+            self._dispatch()
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            result = {
+                'in_flight': self.in_flight,
+                'granted': self.granted,
+                'timed_out': self.timed_out
+            }
+            for priority, name in ((PRIORITY_INTERACTIVE, "interactive"), (PRIORITY_BACKGROUND, "background")):
+                waits = sorted(self._waits[priority])
+                result[f'{name}_queue_depth'] = sum(len(q) for q in self._queues[priority].values())
+                result[f'{name}_wait_p50'] = waits[len(waits) // 2] if waits else 0.0
+                result[f'{name}_wait_p95'] = waits[int(len(waits) * 0.95)] if waits else 0.0
+                result[f'{name}_wait_max'] = waits[-1] if waits else 0.0
+            return result
+
+    def _ticket(self, session_id, priority, tokens, wake=None):
+        if self.tokens.capacity:
+            # A request larger than the whole bucket could never be granted
+            tokens = min(tokens, self.tokens.capacity)
+        return _Ticket(session_id, priority, tokens, wake)
+
+    def _poll(self, ticket, deadline):
+        """Dispatch, then raise on an expired deadline; returns seconds to wait (0 = until notified)"""
+        # Caller holds self._cond
+        wait = self._dispatch()
+        if ticket.granted:
+            return 0.0
+        now = time.monotonic()
+        if deadline is not None and now >= deadline:
+            self._remove(ticket)
+            self.timed_out += 1
+            self._cond.notify_all()
+            raise QueueTimeoutError("timed out waiting for an LLM request slot")
+        if deadline is not None:
+            wait = min(wait, deadline - now) if wait else deadline - now
+        return wait
+
+    def _abandon(self, ticket):
+        """Give up on a ticket whose caller went away: release it if granted, else withdraw it"""
+        with self._cond:
+            if ticket.granted:
+                self.release(ticket)
+            else:
+                self._remove(ticket)
+                self._cond.notify_all()
+
+    def _dispatch(self):
+        """Grant as many queued tickets as capacity allows; return seconds until more may fit (0 = on release)"""
+        # Caller holds self._cond
+        while self.in_flight < self.max_concurrency:
+            ticket = self._peek()
+            if ticket is None:
+                return 0.0
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            wait = max(self.requests.wait_for(1), self.tokens.wait_for(ticket.tokens))
+            if wait:
+                return wait
+
+            self._pop(ticket)
+            if self.requests.rate:
+                self.requests.level -= 1
+            if self.tokens.rate:
+                self.tokens.level -= ticket.tokens
+            self.in_flight += 1
+            self.granted += 1
+            ticket.granted = True
+            if ticket.wake is not None:
+                ticket.wake()
+            self._waits[ticket.priority].append(now - ticket.enqueued)
+            self._cond.notify_all()
+        return 0.0
+
+    def _peek(self):
+        for priority in sorted(self._queues):
+            sessions = self._queues[priority]
+            if sessions:
+                return next(iter(sessions.values()))[0]
+        return None
+
+    def _pop(self, ticket):
+        sessions = self._queues[ticket.priority]
+        queue = sessions.pop(ticket.session_id)
+        queue.popleft()
+        if queue:
+            # Back of the line: other sessions at this priority go first
+            sessions[ticket.session_id] = queue
+
+    def _remove(self, ticket):
+        sessions = self._queues[ticket.priority]
+        queue = sessions.get(ticket.session_id)
+        if queue is not None and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del sessions[ticket.session_id]
+
+
+def estimate_tokens(request):
+    """Rough prompt + completion token estimate used to charge the token bucket"""
+    prompt_chars = sum(len(message.get("content", "")) for message in request.get("messages", []))
+    return prompt_chars // 4 + request.get("max_tokens", 0)
+
+
+# Process-wide scheduler that every upstream LLM request goes through
+scheduler = RequestScheduler()
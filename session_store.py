@@ -0,0 +1,187 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+# "sqlite" (default) keeps interviews across restarts; "memory" keeps them for the life of the process
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE", "sqlite")
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "interview_sessions.db")
+# Answer records each UI session keeps in memory; older ones are read back from the store when needed.
+# At least 1: the UI trims the history with [-n:] slices, where 0 would keep everything.
+SESSION_WORKING_SET = max(1, int(os.getenv("SESSION_WORKING_SET", "3")))
+
+# Fields kept for each answer; settings and progress live on the session row as free-form fields
+RECORD_FIELDS = ("question_number", "question", "topic", "answer", "score", "feedback", "word_count", "timestamp")
+
+
+class MemorySessionStore:
+    """Session store held in process memory; the interface every backend implements"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._records = {}
+
+    def create(self, session_id, **fields):
+        """Start (or restart) a session with its settings; drops any records it had"""
+        with self._lock:
+            self._sessions[session_id] = dict(fields, created=time.time(), updated=time.time())
+            self._records[session_id] = []
+
+    def update(self, session_id, **fields):
+        """Change progress fields such as question_count, current_question or status"""
+        with self._lock:
+            if session_id in self._sessions:
+                self._sessions[session_id].update(fields, updated=time.time())
+
+    def append(self, session_id, record):
+        """Add one answer record; returns its position in the session"""
+        with self._lock:
+            records = self._records.setdefault(session_id, [])
+            records.append({field: record.get(field) for field in RECORD_FIELDS})
+            return len(records) - 1
+
+    def set_evaluation(self, session_id, position, score, feedback):
+        with self._lock:
+            self._records[session_id][position].update(score=score, feedback=feedback)
+
+    def get(self, session_id):
+        """Session fields plus 'record_count', or None when the ID is unknown"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            return dict(session, record_count=len(self._records.get(session_id, [])))
+
+    def sessions(self, status=None, updated_after=0.0):
+        """(session_id, session fields) for sessions last changed after updated_after, oldest change first"""
+        with self._lock:
+            matches = [
+                (session_id, dict(session)) for session_id, session in self._sessions.items()
+                if session['updated'] > updated_after and (status is None or session.get('status') == status)
+            ]
+        return sorted(matches, key=lambda item: item[1]['updated'])
+
+    def records(self, session_id, offset=0, limit=None):
+        """Answer records in order, optionally only a slice of them"""
+        with self._lock:
+            records = self._records.get(session_id, [])
+            end = None if limit is None else offset + limit
+            return [dict(record) for record in records[offset:end]]
+
+
+class SQLiteSessionStore(MemorySessionStore):
+    """Session store in a SQLite file (WAL), so interviews survive restarts and worker recycling.
+
+    Each answer is one INSERT; the history is never rewritten.
+    """
+
+    def __init__(self, path=SESSION_STORE_PATH):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, fields TEXT NOT NULL, "
+            "created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answers (session_id TEXT NOT NULL, position INTEGER NOT NULL, "
+            "record TEXT NOT NULL, PRIMARY KEY (session_id, position))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated)")
+        self._db.commit()
+
+    def create(self, session_id, **fields):
+        now = time.time()
+        with self._lock:
+            self._db.execute("DELETE FROM answers WHERE session_id = ?", (session_id,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, fields, created, updated) VALUES (?, ?, ?, ?)",
+                (session_id, json.dumps(fields), now, now)
+            )
+            self._db.commit()
+
+    def update(self, session_id, **fields):
+        with self._lock:
+            row = self._db.execute("SELECT fields FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                return
+            merged = dict(json.loads(row[0]), **fields)
+            self._db.execute(
+                "UPDATE sessions SET fields = ?, updated = ? WHERE session_id = ?",
+                (json.dumps(merged), time.time(), session_id)
+            )
+            self._db.commit()
+
+    def append(self, session_id, record):
+        record = {field: record.get(field) for field in RECORD_FIELDS}
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO answers (session_id, position, record) "
+                "SELECT ?, COALESCE(MAX(position) + 1, 0), ? FROM answers WHERE session_id = ?",
+                (session_id, json.dumps(record), session_id)
+            )
+            position = self._db.execute("SELECT position FROM answers WHERE rowid = ?", (cursor.lastrowid,)).fetchone()[0]
+            self._db.commit()
+            return position
+
+    def set_evaluation(self, session_id, position, score, feedback):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT record FROM answers WHERE session_id = ? AND position = ?", (session_id, position)
+            ).fetchone()
+            if row is None:
+                return
+            record = dict(json.loads(row[0]), score=score, feedback=feedback)
+            self._db.execute(
+                "UPDATE answers SET record = ? WHERE session_id = ? AND position = ?",
+                (json.dumps(record), session_id, position)
+            )
+            self._db.commit()
+
+    def get(self, session_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fields, created, updated, "
+                "(SELECT COUNT(*) FROM answers WHERE answers.session_id = sessions.session_id) "
+                "FROM sessions WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(json.loads(row[0]), created=row[1], updated=row[2], record_count=row[3])
+
+    def sessions(self, status=None, updated_after=0.0):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT session_id, fields, created, updated FROM sessions WHERE updated > ? ORDER BY updated",
+                (updated_after,)
+            ).fetchall()
+        matches = []
+        for session_id, fields, created, updated in rows:
+            session = dict(json.loads(fields), created=created, updated=updated)
+            if status is None or session.get('status') == status:
+                matches.append((session_id, session))
+        return matches
+
+    def records(self, session_id, offset=0, limit=None):
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT record FROM answers WHERE session_id = ? AND position >= ? ORDER BY position LIMIT ?",
+                (session_id, offset, -1 if limit is None else limit)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+def open_session_store(backend=SESSION_STORE_BACKEND, path=SESSION_STORE_PATH):
+    if backend == "memory":
+        return MemorySessionStore()
+    if backend == "sqlite":
+        return SQLiteSessionStore(path)
+    raise ValueError(f"Unknown session store backend: {backend}")
+
+
+# Process-wide store shared by every UI session
+session_store = open_session_store()
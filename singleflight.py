@@ -0,0 +1,105 @@
+import json
+import asyncio
+import hashlib
+import threading
+
+
+def request_fingerprint(request):
+    """Key for identical requests: model, messages and sampling parameters"""
+    payload = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Merges concurrent identical calls so only the first one does the work.
+
+    Later callers with the same key wait for the in-flight call and receive its
+    result (or exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._async_calls = {}
+        self.leaders = 0
+        self.merged = 0
+
+    def do(self, key, fn):
+        """Run fn() once per key among concurrent callers; returns (result, merged)"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                call.waiters += 1
+                self.merged += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, coro_fn):
+        """Awaitable do() for coroutines on one event loop; returns (result, merged).
+
+        If the leading call is cancelled, its waiters do not inherit the
+        cancellation: the first of them to resume runs coro_fn() itself.
+        """
+        while True:
+            future = self._async_calls.get(key)
+            if future is None:
+                break
+            with self._lock:
+                self.merged += 1
+            try:
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this waiter was cancelled, not the leader
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_calls[key] = future
+        with self._lock:
+            self.leaders += 1
+        try:
+            result = await coro_fn()
+            future.set_result(result)
+            return result, False
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure does not log a warning
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._async_calls[key]
+
+    def stats(self):
+        with self._lock:
+            return {'leaders': self.leaders, 'merged': self.merged, 'in_flight': len(self._calls) + len(self._async_calls)}
@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# The modules under test live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the process-wide stores out of the working tree
+os.environ.setdefault("SESSION_STORE", "memory")
+os.environ.setdefault("QUESTION_BANK_PATH", os.path.join(tempfile.mkdtemp(prefix="interview-tests-"), "question_bank.db"))
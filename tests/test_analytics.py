@@ -0,0 +1,78 @@
+import pytest
+
+from analytics import AnalyticsStore
+from session_store import MemorySessionStore
+
+ROWS = [
+    {"role": "Software Engineer", "difficulty": "Easy", "interview_mode": "Technical", "topic": "SQL",
+     "question": "Q1", "score": 80, "word_count": 40, "timestamp": "2026-01-01T10:00:00"},
+    {"role": "Software Engineer", "difficulty": "Easy", "interview_mode": "Technical", "topic": "SQL",
+     "question": "Q2", "score": 60, "word_count": 30, "timestamp": "2026-01-02T10:00:00"},
+    {"role": "Software Engineer", "difficulty": "Hard", "interview_mode": "Technical", "topic": "Caching",
+     "question": "Q3", "score": 40, "word_count": 20, "timestamp": "2026-01-02T11:00:00"},
+    {"role": "Data Analyst", "difficulty": "Easy", "interview_mode": "Behavioral", "topic": None,
+     "question": "Q1", "score": 90, "word_count": 50, "timestamp": "2026-01-09T10:00:00"},
+    {"role": "Data Analyst", "difficulty": "Easy", "interview_mode": "Behavioral", "topic": "SQL",
+     "question": "Q4", "score": None, "word_count": 10, "timestamp": "2026-01-09T11:00:00"},
+]
+
+
+@pytest.fixture
+def store():
+    analytics = AnalyticsStore(path=None)
+    analytics.ingest(ROWS)
+    return analytics
+
+
+def test_ungraded_rows_are_skipped(store):
+    assert len(store) == 4
+    assert store.totals() == {'answers': 4, 'mean_score': 67.5}
+
+
+def test_averages_from_cell_rollups(store):
+    assert store.average_by("role") == [("Data Analyst", 90.0, 1), ("Software Engineer", 60.0, 3)]
+    assert store.average_by("topic", role="Software Engineer") == [("SQL", 70.0, 2), ("Caching", 40.0, 1)]
+    assert store.average_by("topic", role="Data Analyst") == [("Unspecified", 90.0, 1)]
+    assert store.average_by("question", limit=1, ascending=True) == [("Q3", 40.0, 1)]
+    assert store.totals(role="Unknown role") == {'answers': 0, 'mean_score': 0.0}
+
+
+def test_rollups_match_masked_scans(store):
+    # A topic filter is not a cell dimension, so this goes through the column scan
+    assert store.average_by("difficulty", topic="SQL") == [("Easy", 70.0, 2)]
+    assert store.totals(topic="SQL", role="Software Engineer") == store.totals(role="Software Engineer", difficulty="Easy")
+
+
+def test_distribution_and_trend(store):
+    distribution = dict(store.distribution(bin_width=10))
+    assert distribution[40] == 1 and distribution[60] == 1 and distribution[80] == 1 and distribution[90] == 1
+    assert sum(distribution.values()) == 4
+
+    assert store.trend(role="Software Engineer") == [("2026-01-01", 80.0, 1), ("2026-01-02", 50.0, 2)]
+    weekly = store.trend(period_days=7)
+    assert [count for _, _, count in weekly] == [3, 1]
+
+
+def test_save_and_load_keep_the_rollups(tmp_path, store):
+    path = str(tmp_path / "analytics.npz")
+    store.save(path)
+    loaded = AnalyticsStore(path=path)
+    assert loaded.average_by("topic") == store.average_by("topic")
+    assert loaded.trend() == store.trend()
+
+
+def test_refresh_ingests_each_completed_session_once():
+    sessions = MemorySessionStore()
+    sessions.create("a", role="Software Engineer", difficulty="Medium", interview_mode="Technical")
+    sessions.append("a", {"question": "Q1", "topic": "SQL", "score": 70, "timestamp": "2026-01-01T10:00:00"})
+    sessions.create("b", role="Software Engineer", difficulty="Medium", interview_mode="Technical")
+    sessions.append("b", {"question": "Q2", "score": 50, "timestamp": "2026-01-01T10:00:00"})
+    sessions.update("a", status="complete")
+
+    analytics = AnalyticsStore(path=None)
+    assert analytics.refresh(sessions) == 1
+    assert analytics.refresh(sessions) == 0
+
+    sessions.update("b", status="complete")
+    assert analytics.refresh(sessions) == 1
+    assert analytics.average_by("difficulty") == [("Medium", 60.0, 2)]
@@ -0,0 +1,186 @@
+import time
+import asyncio
+import threading
+import warnings
+
+import pytest
+
+import bot_engine
+from bot_engine import InterviewBot, AsyncInterviewBot
+from eval_cache import evaluation_cache
+from metrics import MetricsRegistry
+from model_router import model_router
+from fake_llm import FakeChatClient, FakeAsyncChatClient
+
+ANSWER = (
+    "I would profile the slow endpoint first, then add an index on the columns used by the join, "
+    "because the query plan showed a sequential scan over {n} million rows. After deploying, latency "
+    "dropped from 800ms to 90ms, and I added a regression test and a dashboard alert for it."
+)
+
+
+@pytest.fixture
+def calls():
+    """Metrics events recorded while the test runs"""
+    events = []
+    InterviewBot.metrics.add_hook(events.append)
+    yield events
+    InterviewBot.metrics.remove_hook(events.append)
+
+
+def _async_bot():
+    bot = AsyncInterviewBot(
+        FakeChatClient(latency_ms=0, jitter_ms=0, seed=1), FakeAsyncChatClient(latency_ms=0, jitter_ms=0, seed=1)
+    )
+    bot.setup("Software Engineer", "General", "Technical", "Medium")
+    bot.incremental_summary = False
+    return bot
+
+
+def _run(coro):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        return asyncio.run(coro)
+
+
+def test_async_bot_streams_an_evaluation(calls):
+    bot = _async_bot()
+
+    async def scenario():
+        return [event async for event in bot.stream_evaluation("How would you fix a slow query?", ANSWER.format(n=11))]
+
+    events = _run(scenario())
+    kinds = [kind for kind, _ in events]
+    assert kinds[0] == "score" and kinds[-1] == "result"
+    assert "feedback" in kinds
+    assert events[-1][1]['score'] == events[0][1]
+    evaluation = [event for event in calls if event['call'] == "evaluation"][-1]
+    assert not evaluation['fallback']
+    assert evaluation['ttft'] is not None
+
+
+def test_async_bot_streams_a_summary(calls):
+    bot = _async_bot()
+    history = [{'question': "How would you fix a slow query?", 'answer': ANSWER.format(n=12), 'score': 70,
+                'feedback': "Good."}]
+
+    async def scenario():
+        return "".join([chunk async for chunk in bot.stream_summary(history)])
+
+    summary = _run(scenario())
+    assert "FINAL PERFORMANCE SUMMARY" in summary
+    assert not [event for event in calls if event['call'] == "summary"][-1]['fallback']
+
+
+def test_async_bot_evaluates_answers_in_batches(calls):
+    bot = _async_bot()
+    pairs = [(f"Question {i}: how would you fix a slow query?", ANSWER.format(n=20 + i)) for i in range(3)]
+
+    results = _run(bot.evaluate_answers(pairs, batch_size=2))
+    assert all(isinstance(result, dict) and 0 <= result['score'] <= 100 for result in results)
+    # One batched request for the first two pairs; the last pair is graded on its own
+    assert [event['call'] for event in calls].count("batch_evaluation") == 1
+    assert not any(event['fallback'] for event in calls)
+
+
+def test_async_bot_regrades_single_answers_without_a_batch():
+    bot = _async_bot()
+    [result] = _run(bot.evaluate_answers([("How would you fix a slow query?", ANSWER.format(n=30))]))
+    assert isinstance(result, dict) and 'feedback' in result
+
+
+def _sync_bot():
+    bot = InterviewBot(FakeChatClient(latency_ms=0, jitter_ms=0, seed=2))
+    bot.setup("Software Engineer", "General", "Technical", "Medium")
+    bot.incremental_summary = False
+    return bot
+
+
+@pytest.fixture
+def always_uncertain(monkeypatch):
+    monkeypatch.setattr(model_router, "uncertain_band", (0, 100))
+    monkeypatch.setattr(model_router, "escalation", True)
+
+
+def test_escalated_evaluation_is_cached_under_the_large_model(always_uncertain):
+    bot = _sync_bot()
+    question, answer = "How would you fix a slow query?", ANSWER.format(n=40)
+
+    evaluation = bot.evaluate_answer(question, answer)
+    small, large = model_router.models["small"], model_router.models["large"]
+    assert evaluation_cache.get(bot._evaluation_cache_key(question, answer, small)) is None
+    assert evaluation_cache.get(bot._evaluation_cache_key(question, answer, large)) == evaluation
+    # The escalated grade is reused instead of grading on the small model again
+    assert bot.evaluate_answer(question, answer) == evaluation
+
+
+def test_escalated_call_is_reported_on_its_escalated_route(always_uncertain):
+    bot = _sync_bot()
+    bot.metrics = MetricsRegistry()
+    question, answer = "How would you size a connection pool?", ANSWER.format(n=41)
+    routed = model_router.route("evaluation", difficulty=bot.difficulty, answer=answer).name
+    escalated = model_router.escalated_route(routed)
+
+    bot.evaluate_answer(question, answer)
+    routes = bot.metrics.route_snapshot()
+    assert routes[escalated]['calls'] == 1
+    assert routes[escalated]['cost'] > 0
+    assert routes[routed]['calls'] == 0
+    assert routes[routed]['escalations'] == 1
+    assert routes[routed]['escalation_rate'] == 1.0
+    assert bot.metrics.snapshot()['evaluation']['escalations'] == 1
+    assert f'interview_llm_route_escalations_total{{route="{routed}"}} 1' in bot.metrics.render_prometheus()
+
+
+def test_queued_prefetch_is_generated_inline():
+    bot = _sync_bot()
+    busy = threading.Event()
+    blockers = [bot_engine._prefetch_executor.submit(busy.wait, 5) for _ in range(bot_engine.PREFETCH_WORKERS)]
+    try:
+        bot.prefetch_questions(1)
+        future = bot._prefetched[2]
+        started = time.monotonic()
+        question = bot.generate_question(2)
+        assert time.monotonic() - started < 2
+        assert future.cancelled()
+        assert bot.questions_asked == [question]
+    finally:
+        busy.set()
+        for blocker in blockers:
+            blocker.result()
+
+
+def test_running_prefetch_is_awaited():
+    bot = _sync_bot()
+    bot.prefetch_questions(1)
+    future = bot._prefetched[2]
+    deadline = time.monotonic() + 2
+    while not (future.running() or future.done()) and time.monotonic() < deadline:
+        time.sleep(0.001)
+    question = bot.generate_question(2)
+    assert future.done() and not future.cancelled()
+    assert question == future.result()
+    assert bot.questions_asked == [question]
+
+
+def test_failed_digest_update_does_not_stop_later_ones(monkeypatch):
+    bot = _sync_bot()
+    bot.incremental_summary = True
+    folded = []
+
+    def digest_records(digest, records, first_number, priority):
+        if first_number == 2:
+            raise RuntimeError("digest update failed")
+        folded.append(first_number)
+        return "\n".join(filter(None, [digest, f"digest Q{first_number}"]))
+
+    monkeypatch.setattr(bot, "_digest_records", digest_records)
+    for number in range(1, 4):
+        bot._extend_digest(f"Question {number}", f"Answer {number}", {'score': 60, 'feedback': f"Feedback {number}"})
+    bot._digest_update.result(timeout=5)
+
+    assert folded == [1, 3]
+    assert len(bot._digest_keys) == 3
+    assert "digest Q3" in bot._digest
+    # The failed update still left a local line, so the digest covers every record
+    assert "Q2 (60/100): Feedback 2" in bot._digest
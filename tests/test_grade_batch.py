@@ -0,0 +1,67 @@
+import json
+import argparse
+
+import pytest
+
+import grade_batch
+from bot_engine import InterviewBot
+from fake_llm import FakeChatClient
+
+ANSWER = (
+    "I would profile the slow endpoint, add an index on the joined columns because the plan showed a "
+    "sequential scan, and confirm the fix with a regression test and a latency dashboard ({n})."
+)
+
+
+def _args(tmp_path, batch_size):
+    records = tmp_path / "answers.jsonl"
+    records.write_text("".join(
+        json.dumps({"id": str(i), "question": f"Question {i}: how would you fix a slow query?", "answer": ANSWER.format(n=f"{batch_size}-{i}")}) + "\n"
+        for i in range(3)
+    ))
+    return argparse.Namespace(
+        input=str(records), output=str(tmp_path / "graded.jsonl"), workers=1, rate=0, batch_size=batch_size,
+        role="Software Engineer", mode="Technical", difficulty="Medium", domain="General", progress=0
+    )
+
+
+def _bot_factory(client):
+    def make():
+        bot = InterviewBot(client)
+        bot.client = client
+        return bot
+    return make
+
+
+@pytest.mark.parametrize("batch_size", [1, 3])
+def test_fallback_grades_are_not_written_and_are_retried(tmp_path, monkeypatch, batch_size):
+    args = _args(tmp_path, batch_size)
+
+    # No client: every evaluation falls back to the local scorer
+    monkeypatch.setattr(grade_batch, "InterviewBot", _bot_factory(None))
+    grade_batch.run(args)
+    assert grade_batch.completed_ids(args.output) == set()
+
+    monkeypatch.setattr(grade_batch, "InterviewBot", _bot_factory(FakeChatClient(latency_ms=0, jitter_ms=0, seed=1)))
+    grade_batch.run(args)
+    assert grade_batch.completed_ids(args.output) == {"0", "1", "2"}
+
+
+def test_rate_limit_counts_every_upstream_request(tmp_path, monkeypatch):
+    import llm_client
+    from scheduler import RequestScheduler
+
+    shared = RequestScheduler()
+    monkeypatch.setattr(llm_client, "scheduler", shared)
+    monkeypatch.setattr(grade_batch, "scheduler", shared)
+    client = FakeChatClient(latency_ms=0, jitter_ms=0, seed=2)
+    # Malformed grades make the bot re-ask, so a record can take more than one request
+    client.responder.malformed_rate = 0.5
+    monkeypatch.setattr(grade_batch, "InterviewBot", _bot_factory(client))
+
+    args = _args(tmp_path, 1)
+    args.rate = 1000
+    grade_batch.run(args)
+
+    assert shared.requests.rate == 1000
+    assert shared.granted == client.calls
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+import llm_client
+from fake_llm import FakeAsyncChatClient
+from scheduler import scheduler
+
+REQUEST = {"model": "test-model", "messages": [{"role": "user", "content": "Hello"}], "max_tokens": 10}
+
+
+def test_cancelled_async_call_releases_its_scheduler_slot():
+    client = FakeAsyncChatClient(latency_ms=2000, jitter_ms=0)
+
+    async def scenario():
+        task = asyncio.ensure_future(llm_client.async_chat_completion(client, dedupe=False, **REQUEST))
+        await asyncio.sleep(0.05)
+        assert scheduler.in_flight == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert scheduler.in_flight == 0
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class _FailingClient:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.chat = self
+        self.completions = self
+
+    def create(self, **request):
+        raise _StatusError(self.status_code)
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    fresh = llm_client.CircuitBreaker(failure_threshold=2, cooldown=60)
+    monkeypatch.setattr(llm_client, "breaker", fresh)
+    monkeypatch.setattr(llm_client, "MAX_RETRIES", 0)
+    return fresh
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 404, 422])
+def test_client_errors_do_not_trip_the_breaker(breaker, status_code):
+    for _ in range(5):
+        with pytest.raises(_StatusError):
+            llm_client.chat_completion(_FailingClient(status_code), dedupe=False, **REQUEST)
+    assert breaker.state == "closed"
+    assert breaker.consecutive_failures == 0
+
+
+@pytest.mark.parametrize("status_code", [429, 500, 503])
+def test_upstream_errors_trip_the_breaker(breaker, status_code):
+    for _ in range(2):
+        with pytest.raises(_StatusError):
+            llm_client.chat_completion(_FailingClient(status_code), dedupe=False, **REQUEST)
+    assert breaker.state == "open"
+    with pytest.raises(llm_client.CircuitOpenError):
+        llm_client.chat_completion(_FailingClient(status_code), dedupe=False, **REQUEST)
+
+
+def test_record_path_captures_responses_for_replay(tmp_path, monkeypatch):
+    from fake_llm import FakeChatClient
+
+    path = str(tmp_path / "recordings.jsonl")
+    monkeypatch.setattr(llm_client, "LLM_RECORD_PATH", path)
+    monkeypatch.setattr(llm_client, "_shared_client", None)
+    monkeypatch.setenv("GROQ_API_KEY", "test-key")
+    # Stands in for the real API client the recorder wraps
+    monkeypatch.setattr(llm_client, "Groq", lambda **kwargs: FakeChatClient(latency_ms=0, jitter_ms=0, seed=3))
+
+    request = {"model": "test-model", "messages": [{"role": "user", "content": "Ask me a question"}]}
+    recorded = llm_client.chat_completion(llm_client.get_shared_client(), **request)
+
+    replay = FakeChatClient(latency_ms=0, jitter_ms=0, replay_path=path)
+    replayed = llm_client.chat_completion(replay, **request)
+    assert replay.replayed == 1
+    assert replayed.choices[0].message.content == recorded.choices[0].message.content
@@ -0,0 +1,57 @@
+import pytest
+
+import bot_engine
+from bot_engine import InterviewBot, local_scorer
+from fake_llm import FakeChatClient
+
+QUESTION = "What does ACID mean for database transactions?"
+SHORT_CORRECT = "Atomicity, consistency, isolation, durability."
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    monkeypatch.setattr(bot_engine, "LOCAL_PRESCREEN", True)
+    bot = InterviewBot(FakeChatClient(latency_ms=0, jitter_ms=0, seed=3))
+    bot.setup("Software Engineer", "General", "Technical", "Medium")
+    bot.incremental_summary = False
+    return bot
+
+
+@pytest.fixture
+def calls():
+    events = []
+    InterviewBot.metrics.add_hook(events.append)
+    yield events
+    InterviewBot.metrics.remove_hook(events.append)
+
+
+def test_substantive_answer_outscores_filler():
+    strong = (
+        "A transaction is atomic, so a failed transfer rolls back both updates. Isolation levels trade "
+        "consistency for throughput; we used row locks and an index on the account key, and tested it under load."
+    )
+    filler = "Well, um, basically it is like a thing that you know, sort of works, pretty much, okay."
+    strong_score = local_scorer.score(QUESTION, strong, "Software Engineer", "Technical")['score']
+    filler_score = local_scorer.score(QUESTION, filler, "Software Engineer", "Technical")['score']
+    assert 0 <= filler_score < strong_score <= 100
+
+
+def test_short_correct_answer_is_not_prescreened(bot, calls):
+    evaluation = bot.evaluate_answer(QUESTION, SHORT_CORRECT)
+    event = [event for event in calls if event['call'] == "evaluation"][-1]
+    assert not event['prescreened']
+    assert not event['fallback']
+    assert 'fallback' not in evaluation
+
+
+@pytest.mark.parametrize("answer", ["", "   ", "Um, well, you know."])
+def test_empty_answer_is_prescreened(bot, calls, answer):
+    evaluation = bot.evaluate_answer(QUESTION, answer)
+    assert [event for event in calls if event['call'] == "evaluation"][-1]['prescreened']
+    assert evaluation['score'] <= 20
+
+
+def test_batch_prescreens_only_empty_answers(bot, calls):
+    results = bot.evaluate_answers([(QUESTION, ""), (QUESTION, SHORT_CORRECT + " Each one matters.")])
+    assert len(results) == 2
+    assert sum(event['prescreened'] for event in calls) == 1
@@ -0,0 +1,49 @@
+import prompts
+from prompts import registry, PromptConfig
+
+CONFIG = PromptConfig("Software Engineer", None, "Technical", "Medium", ("System Design", "Database Design and SQL"))
+OTHER_CONFIG = PromptConfig("Data Analyst", "Finance", "Behavioral", "Hard", ("Stakeholder communication",))
+
+
+def test_version_selection(monkeypatch):
+    monkeypatch.setattr(prompts, "DEFAULT_PROMPT_VERSION", 2)
+    monkeypatch.delenv("PROMPT_VERSION_EVALUATION", raising=False)
+    assert registry.get("evaluation").version == 2
+    assert registry.get("evaluation", 1).version == 1
+
+    monkeypatch.setenv("PROMPT_VERSION_EVALUATION", "1")
+    assert registry.get("evaluation").version == 1
+    # Other templates keep the default
+    assert registry.get("question").version == 2
+
+    # An unknown version falls back to the latest one
+    assert registry.get("evaluation", 99).version == max(registry.versions("evaluation"))
+
+
+def test_v2_system_message_is_static():
+    template = registry.get("evaluation", 2)
+    first = template.render(CONFIG, question="How would you index a table?", answer="Add a B-tree index.")
+    second = template.render(OTHER_CONFIG, question="Tell me about a conflict.", answer="We talked it through.")
+    assert first[0] == second[0]
+    assert "Software Engineer" not in first[0]["content"]
+
+
+def test_v2_user_message_starts_with_the_per_config_prefix():
+    template = registry.get("question", 2)
+    first = template.user_content(CONFIG, question_number=1, previous_questions=[])
+    second = template.user_content(CONFIG, question_number=2, previous_questions=["How would you index a table?"])
+
+    prefix = template.prefix(CONFIG)
+    assert prefix and first.startswith(prefix) and second.startswith(prefix)
+    # Per-call values only appear after the shared prefix
+    assert "Question #" not in prefix
+    assert template.prefix(CONFIG) is prefix
+    assert template.prefix(OTHER_CONFIG) != prefix
+
+
+def test_every_template_renders_its_sample_values():
+    for name in registry.names():
+        for version in registry.versions(name):
+            messages = registry.get(name, version).render(prompts._SAMPLE_CONFIG, **prompts._SAMPLE_VALUES[name])
+            assert [message["role"] for message in messages] == ["system", "user"]
+            assert all(message["content"] for message in messages)
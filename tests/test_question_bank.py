@@ -0,0 +1,50 @@
+import pytest
+
+from question_bank import QuestionBank, QuestionSampler, ANY_DIFFICULTY
+
+KEY = ("Software Engineer", "Technical", "Medium", "Databases")
+
+
+@pytest.fixture
+def bank(tmp_path):
+    bank = QuestionBank(str(tmp_path / "bank.db"))
+    bank.add_many([(*KEY, f"Medium question {i}", "test") for i in range(10)])
+    bank.add_many([(*KEY[:2], ANY_DIFFICULTY, KEY[3], f"Any-level question {i}", "test") for i in range(3)])
+    return bank
+
+
+def test_duplicates_are_not_stored_twice(bank):
+    assert not bank.add(*KEY, "Medium question 0")
+    assert bank.size(*KEY) == 10
+    assert sorted(bank.get(*KEY, slot) for slot in range(10)) == sorted(f"Medium question {i}" for i in range(10))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sampler_does_not_repeat_within_a_session(bank, seed):
+    sampler = QuestionSampler(bank, seed=seed)
+    drawn = [sampler.draw(*KEY) for _ in range(13)]
+    assert None not in drawn
+    assert len(set(drawn)) == 13
+    assert sum(question.startswith("Any-level") for question in drawn) == 3
+    # With every question already asked, nothing is left to draw
+    assert sampler.draw(*KEY, exclude=set(drawn)) is None
+
+
+def test_sessions_draw_independently(bank):
+    first, second = QuestionSampler(bank, seed=1), QuestionSampler(bank, seed=2)
+    assert len({first.draw(*KEY) for _ in range(13)}) == 13
+    assert len({second.draw(*KEY) for _ in range(13)}) == 13
+
+
+def test_sampler_skips_excluded_and_sees_new_questions(bank):
+    sampler = QuestionSampler(bank, seed=3)
+    excluded = {f"Medium question {i}" for i in range(10)}
+    drawn = {sampler.draw(*KEY, exclude=excluded) for _ in range(3)}
+    assert drawn == {f"Any-level question {i}" for i in range(3)}
+
+    bank.add(*KEY, "Freshly generated question")
+    assert sampler.draw(*KEY, exclude=excluded | drawn) == "Freshly generated question"
+
+
+def test_empty_bucket_draws_nothing(bank):
+    assert QuestionSampler(bank).draw("Software Engineer", "Technical", "Hard", "Unknown topic") is None
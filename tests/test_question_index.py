@@ -0,0 +1,45 @@
+from question_index import QuestionIndex, similarity
+
+QUESTION = "How would you design a rate limiter for a public REST API?"
+REWORDED = "How would you design a rate limiter for a public API?"
+DISTINCT = [
+    "Explain how database indexes speed up reads and slow down writes.",
+    "Describe a time you resolved a disagreement with a teammate.",
+    "What happens when a hash map needs to resize?",
+]
+
+
+def test_near_duplicates_are_found():
+    index = QuestionIndex([QUESTION])
+    assert REWORDED in index
+    match = index.find(REWORDED)
+    assert match[0] == QUESTION and match[1] >= index.threshold
+
+
+def test_distinct_questions_are_accepted():
+    index = QuestionIndex([QUESTION])
+    for question in DISTINCT:
+        assert question not in index
+        index.add(question)
+    assert len(index) == 4
+    assert all(similarity(QUESTION, question) < index.threshold for question in DISTINCT)
+
+
+def test_questions_without_content_words_never_match():
+    index = QuestionIndex(["What is it?"])
+    assert "What is it?" not in index
+    assert similarity("What is it?", "What is it?") == 0.0
+
+
+def test_bounded_index_forgets_the_oldest_question():
+    index = QuestionIndex([QUESTION, *DISTINCT], max_size=3)
+    assert len(index) == 3
+    assert REWORDED not in index
+    assert DISTINCT[-1] in index
+
+
+def test_diverse_prefers_different_questions():
+    index = QuestionIndex([QUESTION, REWORDED, DISTINCT[0]])
+    picked = index.diverse(2)
+    assert DISTINCT[0] in picked
+    assert len(picked) == 2
@@ -0,0 +1,42 @@
+import time
+
+from question_pool import QuestionPool
+
+QUESTIONS = [
+    "How would you design a rate limiter for a public API?",
+    "Describe a time you resolved a disagreement with a teammate.",
+    "Explain how database indexes speed up reads and slow down writes."
+]
+
+
+def _filled_pool():
+    pending = list(QUESTIONS)
+    pool = QuestionPool(lambda key, recent: pending.pop(0), target_depth=len(QUESTIONS), workers=1)
+    pool.request_refill("key")
+    deadline = time.monotonic() + 2
+    while pool.stats()['ready'] < len(QUESTIONS) and time.monotonic() < deadline:
+        time.sleep(0.005)
+    # No further refills, so takes only see the questions above
+    pool.target_depth = 0
+    return pool
+
+
+def test_take_returns_questions_oldest_first():
+    pool = _filled_pool()
+    assert [pool.take("key") for _ in QUESTIONS] == QUESTIONS
+
+
+def test_excluded_questions_stay_in_the_pool():
+    pool = _filled_pool()
+    assert pool.take("key", exclude={QUESTIONS[0]}) == QUESTIONS[1]
+    assert pool.stats()['ready'] == 2
+    # Another session that has not seen the first question still gets it
+    assert pool.take("key") == QUESTIONS[0]
+    assert pool.take("key", exclude={QUESTIONS[2]}) is None
+    assert pool.stats()['misses'] == 1
+
+
+def test_shared_pool_holds_every_catalog_key():
+    import bot_engine
+    assert bot_engine.question_pool.max_keys >= bot_engine._pool_catalog_keys()
+    assert bot_engine._pool_catalog_keys() > 256
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+
+import pytest
+
+from scheduler import RequestScheduler, QueueTimeoutError, PRIORITY_BACKGROUND
+
+
+def test_acquire_and_release_balance_in_flight():
+    scheduler = RequestScheduler(max_concurrency=2)
+    first = scheduler.acquire("a")
+    second = scheduler.acquire("b", PRIORITY_BACKGROUND)
+    assert scheduler.in_flight == 2
+    scheduler.release(first)
+    scheduler.release(second)
+    assert scheduler.stats()['in_flight'] == 0
+    assert scheduler.granted == 2
+
+
+def test_release_in_finally_after_a_failed_request():
+    scheduler = RequestScheduler(max_concurrency=1)
+    with pytest.raises(RuntimeError):
+        ticket = scheduler.acquire("a")
+        try:
+            raise RuntimeError("upstream failed")
+        finally:
+            scheduler.release(ticket)
+    assert scheduler.in_flight == 0
+    scheduler.release(scheduler.acquire("a", timeout=0.1))
+
+
+def test_queue_timeout_withdraws_the_ticket():
+    scheduler = RequestScheduler(max_concurrency=1)
+    held = scheduler.acquire("a")
+    with pytest.raises(QueueTimeoutError):
+        scheduler.acquire("b", timeout=0.05)
+    stats = scheduler.stats()
+    assert stats['in_flight'] == 1
+    assert stats['interactive_queue_depth'] == 0
+    assert stats['timed_out'] == 1
+    scheduler.release(held)
+    assert scheduler.in_flight == 0
+
+
+def test_release_wakes_a_blocked_thread():
+    scheduler = RequestScheduler(max_concurrency=1)
+    held = scheduler.acquire("a")
+    tickets = []
+    waiter = threading.Thread(target=lambda: tickets.append(scheduler.acquire("b", timeout=2)))
+    waiter.start()
+    scheduler.release(held)
+    waiter.join(2)
+    assert len(tickets) == 1
+    scheduler.release(tickets[0])
+    assert scheduler.in_flight == 0
+
+
+def test_acquire_async_is_granted_on_release():
+    scheduler = RequestScheduler(max_concurrency=1)
+
+    async def scenario():
+        held = scheduler.acquire("a")
+        waiter = asyncio.ensure_future(scheduler.acquire_async("b", timeout=2))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        scheduler.release(held)
+        scheduler.release(await asyncio.wait_for(waiter, 1))
+
+    asyncio.run(scenario())
+    assert scheduler.in_flight == 0
+
+
+def test_cancelled_acquire_async_withdraws_queued_ticket():
+    scheduler = RequestScheduler(max_concurrency=1)
+
+    async def scenario():
+        held = scheduler.acquire("a")
+        waiter = asyncio.ensure_future(scheduler.acquire_async("b"))
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()['interactive_queue_depth'] == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.stats()['interactive_queue_depth'] == 0
+        scheduler.release(held)
+
+    asyncio.run(scenario())
+    assert scheduler.in_flight == 0
+    assert scheduler.granted == 1
+
+
+def test_cancelled_acquire_async_releases_a_ticket_granted_meanwhile():
+    scheduler = RequestScheduler(max_concurrency=1)
+
+    async def scenario():
+        held = scheduler.acquire("a")
+        waiter = asyncio.ensure_future(scheduler.acquire_async("b"))
+        await asyncio.sleep(0.01)
+        # The release grants the waiter's ticket before the waiter gets to run
+        scheduler.release(held)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(scenario())
+    assert scheduler.granted == 2
+    assert scheduler.in_flight == 0
+
+
+def test_acquire_async_times_out():
+    scheduler = RequestScheduler(max_concurrency=1)
+
+    async def scenario():
+        held = scheduler.acquire("a")
+        with pytest.raises(QueueTimeoutError):
+            await scheduler.acquire_async("b", timeout=0.05)
+        scheduler.release(held)
+
+    asyncio.run(scenario())
+    assert scheduler.stats()['interactive_queue_depth'] == 0
+    assert scheduler.in_flight == 0
@@ -0,0 +1,74 @@
+import importlib
+
+import pytest
+
+import session_store
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+SETTINGS = {
+    "role": "Software Engineer", "domain": "General", "interview_mode": "Technical", "difficulty": "Medium",
+    "total_questions": 3, "defer_grading": True, "question_count": 0, "current_question": None, "status": "active"
+}
+
+
+def _record(number, score=None):
+    return {
+        "question_number": number, "question": f"Question {number}", "topic": "System Design",
+        "answer": f"Answer {number}", "score": score, "feedback": "", "word_count": 2,
+        "timestamp": "2024-01-01T00:00:00", "ignored": "not a record field"
+    }
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemorySessionStore()
+    return SQLiteSessionStore(str(tmp_path / "sessions.db"))
+
+
+def test_session_round_trip(store):
+    store.create("s1", **SETTINGS)
+    assert [store.append("s1", _record(number)) for number in (1, 2, 3)] == [0, 1, 2]
+    store.set_evaluation("s1", 1, 72, "Solid answer.")
+    store.update("s1", question_count=3, current_question="Question 3")
+
+    session = store.get("s1")
+    assert session['record_count'] == 3
+    assert session['question_count'] == 3 and session['role'] == "Software Engineer"
+    records = store.records("s1")
+    assert [record['question_number'] for record in records] == [1, 2, 3]
+    assert records[1]['score'] == 72 and records[1]['feedback'] == "Solid answer."
+    assert "ignored" not in records[0]
+    assert store.records("s1", offset=1, limit=1) == [records[1]]
+    assert [session_id for session_id, _ in store.sessions(status="active")] == ["s1"]
+    assert store.get("unknown") is None
+
+
+def test_sqlite_sessions_survive_a_restart(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    first = SQLiteSessionStore(path)
+    first.create("s1", **SETTINGS)
+    first.append("s1", _record(1, score=64))
+    first.update("s1", status="complete")
+
+    resumed = SQLiteSessionStore(path)
+    assert resumed.get("s1")['status'] == "complete"
+    assert resumed.records("s1") == first.records("s1")
+    assert resumed.append("s1", _record(2)) == 1
+
+
+def test_create_restarts_a_session(store):
+    store.create("s1", **SETTINGS)
+    store.append("s1", _record(1))
+    store.create("s1", **SETTINGS)
+    assert store.records("s1") == []
+
+
+@pytest.mark.parametrize("value, expected", [("0", 1), ("-2", 1), ("5", 5)])
+def test_working_set_is_at_least_one(monkeypatch, value, expected):
+    monkeypatch.setenv("SESSION_WORKING_SET", value)
+    try:
+        assert importlib.reload(session_store).SESSION_WORKING_SET == expected
+    finally:
+        monkeypatch.undo()
+        importlib.reload(session_store)
@@ -0,0 +1,100 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_leader_failure_reaches_waiting_threads():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(2)
+        raise ValueError("upstream failed")
+
+    def follower():
+        try:
+            flight.do("key", lambda: "unused")
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=lambda: pytest.raises(ValueError, flight.do, "key", failing))
+    leader.start()
+    started.wait(2)
+    waiter = threading.Thread(target=follower)
+    waiter.start()
+    while flight.merged == 0:
+        time.sleep(0.001)
+    release.set()
+    leader.join(2)
+    waiter.join(2)
+    assert len(errors) == 1
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_async_leader_failure_reaches_waiters():
+    flight = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    async def scenario():
+        return await asyncio.gather(
+            flight.do_async("key", failing), flight.do_async("key", failing), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.leaders == 1 and flight.merged == 1
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_cancelled_async_leader_does_not_strand_waiters():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do_async("key", work))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(flight.do_async("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.wait_for(follower, 1)
+
+    assert asyncio.run(scenario()) == ("answer", False)
+    assert len(runs) == 2
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_cancelled_async_waiter_leaves_the_leader_running():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "answer"
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do_async("key", work))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(flight.do_async("key", work))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(scenario()) == ("answer", False)
+    assert flight.stats()['in_flight'] == 0
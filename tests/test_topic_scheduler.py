@@ -0,0 +1,53 @@
+from collections import Counter
+
+import pytest
+
+from bot_engine import InterviewBot, DOMAIN_TOPICS
+from topic_scheduler import TopicScheduler
+
+TOPICS = ("Arrays", "Caching", "Concurrency", "Databases")
+
+
+@pytest.mark.parametrize("strategy", ["weakest", "round_robin"])
+def test_first_questions_cover_every_topic(strategy):
+    scheduler = TopicScheduler(TOPICS, strategy=strategy, seed=1)
+    assert [scheduler.topic_for(n) for n in range(1, len(TOPICS) + 1)] == list(TOPICS)
+
+
+@pytest.mark.parametrize("role", sorted(DOMAIN_TOPICS))
+@pytest.mark.parametrize("mode", ["Technical", "Behavioral"])
+def test_interview_covers_the_roles_topics(role, mode):
+    bot = InterviewBot(client=None)
+    bot.setup(role, "General", mode, "Medium")
+    topics = DOMAIN_TOPICS[role]["technical" if mode == "Technical" else "behavioral"]
+    assert {bot._scheduled_topic(n) for n in range(1, len(topics) + 1)} == set(topics)
+
+
+def test_round_robin_keeps_cycling():
+    scheduler = TopicScheduler(TOPICS, strategy="round_robin")
+    assert [scheduler.topic_for(n) for n in range(1, 11)] == list(TOPICS) * 2 + list(TOPICS[:2])
+
+
+def test_weakest_favours_low_scoring_topics():
+    scheduler = TopicScheduler(TOPICS, strategy="weakest", seed=7)
+    for number, topic in enumerate(TOPICS, 1):
+        scheduler.topic_for(number)
+        scheduler.record(topic, 10 if topic == "Concurrency" else 95)
+
+    later = Counter(scheduler.topic_for(n) for n in range(len(TOPICS) + 1, len(TOPICS) + 41))
+    assert later.most_common(1)[0][0] == "Concurrency"
+
+
+def test_assigned_topics_are_stable():
+    scheduler = TopicScheduler(TOPICS, strategy="weakest", seed=3)
+    first = [scheduler.topic_for(n) for n in range(1, 12)]
+    assert [scheduler.topic_for(n) for n in range(1, 12)] == first
+
+    scheduler.assign(20, "Databases")
+    assert scheduler.topic_for(20) == "Databases"
+    assert scheduler.coverage()["Databases"][0] == first.count("Databases") + 1
+
+
+def test_off_disables_scheduling():
+    assert not TopicScheduler(TOPICS, strategy="off").enabled
+    assert not TopicScheduler(()).enabled
@@ -0,0 +1,74 @@
+import os
+import random
+import threading
+
+# "weakest" favours topics the candidate scored low on once every topic has been asked,
+# "round_robin" cycles through the topics in order, "off" lets the model pick from the topic list
+TOPIC_SCHEDULE = os.getenv("TOPIC_SCHEDULE", "weakest")
+
+
+class TopicScheduler:
+    """Assigns each question of one interview a topic from the role's full topic list.
+
+    Questions 1..len(topics) cover every topic once, in order. After that,
+    round-robin keeps cycling, while "weakest" draws topics with weight
+    (101 - mean score) / (1 + times asked), so weak and rarely asked topics
+    come up more often. A question number keeps its topic once assigned, so
+    prefetched and re-requested questions agree.
+    """
+
+    def __init__(self, topics, strategy=TOPIC_SCHEDULE, seed=None):
+        self.topics = tuple(topics)
+        self.strategy = strategy
+        self.random = random.Random(seed)
+        self._assigned = {}
+        self._scores = {topic: [] for topic in self.topics}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.strategy != "off" and bool(self.topics)
+
+    def topic_for(self, question_number):
+        with self._lock:
+            topic = self._assigned.get(question_number)
+            if topic is None:
+                topic = self._assigned[question_number] = self._choose(question_number)
+            return topic
+
+    def assign(self, question_number, topic):
+        """Pin a question number to a topic (e.g. when resuming an interview)"""
+        with self._lock:
+            self._assigned[question_number] = topic
+
+    def record(self, topic, score):
+        with self._lock:
+            if topic in self._scores and score is not None:
+                self._scores[topic].append(score)
+
+    def coverage(self):
+        """{topic: (times assigned, mean score or None)}"""
+        with self._lock:
+            counts = {topic: 0 for topic in self.topics}
+            for topic in self._assigned.values():
+                if topic in counts:
+                    counts[topic] += 1
+            return {
+                topic: (counts[topic], sum(scores) / len(scores) if scores else None)
+                for topic, scores in self._scores.items()
+            }
+
+    def _choose(self, question_number):
+        # Caller holds self._lock
+        if self.strategy != "weakest" or question_number <= len(self.topics):
+            return self.topics[(question_number - 1) % len(self.topics)]
+        asked = {topic: 0 for topic in self.topics}
+        for topic in self._assigned.values():
+            if topic in asked:
+                asked[topic] += 1
+        weights = []
+        for topic in self.topics:
+            scores = self._scores[topic]
+            mean = sum(scores) / len(scores) if scores else 50
+            weights.append((101 - mean) / (1 + asked[topic]))
+        return self.random.choices(self.topics, weights=weights)[0]